@@ -0,0 +1,180 @@
+"""
+Admission Control Module for Desi Translate
+Per-client rate limiting and load shedding for the API.
+
+Every client (logged-in user, or IP address for anonymous requests) has a
+token bucket per endpoint. A request costs one token plus one per
+bytes_per_token of body, so one huge paste drains the bucket like many
+small requests (a chunked body of unknown length costs the whole bucket). Requests over the rate get 429; requests arriving while an
+endpoint (or the whole node) is at its concurrency limit get 503 right
+away instead of queueing behind work that is already running. Both carry
+Retry-After.
+
+State lives in a small SQLite file shared by every gunicorn worker on the
+node; each admission decision is one short write transaction.
+"""
+
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+
+_SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS buckets (
+           key TEXT PRIMARY KEY,
+           tokens REAL NOT NULL,
+           updated_at REAL NOT NULL,
+           full_at REAL NOT NULL
+       )''',
+    'CREATE INDEX IF NOT EXISTS buckets_by_full_at ON buckets (full_at)',
+    '''CREATE TABLE IF NOT EXISTS slots (
+           id INTEGER PRIMARY KEY,
+           endpoint TEXT NOT NULL,
+           started_at REAL NOT NULL
+       )''',
+    'CREATE INDEX IF NOT EXISTS slots_by_endpoint ON slots (endpoint)',
+    'CREATE INDEX IF NOT EXISTS slots_by_started_at ON slots (started_at)'
+]
+
+# Seconds between deletions of buckets that have refilled completely
+PRUNE_INTERVAL = 60.0
+
+
+class Limit(NamedTuple):
+    """Admission limits of one endpoint"""
+    rate: float  # tokens added per second
+    burst: float  # bucket capacity
+    max_concurrency: Optional[int] = None  # requests in flight across all workers (None: unlimited)
+
+
+class Decision(NamedTuple):
+    """Outcome of an admission check"""
+    allowed: bool
+    status: int = 200  # 429 (rate limited) or 503 (over capacity) when not allowed
+    retry_after: int = 0  # seconds, for the Retry-After header
+    slot: Optional[int] = None  # concurrency slot to release when the request ends
+
+
+def request_cost(content_length: Optional[int], bytes_per_token: int, limit: Limit,
+                 unknown_length: bool = False) -> float:
+    """
+    Tokens charged for a request: 1 plus 1 per bytes_per_token of body,
+    capped at the bucket size (a request that large needs a full bucket).
+    A body of unknown length (chunked upload) is charged the full bucket.
+    """
+    if unknown_length and content_length is None:
+        return float(limit.burst)
+    cost = 1 + (content_length or 0) // bytes_per_token
+    return float(min(cost, limit.burst))
+
+
+class AdmissionController:
+    """Token buckets and concurrency slots shared through a SQLite file"""
+
+    def __init__(self, path: str, max_concurrency: Optional[int] = None, slot_ttl: float = 300.0,
+                 overload_retry_after: int = 1):
+        """
+        Initialize admission controller (creates the database on first use).
+
+        Args:
+            path: SQLite database file (node-local; the state is disposable)
+            max_concurrency: Requests in flight on the node across all
+                endpoints (None: unlimited)
+            slot_ttl: Slots older than this are considered leaked by a
+                killed worker and no longer count
+            overload_retry_after: Retry-After seconds of a 503
+        """
+        self.path = path
+        self.max_concurrency = max_concurrency
+        self.slot_ttl = slot_ttl
+        self.overload_retry_after = overload_retry_after
+        self._local = threading.local()
+        self._last_prune = 0.0
+        conn = self._connection()
+        conn.execute('PRAGMA journal_mode=WAL')
+        for statement in _SCHEMA:
+            conn.execute(statement)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connection of the calling thread (connections are not shared across forks)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            # Losing the last few updates in a crash only refills some buckets
+            conn.execute('PRAGMA synchronous=OFF')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def admit(self, endpoint: str, client: str, cost: float, limit: Limit) -> Decision:
+        """
+        Decide whether a request may run now.
+
+        Args:
+            endpoint: Endpoint name (buckets and slots are per endpoint)
+            client: Client key, e.g. 'user:42' or 'ip:10.0.0.1'
+            cost: Tokens to charge (see request_cost)
+            limit: The endpoint's limits
+
+        Returns:
+            Decision; release(decision.slot) when an allowed request ends
+        """
+        now = time.time()
+        key = f"{endpoint}|{client}"
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if self.max_concurrency is not None or limit.max_concurrency is not None:
+                conn.execute('DELETE FROM slots WHERE started_at < ?', (now - self.slot_ttl,))
+                if limit.max_concurrency is not None:
+                    in_flight = conn.execute('SELECT COUNT(*) FROM slots WHERE endpoint = ?', (endpoint,)).fetchone()[0]
+                    if in_flight >= limit.max_concurrency:
+                        return Decision(False, 503, self.overload_retry_after)
+                if self.max_concurrency is not None:
+                    in_flight = conn.execute('SELECT COUNT(*) FROM slots').fetchone()[0]
+                    if in_flight >= self.max_concurrency:
+                        return Decision(False, 503, self.overload_retry_after)
+
+            row = conn.execute('SELECT tokens, updated_at FROM buckets WHERE key = ?', (key,)).fetchone()
+            tokens = limit.burst if row is None else min(limit.burst, row[0] + (now - row[1]) * limit.rate)
+            if tokens < cost:
+                return Decision(False, 429, max(1, math.ceil((cost - tokens) / limit.rate)))
+
+            tokens -= cost
+            full_at = now + (limit.burst - tokens) / limit.rate
+            conn.execute('INSERT OR REPLACE INTO buckets (key, tokens, updated_at, full_at) VALUES (?, ?, ?, ?)',
+                         (key, tokens, now, full_at))
+            slot = None
+            if self.max_concurrency is not None or limit.max_concurrency is not None:
+                slot = conn.execute('INSERT INTO slots (endpoint, started_at) VALUES (?, ?)',
+                                    (endpoint, now)).lastrowid
+            if now - self._last_prune > PRUNE_INTERVAL:
+                # A full bucket is the same as no bucket
+                self._last_prune = now
+                conn.execute('DELETE FROM buckets WHERE full_at < ?', (now,))
+            return Decision(True, slot=slot)
+        finally:
+            conn.execute('COMMIT')
+
+    def release(self, slot: Optional[int]):
+        """Free the concurrency slot of a finished request"""
+        if slot is not None:
+            self._connection().execute('DELETE FROM slots WHERE id = ?', (slot,))
+
+
+_controllers: Dict[str, AdmissionController] = {}
+_controllers_lock = threading.Lock()
+
+
+def get_controller(path: str, max_concurrency: Optional[int] = None, slot_ttl: float = 300.0,
+                   overload_retry_after: int = 1) -> AdmissionController:
+    """Process-wide AdmissionController for a database file"""
+    with _controllers_lock:
+        controller = _controllers.get(path)
+        if controller is None:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            controller = _controllers[path] = AdmissionController(path, max_concurrency, slot_ttl,
+                                                                  overload_retry_after)
+        return controller
@@ -1,18 +1,52 @@
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
+from flask import Flask, render_template, request, jsonify, session, redirect, url_for, g, Response, stream_with_context
 from functools import wraps
+import codecs
 import json
 import os
+import tempfile
+import time
+import unicodedata
 from datetime import datetime
 import sqlite3
+from werkzeug.middleware.proxy_fix import ProxyFix
 from werkzeug.security import generate_password_hash, check_password_hash
 from translation_validator import RobustTranslationWrapper, TranslationValidator
+import metrics
+import profiling
+import config
+from lexicon_normalizer import TRAILING_PUNCTUATION, get_normalizer
+from lexicon_store import get_store
+from rules_snapshot import get_snapshot
+from reverse_index import normalize_key
+from document_translator import translate_document
+from job_queue import CANCELLED, FAILED, SUCCEEDED, get_queue, start_workers, stop_workers
+from subtitle_processor import SubtitleProcessor
+from response_encoder import FastJSONProvider, compress_response
+from admission import Limit, get_controller, request_cost
+from history_store import get_history_store
+from warmup import load_sentences, warmup
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'desi_translate_secret_key_2026')
 
+if config.TRUSTED_PROXY_HOPS:
+    # Behind a load balancer remote_addr is the proxy; take the client from X-Forwarded-*
+    hops = config.TRUSTED_PROXY_HOPS
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops, x_host=hops)
+
+# jsonify() goes through the fast encoder (raw UTF-8, no \uXXXX escapes)
+app.json = FastJSONProvider(app, backend=config.JSON_BACKEND)
+
+# Stateless; shared by all requests
+translation_validator = TranslationValidator()
+
 # Database setup
 DATABASE = 'users.db'
 
+# Normalizer lexicons (rules/)
+SLANG_LEXICON = 'slang_lexicon.json'
+HISTORICAL_LEXICON = 'historical_lexicon.json'
+
 def init_db():
     """Initialize SQLite database for users"""
     if not os.path.exists(DATABASE):
@@ -29,32 +63,99 @@ def init_db():
         conn.close()
 
 def load_translation_rules():
-    """Load translation rules from JSON files - using comprehensive versions"""
-    rules_path = os.path.join(os.path.dirname(__file__), 'rules')
-    
-    # Try to load comprehensive files first, fall back to original files
-    dict_file = os.path.join(rules_path, 'dictionaries_comprehensive.json')
-    if not os.path.exists(dict_file):
-        dict_file = os.path.join(rules_path, 'dictionaries.json')
-    
-    grammar_file = os.path.join(rules_path, 'grammar_rules_comprehensive.json')
-    if not os.path.exists(grammar_file):
-        grammar_file = os.path.join(rules_path, 'grammar_rules.json')
-    
-    idioms_file = os.path.join(rules_path, 'idioms_comprehensive.json')
-    if not os.path.exists(idioms_file):
-        idioms_file = os.path.join(rules_path, 'idioms.json')
-    
-    with open(dict_file, 'r', encoding='utf-8') as f:
-        dictionaries = json.load(f)
-    
-    with open(grammar_file, 'r', encoding='utf-8') as f:
-        grammar_rules = json.load(f)
-    
-    with open(idioms_file, 'r', encoding='utf-8') as f:
-        idioms = json.load(f)
-    
-    return dictionaries, grammar_rules, idioms
+    """
+    Translation rules from the compiled rules snapshot (comprehensive files
+    preferred). The snapshot is rebuilt only when a rule file changes.
+    """
+    with metrics.timer('rule_loading'):
+        snapshot = get_snapshot()
+        dictionaries = snapshot.dictionaries
+        if config.LEXICON_BACKEND == 'sqlite':
+            # Same Mapping interface as the JSON dictionaries, backed by SQLite
+            dictionaries = get_store(config.LEXICON_DB, cache_size=config.LEXICON_CACHE_SIZE)
+    
+    return dictionaries, snapshot.grammar_rules, snapshot.idioms
+
+def get_lemmatizer(pair):
+    """Inflection -> headword resolver for an English-source pair of the active backend"""
+    if config.LEXICON_BACKEND == 'sqlite':
+        return get_store(config.LEXICON_DB, cache_size=config.LEXICON_CACHE_SIZE).lemmatizer(pair)
+    return get_snapshot().lemmatizer(pair)
+
+def lemma_entry(word, word_dict, lemmatizer):
+    """Dictionary entry of an inflected word's headword, marked as a lemma match (or None)"""
+    match = lemmatizer.lemmatize(word)
+    if match is None:
+        return None
+    lemma, inflection = match
+    entry = word_dict.get(lemma)
+    if entry is None:
+        return None
+    entry = dict(entry)
+    entry['rule'] = f"{entry.get('rule', 'Direct translation')} (inflected form of '{lemma}', {inflection})"
+    entry['confidence'] = round(entry.get('confidence', 0.8) * config.MORPHOLOGY_CONFIDENCE_FACTOR, 4)
+    entry['lemma'] = lemma
+    return entry
+
+def get_spelling_index(pair):
+    """Typo-correction index over a language pair's headwords for the active backend (or None)"""
+    if config.LEXICON_BACKEND == 'sqlite':
+        return get_store(config.LEXICON_DB, cache_size=config.LEXICON_CACHE_SIZE).spelling_index(pair)
+    return get_snapshot().spelling_index(pair)
+
+def get_phrase_trie(pair):
+    """Trie of a language pair's multi-word headwords for the active backend (or None)"""
+    if config.LEXICON_BACKEND == 'sqlite':
+        return get_store(config.LEXICON_DB, cache_size=config.LEXICON_CACHE_SIZE).phrase_trie(pair)
+    return get_snapshot().phrase_trie(pair)
+
+def merge_phrases(clean_words, punctuation_map, trie):
+    """
+    Merge multi-word dictionary headwords ("good morning") into single
+    tokens, longest match first, in one left-to-right pass. A phrase never
+    spans punctuation.
+    
+    Returns:
+        (tokens, punctuation_map, spans) where spans[i] is the
+        (start, end) range of original word positions behind token i
+    """
+    n = len(clean_words)
+    # A phrase may end at a word with trailing punctuation (or one followed
+    # by a word with leading punctuation) but never continue past it
+    boundaries = [bool(punctuation_map[i]['trailing'])
+                  or (i + 1 < n and bool(punctuation_map[i + 1]['leading'])) for i in range(n)]
+    
+    tokens = []
+    merged_punctuation = {}
+    spans = []
+    i = 0
+    while i < n:
+        length = 0
+        if clean_words[i] in trie.root:
+            length, _ = trie.longest_match(clean_words, i, boundaries)
+        end = i + max(length, 1)
+        merged_punctuation[len(tokens)] = {
+            'leading': punctuation_map[i]['leading'],
+            'trailing': punctuation_map[end - 1]['trailing']
+        }
+        tokens.append(clean_words[i] if end == i + 1 else ' '.join(clean_words[i:end]))
+        spans.append((i, end))
+        i = end
+    return tokens, merged_punctuation, spans
+
+def get_reverse_index(pair):
+    """Translation -> English headwords index of an en_X pair for the active backend (or None)"""
+    if config.LEXICON_BACKEND == 'sqlite':
+        return get_store(config.LEXICON_DB, cache_size=config.LEXICON_CACHE_SIZE).reverse_index(pair)
+    return get_snapshot().reverse_index(pair)
+
+def corrected_entry(word, corrected, word_dict):
+    """Dictionary entry of a misspelled word's correction, marked as a spelling correction"""
+    entry = dict(word_dict[corrected])
+    entry['rule'] = f"{entry.get('rule', 'Direct translation')} (spelling corrected from '{word}')"
+    entry['confidence'] = round(entry.get('confidence', 0.8) * config.SPELLING_CONFIDENCE_FACTOR, 4)
+    entry['corrected_from'] = word
+    return entry
 
 def login_required(f):
     """Decorator to check if user is logged in"""
@@ -191,13 +292,102 @@ def video_translator():
 
 # ==================== TRANSLATION API ROUTES ====================
 
-def translate_text(text, source_lang='en', target_lang='hindi'):
-    """Advanced sentence-level translation with grammar transformation and word-to-word mapping"""
+# Response fields per detail= level; 'full' (the default) returns everything
+BASE_TRANSLATION_FIELDS = frozenset({
+    'translated_text', 'confidence', 'source_language', 'target_language', 'error', 'warnings'
+})
+TRANSLATE_DETAIL_LEVELS = {
+    'none': BASE_TRANSLATION_FIELDS,
+    'summary': BASE_TRANSLATION_FIELDS | {'explanations'},
+    'full': None
+}
+DETAILED_DETAIL_LEVELS = {
+    'none': BASE_TRANSLATION_FIELDS,
+    'summary': BASE_TRANSLATION_FIELDS | {'original_text', 'explanations', 'linguistic_explanation'},
+    'full': None
+}
+VIDEO_DETAIL_LEVELS = {
+    'none': frozenset({'original', 'translated'}),
+    'summary': frozenset({'original', 'translated', 'words_translated', 'total_words'}),
+    'full': None
+}
+DOCUMENT_DETAIL_LEVELS = {
+    'none': BASE_TRANSLATION_FIELDS | {'sentence_count'},
+    'summary': BASE_TRANSLATION_FIELDS | {'sentence_count'},
+    'full': None
+}
+NORMALIZER_DETAIL_LEVELS = {
+    'none': frozenset({'normalized_text', 'modern_text', 'confidence'}),
+    'summary': None,
+    'full': None
+}
+# Detailed responses keep their documented 'basic_explanations' name; the
+# validator checks the same list under 'explanations'
+DETAILED_FIELD_ALIASES = {'explanations': 'basic_explanations'}
+# Returned even when not listed in fields= so callers can detect problems
+ALWAYS_INCLUDED_FIELDS = frozenset({'error', 'warnings'})
+
+def wants_field(fields, name):
+    """Whether a response field should be built (fields=None means all)"""
+    return fields is None or name in fields
+
+def requested_fields(data, detail_levels):
+    """
+    Resolve the fields= / detail= parameters (JSON body or query string).
+    Returns a frozenset of field names, or None for everything.
+    Raises ValueError for an unknown detail level or a malformed fields value.
+    """
+    fields = data.get('fields') or request.args.get('fields')
+    if fields:
+        if isinstance(fields, str):
+            fields = fields.split(',')
+        elif not isinstance(fields, (list, tuple)):
+            raise ValueError("'fields' must be a list or a comma-separated string")
+        return frozenset(str(f).strip() for f in fields if str(f).strip()) | ALWAYS_INCLUDED_FIELDS
+    
+    detail = data.get('detail') or request.args.get('detail') or 'full'
+    if not isinstance(detail, str) or detail not in detail_levels:
+        raise ValueError(f"Unknown detail level '{detail}' (use none, summary or full)")
+    return detail_levels[detail]
+
+def requested_spellcheck(data):
+    """Whether typo correction was requested (spellcheck= in the JSON body or query string)"""
+    value = data.get('spellcheck', request.args.get('spellcheck', False))
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'on')
+    return bool(value)
+
+def spelling_report(corrections, seconds):
+    """'spelling' response field: corrections made and time spent finding them"""
+    metrics.record_stage('spelling_correction', seconds)
+    return {'corrections': corrections, 'correction_ms': round(seconds * 1000, 3)}
+
+def project_fields(result, fields, aliases=None):
+    """
+    Drop fields that were not requested. aliases maps result keys to the
+    name they are returned under; either name selects the field.
+    """
+    if fields is None and not aliases:
+        return result
+    aliases = aliases or {}
+    return {aliases.get(key, key): value for key, value in result.items()
+            if fields is None or key in fields or aliases.get(key) in fields}
+
+
+def translate_text(text, source_lang='en', target_lang='hindi', fields=None, spellcheck=False):
+    """
+    Advanced sentence-level translation with grammar transformation and word-to-word mapping.
+    fields: optional set of response fields to build (None builds everything);
+    explanations, word_mappings and reordering_info are skipped unless requested.
+    spellcheck: correct misspelled words missing from the dictionary and
+    report them (with the time taken) under 'spelling'.
+    """
     import re
     
     # Map language codes to full names
     lang_map = {
         'en': 'en',
+        'english': 'en',
         'hi': 'hindi',
         'te': 'telugu',
         'ta': 'tamil',
@@ -215,176 +405,242 @@ def translate_text(text, source_lang='en', target_lang='hindi'):
     # Try: source_target, then target_source, then english_target if source is not english
     dict_key = f"{source_lang}_{target_lang}"
     word_dict = dictionaries.get(dict_key, {})
+    word_dict_key = dict_key  # Pair actually used
     
     # If no direct translation available, try reverse dictionary
     if not word_dict:
         reverse_key = f"{target_lang}_{source_lang}"
         word_dict = dictionaries.get(reverse_key, {})
+        word_dict_key = reverse_key
     
     # If still no dictionary and source is not English, try English as intermediate
     if not word_dict and source_lang != 'en':
         en_target_key = f"en_{target_lang}"
         word_dict = dictionaries.get(en_target_key, {})
+        word_dict_key = en_target_key
     
-    # Step 1: Tokenize and extract punctuation
-    words = text.lower().split()
-    clean_words = []
-    punctuation_map = {}
+    # Inflected English words ("walked", "books") fall back to their headword
+    lemmatizer = None
+    if config.MORPHOLOGY_ENABLED and source_lang == 'en' and word_dict:
+        lemmatizer = get_lemmatizer(dict_key)
     
-    for i, word in enumerate(words):
-        leading_punct = ''
-        trailing_punct = ''
-        clean_word = word
-        
-        # Extract trailing punctuation
-        while clean_word and clean_word[-1] in '.,!?;:\'"':
-            trailing_punct = clean_word[-1] + trailing_punct
-            clean_word = clean_word[:-1]
-        
-        # Extract leading punctuation
-        while clean_word and clean_word[0] in '\'"(':
-            leading_punct = leading_punct + clean_word[0]
-            clean_word = clean_word[1:]
-        
-        clean_words.append(clean_word)
-        punctuation_map[i] = {'leading': leading_punct, 'trailing': trailing_punct}
+    speller = get_spelling_index(dict_key) if spellcheck and word_dict else None
+    corrections = []
+    correction_seconds = 0.0
     
-    # Step 2: Identify sentence structure (SVO parsing)
-    subject_idx = -1
-    verb_idx = -1
-    object_idx = -1
-    auxiliary_indices = []
-    
-    pos_tags = []
-    for i, word in enumerate(clean_words):
-        if word in word_dict:
-            pos = word_dict[word].get('pos', 'noun')
-        else:
-            pos = get_pos_tag(word, grammar_rules)
-        pos_tags.append(pos)
-        
-        # Simple heuristic SVO detection
-        if pos == 'pronoun' and subject_idx == -1:
-            subject_idx = i
-        elif pos == 'verb':
-            if verb_idx == -1:
-                verb_idx = i
-            elif word in ['is', 'are', 'was', 'were', 'do', 'does', 'did', 'will', 'can', 'could', 'may', 'might', 'must', 'should', 'would', 'shall']:
-                auxiliary_indices.append(i)
-        elif pos in ['noun', 'pronoun'] and verb_idx != -1 and object_idx == -1:
-            object_idx = i
-    
-    # Step 3: Translate each word with detailed mapping
-    word_translations = []  # Keep all translation info
-    tense_info = 'present'
-    
-    for i, word in enumerate(clean_words):
-        if word in word_dict:
-            translated = word_dict[word]['word']
-            rule = word_dict[word].get('rule', 'Direct translation')
-            pos = word_dict[word].get('pos', 'noun')
-            confidence = word_dict[word].get('confidence', 0.8)
-            meaning = word_dict[word].get('meaning', '')
-        else:
-            translated = word
-            rule = 'Word not found in dictionary'
-            pos = get_pos_tag(word, grammar_rules)
-            confidence = 0.5
-            meaning = ''
+    # Step 1: Tokenize and extract punctuation
+    with metrics.timer('tokenization'):
+        if source_lang != 'en':
+            # Indic dictionary keys are NFC; match input typed in either form
+            text = unicodedata.normalize('NFC', text)
+        words = text.lower().split()
+        clean_words = []
+        punctuation_map = {}
         
-        word_translations.append({
-            'source_word': word,
-            'target_word': translated,
-            'source_pos': pos,
-            'target_pos': pos,
-            'rule': rule,
-            'meaning': meaning,
-            'confidence': confidence,
-            'original_index': i
-        })
-    
-    # Build translated_words list
-    translated_words = [wt['target_word'] for wt in word_translations]
-    word_mappings = word_translations
-    
-    # Step 4: Apply grammar transformations based on target language
-    target_lang_lower = target_lang.lower()
+        for i, word in enumerate(words):
+            leading_punct = ''
+            trailing_punct = ''
+            clean_word = word
+            
+            # Extract trailing punctuation
+            while clean_word and clean_word[-1] in '.,!?;:\'"':
+                trailing_punct = clean_word[-1] + trailing_punct
+                clean_word = clean_word[:-1]
+            
+            # Extract leading punctuation
+            while clean_word and clean_word[0] in '\'"(':
+                leading_punct = leading_punct + clean_word[0]
+                clean_word = clean_word[1:]
+            
+            clean_words.append(clean_word)
+            punctuation_map[i] = {'leading': leading_punct, 'trailing': trailing_punct}
     
-    # Check if target language uses SOV word order (Indian languages)
-    uses_sov = target_lang_lower in ['hindi', 'telugu', 'tamil', 'kannada', 'malayalam', 'marathi', 'punjabi']
+    # Step 1b: Merge multi-word dictionary entries into single tokens
+    token_spans = None  # (start, end) word positions per token once phrases are merged
+    phrase_trie = get_phrase_trie(word_dict_key) if config.PHRASE_MATCHING_ENABLED and word_dict else None
+    if phrase_trie is not None:
+        with metrics.timer('phrase_matching'):
+            clean_words, punctuation_map, token_spans = merge_phrases(clean_words, punctuation_map, phrase_trie)
     
-    reordering_info = None
-    if uses_sov and subject_idx != -1 and verb_idx != -1:
-        # Reorder from SVO to SOV
-        # SVO: Subject Verb Object → SOV: Subject Object Verb
-        new_order = []
+    # Step 2: Identify sentence structure (SVO parsing)
+    with metrics.timer('pos_tagging'):
+        subject_idx = -1
+        verb_idx = -1
+        object_idx = -1
+        auxiliary_indices = []
         
-        # Add subject
-        if subject_idx != -1:
-            new_order.append(subject_idx)
+        pos_tags = []
+        word_entries = []  # Dictionary entry (or None) per word
+        lemma_hits = 0
+        for i, word in enumerate(clean_words):
+            entry = word_dict.get(word)
+            if entry is None and lemmatizer is not None and word:
+                entry = lemma_entry(word, word_dict, lemmatizer)
+                lemma_hits += entry is not None
+            if entry is None and speller is not None and word:
+                started = time.perf_counter()
+                correction = speller.correct(word)
+                correction_seconds += time.perf_counter() - started
+                if correction is not None:
+                    entry = corrected_entry(word, correction[0], word_dict)
+                    corrections.append({'original': word, 'corrected': correction[0],
+                                        'distance': correction[1], 'position': i})
+            word_entries.append(entry)
+            
+            if entry is not None:
+                pos = entry.get('pos', 'noun')
+            else:
+                pos = get_pos_tag(word, grammar_rules)
+            pos_tags.append(pos)
+            
+            # Simple heuristic SVO detection
+            if pos == 'pronoun' and subject_idx == -1:
+                subject_idx = i
+            elif pos == 'verb':
+                if verb_idx == -1:
+                    verb_idx = i
+                elif word in ['is', 'are', 'was', 'were', 'do', 'does', 'did', 'will', 'can', 'could', 'may', 'might', 'must', 'should', 'would', 'shall']:
+                    auxiliary_indices.append(i)
+            elif pos in ['noun', 'pronoun'] and verb_idx != -1 and object_idx == -1:
+                object_idx = i
+    
+    # Step 3: Translate each word
+    with metrics.timer('dictionary_lookup'):
+        translated_words = []
+        confidence_total = 0.0
+        tense_info = 'present'
+        dictionary_hits = 0
         
-        # Add objects and other words (except verb and auxiliaries)
-        for i in range(len(clean_words)):
-            if i not in [subject_idx, verb_idx] and i not in auxiliary_indices:
-                new_order.append(i)
+        for word, entry in zip(clean_words, word_entries):
+            if entry is not None:
+                dictionary_hits += 1
+                translated_words.append(entry['word'])
+                confidence_total += entry.get('confidence', 0.8)
+            else:
+                translated_words.append(word)
+                confidence_total += 0.5
+        
+        fallback_hits = lemma_hits + len(corrections)
+        metrics.record_cache('dictionary', hits=dictionary_hits - fallback_hits,
+                             misses=len(clean_words) - dictionary_hits + fallback_hits)
+        if lemmatizer is not None:
+            metrics.record_cache('lemma', hits=lemma_hits, misses=len(clean_words) - dictionary_hits + len(corrections))
+        if speller is not None:
+            metrics.record_cache('spelling', hits=len(corrections), misses=len(clean_words) - dictionary_hits)
         
-        # Add verb last (with auxiliaries merged)
-        if verb_idx != -1:
-            new_order.append(verb_idx)
+        # Detailed word-to-word mapping (only when requested)
+        word_mappings = None
+        if wants_field(fields, 'word_mappings'):
+            word_mappings = []
+            for i, (word, entry) in enumerate(zip(clean_words, word_entries)):
+                mapping = {
+                    'source_word': word,
+                    'target_word': translated_words[i],
+                    'source_pos': pos_tags[i],
+                    'target_pos': pos_tags[i],
+                    'rule': entry.get('rule', 'Direct translation') if entry is not None else 'Word not found in dictionary',
+                    'meaning': entry.get('meaning', '') if entry is not None else '',
+                    'confidence': entry.get('confidence', 0.8) if entry is not None else 0.5,
+                    'original_index': i
+                }
+                if token_spans is not None:
+                    # Positions refer to the input words; phrases cover several
+                    start, end = token_spans[i]
+                    mapping['original_index'] = start
+                    if end - start > 1:
+                        mapping['source_span'] = [start, end]
+                word_mappings.append(mapping)
+    
+    # Translations in original word order (translated_words gets reordered below)
+    word_targets = translated_words
+    
+    # Step 4: Apply grammar transformations based on target language
+    with metrics.timer('sov_reordering'):
+        target_lang_lower = target_lang.lower()
         
-        # Reorder translated words
-        reordered = []
-        for idx in new_order:
-            if idx < len(translated_words):
-                reordered.append(translated_words[idx])
+        # Check if target language uses SOV word order (Indian languages)
+        sov_languages = ['hindi', 'telugu', 'tamil', 'kannada', 'malayalam', 'marathi', 'punjabi']
+        uses_sov = target_lang_lower in sov_languages
+        # The reordering below is tuned for English (SVO) input; an SOV source
+        # (hindi -> tamil through the pivot tables) is already in target order
+        if source_lang.lower() in sov_languages:
+            uses_sov = False
         
-        # Only use reordered if we have valid positions
-        if len(reordered) == len(translated_words):
-            translated_words = reordered
-            reordering_info = {
-                'original_order': list(range(len(clean_words))),
-                'new_order': new_order,
-                'rule': 'SVO to SOV word order transformation',
-                'source_order': 'SVO (Subject-Verb-Object)',
-                'target_order': 'SOV (Subject-Object-Verb)'
-            }
-    
-    # Step 5: Handle auxiliary verb merging for target language
-    # For Indian languages, merge auxiliary verbs into main verb
-    if uses_sov and auxiliary_indices:
-        # Remove auxiliaries from translated words if they shouldn't appear separately
-        filtered_words = []
-        for i, word in enumerate(translated_words):
-            # Check if this was an auxiliary (rough estimate based on position)
-            if i not in auxiliary_indices:
-                filtered_words.append(word)
+        reordering_info = None
+        auxiliary_set = set(auxiliary_indices)  # O(1) membership for long inputs
+        if uses_sov and subject_idx != -1 and verb_idx != -1:
+            # Reorder from SVO to SOV
+            # SVO: Subject Verb Object → SOV: Subject Object Verb
+            new_order = []
+            
+            # Add subject
+            if subject_idx != -1:
+                new_order.append(subject_idx)
+            
+            # Add objects and other words (except verb and auxiliaries)
+            for i in range(len(clean_words)):
+                if i != subject_idx and i != verb_idx and i not in auxiliary_set:
+                    new_order.append(i)
+            
+            # Add verb last (with auxiliaries merged)
+            if verb_idx != -1:
+                new_order.append(verb_idx)
+            
+            # Reorder translated words
+            reordered = []
+            for idx in new_order:
+                if idx < len(translated_words):
+                    reordered.append(translated_words[idx])
+            
+            # Only use reordered if we have valid positions
+            if len(reordered) == len(translated_words):
+                translated_words = reordered
+                if wants_field(fields, 'reordering_info'):
+                    reordering_info = {
+                        'original_order': list(range(len(clean_words))),
+                        'new_order': new_order,
+                        'rule': 'SVO to SOV word order transformation',
+                        'source_order': 'SVO (Subject-Verb-Object)',
+                        'target_order': 'SOV (Subject-Object-Verb)'
+                    }
         
-        if filtered_words and len(filtered_words) < len(translated_words):
-            translated_words = filtered_words
+        # Step 5: Handle auxiliary verb merging for target language
+        # For Indian languages, merge auxiliary verbs into main verb
+        if uses_sov and auxiliary_indices:
+            # Remove auxiliaries from translated words if they shouldn't appear separately
+            filtered_words = []
+            for i, word in enumerate(translated_words):
+                # Check if this was an auxiliary (rough estimate based on position)
+                if i not in auxiliary_set:
+                    filtered_words.append(word)
+            
+            if filtered_words and len(filtered_words) < len(translated_words):
+                translated_words = filtered_words
     
     # Step 6: Build explanations for each word (in original order, not reordered)
-    explanations = []
-    for i, word in enumerate(clean_words):
-        wt = word_translations[i] if i < len(word_translations) else {'target_word': word, 'confidence': 0, 'rule': 'Unknown'}
-        
-        if word in word_dict:
-            explanations.append({
-                'original': word,
-                'translated': wt['target_word'],
-                'pos': word_dict[word].get('pos', 'noun'),
-                'rule': word_dict[word].get('rule', 'Direct translation'),
-                'confidence': word_dict[word].get('confidence', 0.8),
-                'meaning': word_dict[word].get('meaning', '')
-            })
-        else:
-            explanations.append({
-                'original': word,
-                'translated': wt['target_word'],
-                'pos': get_pos_tag(word, grammar_rules),
-                'rule': 'Word not found - approximate translation',
-                'confidence': 0.5,
-                'meaning': ''
-            })
+    explanations = None
+    if wants_field(fields, 'explanations'):
+        with metrics.timer('explanation_building'):
+            explanations = []
+            for i, (word, entry) in enumerate(zip(clean_words, word_entries)):
+                if entry is not None:
+                    explanations.append({
+                        'original': word,
+                        'translated': word_targets[i],
+                        'pos': pos_tags[i],
+                        'rule': entry.get('rule', 'Direct translation'),
+                        'confidence': entry.get('confidence', 0.8),
+                        'meaning': entry.get('meaning', '')
+                    })
+                else:
+                    explanations.append({
+                        'original': word,
+                        'translated': word_targets[i],
+                        'pos': pos_tags[i],
+                        'rule': 'Word not found - approximate translation',
+                        'confidence': 0.5,
+                        'meaning': ''
+                    })
     
     # Step 7: Reconstruct sentence with punctuation (use reordered translated_words)
     final_words = []
@@ -395,17 +651,27 @@ def translate_text(text, source_lang='en', target_lang='hindi'):
         final_words.append(punct_info['leading'] + word + punct_info['trailing'])
     
     translated_text = ' '.join(final_words)
-    avg_confidence = sum(e['confidence'] for e in explanations) / len(explanations) if explanations else 0
+    avg_confidence = confidence_total / len(clean_words) if clean_words else 0
     
-    return {
+    result = {
         'translated_text': translated_text,
-        'explanations': explanations,
         'confidence': round(avg_confidence * 100, 2),
-        'word_mappings': word_mappings,
         'source_language': source_lang,
         'target_language': target_lang,
-        'reordering_info': reordering_info
+        'error': None,
+        'warnings': []
     }
+    if explanations is not None:
+        result['explanations'] = explanations
+    if word_mappings is not None:
+        result['word_mappings'] = word_mappings
+    if wants_field(fields, 'reordering_info'):
+        result['reordering_info'] = reordering_info
+    if spellcheck:
+        result['spelling'] = spelling_report(corrections, correction_seconds)
+        if speller is None:
+            result['warnings'].append('Spelling correction is not available for this language pair')
+    return result
 
 # ==================== ADVANCED LINGUISTIC ANALYSIS ====================
 
@@ -548,11 +814,16 @@ def generate_linguistic_explanation(text, target_lang, dictionaries, grammar_rul
     
     return " | ".join(explanations) if explanations else "✓ Standard translation. Minimal grammatical transformation required."
 
-def translate_text_detailed(text, source_lang='en', target_lang='hindi'):
-    """Advanced translation with detailed linguistic analysis"""
+def translate_text_detailed(text, source_lang='en', target_lang='hindi', fields=None, spellcheck=False):
+    """
+    Advanced translation with detailed linguistic analysis.
+    fields: optional set of response fields to build (None builds everything).
+    spellcheck: correct misspelled words (see translate_text).
+    """
     # Map language codes to full names
     lang_map = {
         'en': 'en',
+        'english': 'en',
         'hi': 'hindi',
         'te': 'telugu',
         'ta': 'tamil',
@@ -564,47 +835,87 @@ def translate_text_detailed(text, source_lang='en', target_lang='hindi'):
     source_lang = lang_map.get(source_lang.lower(), source_lang)
     target_lang = lang_map.get(target_lang.lower(), target_lang)
     
-    dictionaries, grammar_rules, _ = load_translation_rules()
-    
-    # Get basic translation
-    basic_translation = translate_text(text, source_lang, target_lang)
-    
-    # Perform detailed word analysis
-    words = text.lower().split()
-    detailed_explanations = []
-    
-    for word in words:
-        # Separate punctuation
-        punctuation = ''
-        clean_word = word
-        
-        while clean_word and clean_word[-1] in '.,!?;:\'"':
-            punctuation = clean_word[-1] + punctuation
-            clean_word = clean_word[:-1]
-        
-        leading_punct = ''
-        while clean_word and clean_word[0] in '\'"(':
-            leading_punct = leading_punct + clean_word[0]
-            clean_word = clean_word[1:]
-        
-        # Analyze word in detail
-        word_analysis = analyze_word_detailed(word, clean_word, target_lang, dictionaries, grammar_rules)
-        detailed_explanations.append(word_analysis)
-    
-    # Generate linguistic explanation
-    linguistic_explanation = generate_linguistic_explanation(text, target_lang, dictionaries, grammar_rules)
-    
-    return {
+    want_word_explanations = wants_field(fields, 'word_explanations')
+    want_linguistic = wants_field(fields, 'linguistic_explanation')
+    want_explanations = wants_field(fields, 'explanations') or wants_field(fields, 'basic_explanations')
+    
+    # Get basic translation, building only the structures we return
+    basic_fields = None
+    if fields is not None:
+        basic_fields = set()
+        if want_explanations:
+            basic_fields.add('explanations')
+        if wants_field(fields, 'word_mappings'):
+            basic_fields.add('word_mappings')
+    basic_translation = translate_text(text, source_lang, target_lang, fields=basic_fields, spellcheck=spellcheck)
+    
+    result = {
         'translated_text': basic_translation['translated_text'],
         'original_text': text,
         'confidence': basic_translation['confidence'],
-        'word_explanations': detailed_explanations,
-        'word_mappings': basic_translation.get('word_mappings', []),
-        'linguistic_explanation': linguistic_explanation,
-        'basic_explanations': basic_translation['explanations'],
         'source_language': source_lang,
-        'target_language': target_lang
+        'target_language': target_lang,
+        'error': None,
+        'warnings': []
     }
+    if 'word_mappings' in basic_translation:
+        result['word_mappings'] = basic_translation['word_mappings']
+    if want_explanations:
+        result['explanations'] = basic_translation['explanations']
+    if spellcheck:
+        result['spelling'] = basic_translation['spelling']
+        result['warnings'].extend(basic_translation['warnings'])
+    
+    if not (want_word_explanations or want_linguistic):
+        return result
+    
+    dictionaries, grammar_rules, _ = load_translation_rules()
+    
+    with metrics.timer('explanation_building'):
+        if want_word_explanations:
+            # Perform detailed word analysis
+            words = text.lower().split()
+            detailed_explanations = []
+            
+            for word in words:
+                # Separate punctuation
+                punctuation = ''
+                clean_word = word
+                
+                while clean_word and clean_word[-1] in '.,!?;:\'"':
+                    punctuation = clean_word[-1] + punctuation
+                    clean_word = clean_word[:-1]
+                
+                leading_punct = ''
+                while clean_word and clean_word[0] in '\'"(':
+                    leading_punct = leading_punct + clean_word[0]
+                    clean_word = clean_word[1:]
+                
+                # Analyze word in detail
+                word_analysis = analyze_word_detailed(word, clean_word, target_lang, dictionaries, grammar_rules)
+                detailed_explanations.append(word_analysis)
+            
+            result['word_explanations'] = detailed_explanations
+        
+        if want_linguistic:
+            # Generate linguistic explanation
+            result['linguistic_explanation'] = generate_linguistic_explanation(text, target_lang, dictionaries, grammar_rules)
+    
+    return result
+
+def get_history():
+    """This worker's write-behind history store"""
+    return get_history_store(config.HISTORY_DB, capacity=config.HISTORY_BUFFER_SIZE,
+                             batch_size=config.HISTORY_BATCH_SIZE, flush_interval=config.HISTORY_FLUSH_INTERVAL,
+                             max_text_chars=config.HISTORY_MAX_TEXT_CHARS)
+
+def record_history(endpoint, source_text, translated_text, source_lang=None, target_lang=None, confidence=None):
+    """Add a logged-in user's translation to their history (buffered, written by a background thread)"""
+    user_id = session.get('user_id')
+    if user_id is None or not config.HISTORY_ENABLED:
+        return
+    if not get_history().record(user_id, endpoint, source_text, translated_text, source_lang, target_lang, confidence):
+        metrics.record_drop('history')
 
 @app.route('/api/translate', methods=['POST'])
 def api_translate():
@@ -623,12 +934,25 @@ def api_translate():
                 'explanations': []
             }), 400
         
-        # Use validator wrapper for safe translation
-        validator = TranslationValidator()
-        result = translate_text(text, source_lang, target_lang)
-        validated_result = validator.validate_translation_output(result)
+        try:
+            fields = requested_fields(data, TRANSLATE_DETAIL_LEVELS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        spellcheck = requested_spellcheck(data)
+        if spellcheck and fields is not None:
+            fields = fields | {'spelling'}
+        
+        # Validate engine output (fast path when it already conforms)
+        result = translate_text(text, source_lang, target_lang, fields=fields, spellcheck=spellcheck)
+        with metrics.timer('validation'):
+            validated_result = translation_validator.validate_translation_output(
+                result, check_explanations=wants_field(fields, 'explanations'))
+        record_history('translate', text, validated_result.get('translated_text'), source_lang, target_lang,
+                       validated_result.get('confidence'))
         
-        return jsonify(validated_result), 200
+        with metrics.timer('json_serialization'):
+            response = jsonify(project_fields(validated_result, fields))
+        return response, 200
         
     except Exception as e:
         # Fallback response on critical error
@@ -658,12 +982,25 @@ def api_translate_detailed():
                 'linguistic_explanation': ''
             }), 400
         
-        # Use validator wrapper for safe translation
-        validator = TranslationValidator()
-        result = translate_text_detailed(text, source_lang, target_lang)
-        validated_result = validator.validate_translation_output(result)
+        try:
+            fields = requested_fields(data, DETAILED_DETAIL_LEVELS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        spellcheck = requested_spellcheck(data)
+        if spellcheck and fields is not None:
+            fields = fields | {'spelling'}
+        
+        # Validate engine output (fast path when it already conforms)
+        result = translate_text_detailed(text, source_lang, target_lang, fields=fields, spellcheck=spellcheck)
+        with metrics.timer('validation'):
+            validated_result = translation_validator.validate_translation_output(
+                result, check_explanations='explanations' in result)
+        record_history('translate-detailed', text, validated_result.get('translated_text'), source_lang, target_lang,
+                       validated_result.get('confidence'))
         
-        return jsonify(validated_result), 200
+        with metrics.timer('json_serialization'):
+            response = jsonify(project_fields(validated_result, fields, DETAILED_FIELD_ALIASES))
+        return response, 200
         
     except Exception as e:
         # Fallback response on critical error
@@ -676,6 +1013,38 @@ def api_translate_detailed():
             'warnings': ['System fallback mode']
         }), 500
 
+@app.route('/api/translate-document', methods=['POST'])
+def api_translate_document():
+    """Translate multi-sentence text sentence by sentence (parallel for large documents)"""
+    data = request.get_json() or {}
+    text = data.get('text', '')
+    source_lang = data.get('source_lang', 'en')
+    target_lang = data.get('target_lang', 'hindi')
+    
+    if not isinstance(text, str) or not text.strip():
+        return jsonify({'error': 'No text provided', 'translated_text': '', 'confidence': 0}), 400
+    
+    try:
+        fields = requested_fields(data, DOCUMENT_DETAIL_LEVELS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    with metrics.timer('document_translation'):
+        result = translate_document(
+            text, source_lang, target_lang, translate_text,
+            workers=config.DOCUMENT_WORKERS,
+            parallel_min_sentences=config.DOCUMENT_PARALLEL_MIN_SENTENCES,
+            include_sentences=wants_field(fields, 'sentences')
+        )
+    result['error'] = None
+    result['warnings'] = []
+    record_history('translate-document', text, result['translated_text'], source_lang, target_lang,
+                   result['confidence'])
+    
+    with metrics.timer('json_serialization'):
+        response = jsonify(project_fields(result, fields))
+    return response, 200
+
 def translate_idiom(idiom, target_lang='hindi'):
     """Translate idiom to target language"""
     _, _, idioms_dict = load_translation_rules()
@@ -727,6 +1096,54 @@ def translate_idiom(idiom, target_lang='hindi'):
             'confidence': 0.0
         }
 
+def reverse_lookup_language(language):
+    """Full language name for a reverse lookup ('hi' -> 'hindi')"""
+    lang_map = {'hi': 'hindi', 'te': 'telugu', 'ta': 'tamil'}
+    return lang_map.get(str(language).lower(), str(language).lower())
+
+def reverse_lookup(word, language='hindi'):
+    """
+    English headwords that translate to a Hindi/Telugu/Tamil word.
+    Returns None when there is no en_<language> dictionary.
+    """
+    language = reverse_lookup_language(language)
+    index = get_reverse_index(f"en_{language}")
+    if index is None:
+        return None
+    
+    matches = [{'english': headword, 'pos': pos, 'confidence': confidence}
+               for headword, pos, confidence in index.lookup(word)]
+    return {
+        'word': normalize_key(word),
+        'language': language,
+        'matches': matches,
+        'total': len(matches)
+    }
+
+@app.route('/api/reverse-lookup', methods=['POST'])
+def api_reverse_lookup():
+    """Reverse dictionary lookup API endpoint ({"word": ..., "language": "hindi"})"""
+    data = request.get_json() or {}
+    word = data.get('word')
+    words = data.get('words')
+    language = data.get('language', 'hindi')
+    
+    if not (isinstance(word, str) and word.strip()) and not (isinstance(words, list) and words):
+        return jsonify({'error': 'No word provided'}), 400
+    if get_reverse_index(f"en_{reverse_lookup_language(language)}") is None:
+        return jsonify({'error': f"No dictionary for language '{language}'"}), 400
+    
+    # Batch input: {"words": [...]} -> {"results": [...]}
+    if isinstance(words, list) and words:
+        results = [reverse_lookup(w, language) if isinstance(w, str) else {'error': 'Word must be a string'} for w in words]
+        with metrics.timer('json_serialization'):
+            response = jsonify({'results': results, 'total': len(results)})
+        return response, 200
+    
+    with metrics.timer('json_serialization'):
+        response = jsonify(reverse_lookup(word, language))
+    return response, 200
+
 @app.route('/api/translate-idiom', methods=['POST'])
 def api_translate_idiom():
     """Translate idiom API endpoint"""
@@ -738,74 +1155,90 @@ def api_translate_idiom():
         return jsonify({'error': 'No idiom provided'}), 400
     
     result = translate_idiom(idiom, target_lang)
-    return jsonify(result), 200
-
-def normalize_slang(text):
-    """Normalize chat/SMS slang to proper English"""
-    slang_dict = {
-        'ur': 'your',
-        'u': 'you',
-        'r': 'are',
-        'wud': 'would',
-        'cd': 'could',
-        'shud': 'should',
-        'btw': 'by the way',
-        'lol': 'laughing out loud',
-        'omg': 'oh my god',
-        'brb': 'be right back',
-        'nvm': 'never mind',
-        'thx': 'thanks',
-        'pls': 'please',
-        'msg': 'message',
-        'str8': 'straight',
-        'gr8': 'great',
-        'l8r': 'later',
-        'b4': 'before',
-        '2': 'to',
-        '4': 'for',
-        '2day': 'today',
-        '2morrow': 'tomorrow',
-        'nite': 'night',
-        'gud': 'good',
-        'cuz': 'because',
-        'c': 'see',
-        'luv': 'love',
-        'hbu': 'how about you',
-        'ttyl': 'talk to you later'
-    }
-    
+    record_history('translate-idiom', idiom, result.get('translation'), 'en', target_lang, result.get('confidence'))
+    with metrics.timer('json_serialization'):
+        response = jsonify(result)
+    return response, 200
+
+def normalize_slang(text, explain=True, spellcheck=False):
+    """
+    Normalize chat/SMS slang to proper English (explain=False skips explanations).
+    spellcheck: also resolve misspelled slang ("gudd" -> "gud" -> "good") and
+    report it under 'spelling'; words in the English dictionaries are kept.
+    """
     words = text.lower().split()
+    normalizer = get_normalizer(SLANG_LEXICON)
+    spans = normalizer.find_spans(words)
     normalized_words = []
     explanations = []
+    end = 0
     
-    for word in words:
-        clean_word = word.rstrip('.,!?;:')
-        punctuation = word[len(clean_word):]
+    speller = None
+    corrections = []
+    correction_seconds = 0.0
+    if spellcheck:
+        speller = normalizer.spelling_index()
+        dictionaries = load_translation_rules()[0]
+        english_vocabularies = [dictionaries[key] for key in dictionaries if key.startswith('en_')]
+    
+    for i, word in enumerate(words):
+        if i < end:
+            continue  # Inside a multi-word match
         
-        if clean_word in slang_dict:
-            normalized = slang_dict[clean_word]
-            normalized_words.append(normalized + punctuation)
-            explanations.append({
-                'original': word,
-                'normalized': normalized + punctuation,
-                'type': 'slang',
-                'explanation': f"Internet slang abbreviated form"
-            })
+        span = spans.get(i)
+        if span is not None:
+            end, replacement, punctuation = span
+            original = word if end == i + 1 else ' '.join(words[i:end])
+            normalized = replacement + punctuation
+            normalized_words.append(normalized)
+            if explain:
+                explanations.append({
+                    'original': original,
+                    'normalized': normalized,
+                    'type': 'slang',
+                    'explanation': f"Internet slang abbreviated form"
+                })
         else:
+            correction = None
+            key = word.rstrip(TRAILING_PUNCTUATION)
+            if speller is not None and not any(key in vocabulary for vocabulary in english_vocabularies):
+                started = time.perf_counter()
+                correction = speller.correct(key)
+                correction_seconds += time.perf_counter() - started
+            
+            if correction is not None:
+                slang, distance = correction
+                normalized = normalizer.words[slang] + word[len(key):]
+                normalized_words.append(normalized)
+                corrections.append({'original': key, 'corrected': slang, 'distance': distance, 'position': i})
+                if explain:
+                    explanations.append({
+                        'original': word,
+                        'normalized': normalized,
+                        'type': 'slang',
+                        'explanation': f"Internet slang abbreviated form (misspelling of '{slang}')"
+                    })
+                continue
+            
             normalized_words.append(word)
-            explanations.append({
-                'original': word,
-                'normalized': word,
-                'type': 'normal',
-                'explanation': 'Proper English'
-            })
+            if explain:
+                explanations.append({
+                    'original': word,
+                    'normalized': word,
+                    'type': 'normal',
+                    'explanation': 'Proper English'
+                })
     
     normalized_text = ' '.join(normalized_words)
-    return {
+    result = {
         'normalized_text': normalized_text,
-        'explanations': explanations,
         'confidence': 0.85
     }
+    if explain:
+        result['explanations'] = explanations
+    if spellcheck:
+        result['spelling'] = spelling_report(corrections, correction_seconds)
+    return result
 
 @app.route('/api/normalize-slang', methods=['POST'])
 @login_required
@@ -813,194 +1246,74 @@ def api_normalize_slang():
     """Normalize slang API endpoint"""
     data = request.get_json()
     text = data.get('text')
+    texts = data.get('texts')
+    
+    try:
+        fields = requested_fields(data, NORMALIZER_DETAIL_LEVELS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    explain = wants_field(fields, 'explanations')
+    spellcheck = requested_spellcheck(data)
+    if spellcheck and fields is not None:
+        fields = fields | {'spelling'}
+    
+    # Batch input: {"texts": [...]} -> {"results": [...]}
+    if isinstance(texts, list) and texts:
+        results = [project_fields(normalize_slang(t, explain, spellcheck), fields) if isinstance(t, str) else {'error': 'Text must be a string'} for t in texts]
+        with metrics.timer('json_serialization'):
+            response = jsonify({'results': results, 'total': len(results)})
+        return response, 200
     
     if not text:
         return jsonify({'error': 'No text provided'}), 400
     
-    result = normalize_slang(text)
-    return jsonify(result), 200
-
-def translate_historical(text):
-    """Convert old/historical English to modern English"""
-    historical_dict = {
-        'thee': 'you',
-        'thou': 'you',
-        'thy': 'your',
-        'thine': 'yours',
-        'hath': 'has',
-        'doth': 'does',
-        'art': 'are',
-        'ere': 'before',
-        'prithee': 'please',
-        'forsooth': 'truly',
-        'verily': 'indeed',
-        'methinks': 'it seems to me',
-        'betwixt': 'between',
-        'wherefore': 'why',
-        'whence': 'where',
-        'thither': 'there',
-        'hither': 'here',
-        'naught': 'nothing',
-        'aught': 'anything',
-        'oft': 'often',
-        'ne\'er': 'never',
-        'o\'er': 'over',
-        'mayhap': 'perhaps',
-        'prune': 'trim',
-        'withal': 'with',
-        'shall': 'will',
-        'hast': 'have',
-        'am': 'am',
-        'wast': 'was',
-        'wert': 'were',
-        'hadst': 'had',
-        'canst': 'can',
-        'dost': 'do',
-        'shalt': 'will',
-        'didst': 'did',
-        'shouldst': 'should',
-        'wouldst': 'would',
-        'mightst': 'might',
-        'mustst': 'must',
-        'sayest': 'say',
-        'goest': 'go',
-        'comest': 'come',
-        'givest': 'give',
-        'takest': 'take',
-        'knowest': 'know',
-        'lovest': 'love',
-        'seest': 'see',
-        'believest': 'believe',
-        'doest': 'do',
-        'makest': 'make',
-        'findest': 'find',
-        'keepest': 'keep',
-        'tellest': 'tell',
-        'speakest': 'speak',
-        'heareth': 'hears',
-        'seeth': 'sees',
-        'knoweth': 'knows',
-        'loveth': 'loves',
-        'speaketh': 'speaks',
-        'goeth': 'goes',
-        'cometh': 'comes',
-        'giveth': 'gives',
-        'taketh': 'takes',
-        'maketh': 'makes',
-        'saith': 'says',
-        'doeth': 'does',
-        'keepeth': 'keeps',
-        'findeth': 'finds',
-        'believeth': 'believes',
-        'thinketh': 'thinks',
-        'showeth': 'shows',
-        'telleth': 'tells',
-        'calleth': 'calls',
-        'beareth': 'bears',
-        'forbear': 'refrain from',
-        'beseeched': 'begged',
-        'beseech': 'beg',
-        'prithee': 'please',
-        'marry': 'indeed',
-        'forsooth': 'truly',
-        'nay': 'no',
-        'yea': 'yes',
-        'aye': 'yes',
-        'good-bye': 'goodbye',
-        'adieu': 'goodbye',
-        'begone': 'go away',
-        'hence': 'from here',
-        'thence': 'from there',
-        'henceforth': 'from now on',
-        'thereafter': 'afterwards',
-        'therein': 'in that',
-        'thereupon': 'on that',
-        'thereof': 'of that',
-        'therewith': 'with that',
-        'aforetime': 'previously',
-        'anon': 'soon',
-        'by and by': 'soon',
-        'befall': 'happen to',
-        'befallen': 'happened to',
-        'become': 'suit',
-        'becoming': 'suitable',
-        'behoof': 'benefit',
-        'demeanor': 'behavior',
-        'countenance': 'face',
-        'visage': 'face',
-        'discourse': 'conversation',
-        'converse': 'talk',
-        'partake': 'share',
-        'repast': 'meal',
-        'supper': 'dinner',
-        'breakfast': 'breakfast',
-        'dinner': 'lunch',
-        'promenade': 'walk',
-        'carriage': 'car',
-        'horse': 'horse',
-        'mistress': 'woman',
-        'lord': 'man',
-        'lady': 'woman',
-        'gentleman': 'man',
-        'knave': 'fool',
-        'varlet': 'rogue',
-        'scoundrel': 'villain',
-        'rogue': 'villain',
-        'villain': 'villain',
-        'miscreant': 'villain',
-        'knight': 'knight',
-        'squire': 'servant',
-        'yeoman': 'farmer',
-        'merchant': 'merchant',
-        'peasant': 'farmer',
-        'serf': 'slave',
-        'vassal': 'servant',
-        'apprentice': 'trainee',
-        'journeyman': 'worker',
-        'craftsman': 'worker',
-        'blacksmith': 'metalworker',
-        'miller': 'grain processor',
-        'baker': 'baker',
-        'butcher': 'butcher',
-        'cobbler': 'shoemaker',
-        'tailor': 'tailor',
-        'weaver': 'weaver',
-        'tanner': 'leather worker',
-        'cordwainer': 'shoemaker'
-    }
-    
+    result = project_fields(normalize_slang(text, explain, spellcheck), fields)
+    with metrics.timer('json_serialization'):
+        response = jsonify(result)
+    return response, 200
+
+def translate_historical(text, explain=True):
+    """Convert old/historical English to modern English (explain=False skips explanations)"""
     words = text.lower().split()
+    spans = get_normalizer(HISTORICAL_LEXICON).find_spans(words)
     translated_words = []
     explanations = []
+    end = 0
     
-    for word in words:
-        clean_word = word.rstrip('.,!?;:')
-        punctuation = word[len(clean_word):]
+    for i, word in enumerate(words):
+        if i < end:
+            continue  # Inside a multi-word match
         
-        if clean_word in historical_dict:
-            modern = historical_dict[clean_word]
+        span = spans.get(i)
+        if span is not None:
+            end, modern, punctuation = span
+            original = word if end == i + 1 else ' '.join(words[i:end])
             translated_words.append(modern + punctuation)
-            explanations.append({
-                'original': word,
-                'modern': modern + punctuation,
-                'era': 'Middle/Early Modern English',
-                'explanation': f"Old English term meaning '{modern}'"
-            })
+            if explain:
+                explanations.append({
+                    'original': original,
+                    'modern': modern + punctuation,
+                    'era': 'Middle/Early Modern English',
+                    'explanation': f"Old English term meaning '{modern}'"
+                })
         else:
             translated_words.append(word)
-            explanations.append({
-                'original': word,
-                'modern': word,
-                'era': 'Modern English',
-                'explanation': 'Already in modern form'
-            })
+            if explain:
+                explanations.append({
+                    'original': word,
+                    'modern': word,
+                    'era': 'Modern English',
+                    'explanation': 'Already in modern form'
+                })
     
     modern_text = ' '.join(translated_words)
-    return {
+    result = {
         'modern_text': modern_text,
-        'explanations': explanations,
         'confidence': 0.88
     }
+    if explain:
+        result['explanations'] = explanations
+    return result
 
 @app.route('/api/translate-historical', methods=['POST'])
 @login_required
@@ -1008,12 +1321,60 @@ def api_translate_historical():
     """Translate historical English API endpoint"""
     data = request.get_json()
     text = data.get('text')
+    texts = data.get('texts')
+    
+    try:
+        fields = requested_fields(data, NORMALIZER_DETAIL_LEVELS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    explain = wants_field(fields, 'explanations')
+    
+    # Batch input: {"texts": [...]} -> {"results": [...]}
+    if isinstance(texts, list) and texts:
+        results = [project_fields(translate_historical(t, explain), fields) if isinstance(t, str) else {'error': 'Text must be a string'} for t in texts]
+        with metrics.timer('json_serialization'):
+            response = jsonify({'results': results, 'total': len(results)})
+        return response, 200
     
     if not text:
         return jsonify({'error': 'No text provided'}), 400
     
-    result = translate_historical(text)
-    return jsonify(result), 200
+    result = translate_historical(text, explain)
+    record_history('translate-historical', text, result['modern_text'], 'historical', 'en', result['confidence'])
+    result = project_fields(result, fields)
+    with metrics.timer('json_serialization'):
+        response = jsonify(result)
+    return response, 200
+
+@app.route('/api/translate-historical/stream', methods=['POST'])
+@login_required
+def api_translate_historical_stream():
+    """
+    Modernize a historical English document of any size, streamed back as
+    text/plain. The document is a multipart upload ('file') or the raw
+    request body (UTF-8); whitespace and line breaks are kept as they are.
+    """
+    upload = request.files.get('file')
+    if upload is not None:
+        source = upload.stream
+    elif request.mimetype in ('multipart/form-data', 'application/x-www-form-urlencoded'):
+        return jsonify({'error': 'No file provided'}), 400
+    else:
+        source = request.stream
+    
+    # Incremental decoding: multi-byte characters split across reads are fine
+    reader = codecs.getreader('utf-8')(source, errors='replace')
+    normalizer = get_normalizer(HISTORICAL_LEXICON)
+    
+    def generate():
+        started = time.perf_counter()
+        try:
+            for piece in normalizer.rewrite_stream(reader, config.HISTORICAL_STREAM_CHUNK_CHARS):
+                yield piece
+        finally:
+            metrics.record_stage('historical_stream', time.perf_counter() - started)
+    
+    return Response(stream_with_context(generate()), mimetype='text/plain')
 
 @app.route('/api/translate-video', methods=['POST'])
 @login_required
@@ -1023,6 +1384,14 @@ def api_translate_video():
     subtitles = data.get('subtitles', [])
     target_lang = data.get('target_lang', 'hindi')
     
+    try:
+        fields = requested_fields(data, VIDEO_DETAIL_LEVELS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    # Word explanations are also needed to count translated words
+    explain = (wants_field(fields, 'word_explanations') or wants_field(fields, 'words_translated')
+               or wants_field(fields, 'total_words'))
+    
     dictionaries, _, _ = load_translation_rules()
     
     # Get the dictionary for this language pair
@@ -1054,38 +1423,430 @@ def api_translate_video():
             # Translate the word
             if clean_word in word_dict:
                 translated_word = word_dict[clean_word].get('word', clean_word)
-                word_explanations.append({
-                    'original': clean_word,
-                    'translated': translated_word,
-                    'meaning': word_dict[clean_word].get('meaning', ''),
-                    'pos': word_dict[clean_word].get('pos', 'word')
-                })
+                if explain:
+                    word_explanations.append({
+                        'original': clean_word,
+                        'translated': translated_word,
+                        'meaning': word_dict[clean_word].get('meaning', ''),
+                        'pos': word_dict[clean_word].get('pos', 'word')
+                    })
                 translated_words.append(leading_punct + translated_word + trailing_punct)
             else:
                 # If word not in dictionary, keep it as is (proper nouns, numbers, etc)
                 translated_words.append(word)
-                word_explanations.append({
-                    'original': clean_word,
-                    'translated': clean_word,
-                    'meaning': 'Proper noun or special word',
-                    'pos': 'proper_noun'
-                })
+                if explain:
+                    word_explanations.append({
+                        'original': clean_word,
+                        'translated': clean_word,
+                        'meaning': 'Proper noun or special word',
+                        'pos': 'proper_noun'
+                    })
         
         translated_text = ' '.join(translated_words)
         
-        translated_subtitles.append({
+        entry = {
             'original': subtitle,
-            'translated': translated_text,
-            'word_explanations': word_explanations,
-            'words_translated': len([w for w in word_explanations if w['original'] != w['translated']]),
-            'total_words': len(word_explanations)
+            'translated': translated_text
+        }
+        if explain:
+            entry['word_explanations'] = word_explanations
+            entry['words_translated'] = len([w for w in word_explanations if w['original'] != w['translated']])
+            entry['total_words'] = len(word_explanations)
+        translated_subtitles.append(project_fields(entry, fields))
+    
+    with metrics.timer('json_serialization'):
+        response = jsonify({
+            'translated_subtitles': translated_subtitles,
+            'total': len(translated_subtitles),
+            'target_language': target_lang
         })
+    return response, 200
+
+@app.route('/api/history', methods=['GET'])
+@login_required
+def api_history():
+    """The logged-in user's translations, newest first (?limit=20&before=<next_cursor>)"""
+    try:
+        limit = min(max(int(request.args.get('limit', 20)), 1), 100)
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    
+    try:
+        page = get_history().query(session['user_id'], limit, request.args.get('before'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    with metrics.timer('json_serialization'):
+        response = jsonify(page)
+    return response, 200
+
+# ==================== BACKGROUND JOBS ====================
+
+SUBTITLE_MIMETYPES = {'srt': 'application/x-subrip', 'vtt': 'text/vtt'}
+
+def get_job_queue():
+    """The job queue shared by web workers and job workers"""
+    return get_queue(config.JOB_DB, config.JOB_LEASE_SECONDS, config.JOB_MAX_ATTEMPTS)
+
+def run_document_job(payload, progress):
+    """'document' job: translate_document over the whole text (the job pool provides the parallelism)"""
+    return translate_document(
+        payload['text'], payload['source_lang'], payload['target_lang'], translate_text,
+        include_sentences=payload.get('include_sentences', False),
+        progress=progress
+    )
+
+def run_subtitle_job(payload, progress):
+    """'subtitles' job: translate every cue of an SRT/VTT file, keeping its timing"""
+    subtitle_format = payload['format']
+    with tempfile.TemporaryDirectory() as workdir:
+        source_path = os.path.join(workdir, f"input.{subtitle_format}")
+        output_path = os.path.join(workdir, f"output.{subtitle_format}")
+        with open(source_path, 'w', encoding='utf-8') as f:
+            f.write(payload['content'])
+        
+        entries, subtitle_format = SubtitleProcessor.parse_subtitle_file(source_path)
+        if not entries:
+            raise ValueError('No subtitle entries found')
+        
+        def translate_cue(text, source_lang, target_lang):
+            return translate_text(text, source_lang, target_lang, fields=frozenset())
+        
+        SubtitleProcessor.translate_entries(entries, translate_cue, payload['source_lang'], payload['target_lang'],
+                                            progress=progress)
+        save = SubtitleProcessor.save_to_vtt if subtitle_format == 'vtt' else SubtitleProcessor.save_to_srt
+        if not save(entries, output_path):
+            raise RuntimeError('Could not write the translated subtitles')
+        with open(output_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    
+    return {
+        'format': subtitle_format,
+        'content': content,
+        'entries': len(entries),
+        'confidence': round(sum(e.translation_confidence for e in entries) / len(entries), 2),
+        'source_language': payload['source_lang'],
+        'target_language': payload['target_lang']
+    }
+
+# Job type -> handler(payload, progress) run by the job workers
+JOB_HANDLERS = {
+    'document': run_document_job,
+    'subtitles': run_subtitle_job
+}
+
+def job_payload(job_type, data, upload=None):
+    """
+    Validate a job submission and build the payload stored with the job.
+    upload: optional uploaded file holding the document/subtitle text.
+    Raises ValueError with a client-facing message.
+    """
+    if job_type not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job type '{job_type}' (expected one of: {', '.join(sorted(JOB_HANDLERS))})")
+    
+    content = data.get('content') or data.get('text')
+    filename = data.get('filename', '')
+    if upload is not None:
+        raw = upload.read()
+        try:
+            content = raw.decode('utf-8')
+        except UnicodeDecodeError:
+            content = raw.decode('latin-1')
+        filename = upload.filename or filename
+    if not isinstance(content, str) or not content.strip():
+        raise ValueError('No content provided')
+    
+    payload = {
+        'source_lang': data.get('source_lang', 'en'),
+        'target_lang': data.get('target_lang', 'hindi')
+    }
+    if job_type == 'document':
+        payload['text'] = content
+        payload['include_sentences'] = str(data.get('include_sentences', '')).lower() in ('1', 'true', 'yes')
+    else:
+        subtitle_format = (data.get('format') or os.path.splitext(filename)[1].lstrip('.')).lower()
+        if subtitle_format == 'webvtt' or (not subtitle_format and content.lstrip('\ufeff').startswith('WEBVTT')):
+            subtitle_format = 'vtt'
+        subtitle_format = subtitle_format or 'srt'
+        if subtitle_format not in SUBTITLE_MIMETYPES:
+            raise ValueError(f"Unsupported subtitle format '{subtitle_format}' (expected srt or vtt)")
+        payload['format'] = subtitle_format
+        payload['content'] = content
+    return payload
+
+def job_response(job, status=200):
+    """Job status with links to its routes"""
+    job['links'] = {
+        'status': url_for('api_job_status', job_id=job['job_id']),
+        'result': url_for('api_job_result', job_id=job['job_id']),
+        'cancel': url_for('api_cancel_job', job_id=job['job_id']),
+        'retry': url_for('api_retry_job', job_id=job['job_id'])
+    }
+    return jsonify(job), status
+
+def get_own_job(job_id):
+    """A job of the logged-in user (None if unknown or someone else's: both answer 404)"""
+    return get_job_queue().get(job_id, user_id=session['user_id'])
+
+@app.route('/api/jobs', methods=['POST'])
+@login_required
+def api_submit_job():
+    """
+    Queue a long-running translation and return at once (202). Accepts JSON
+    ({"type": "document"|"subtitles", "content"/"text": ...}) or a multipart
+    upload ('file' plus the same fields as form values).
+    """
+    upload = request.files.get('file')
+    data = request.form if upload is not None or request.form else (request.get_json(silent=True) or {})
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
     
-    return jsonify({
-        'translated_subtitles': translated_subtitles,
-        'total': len(translated_subtitles),
-        'target_language': target_lang
-    }), 200
+    try:
+        payload = job_payload(data.get('type'), data, upload)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    queue = get_job_queue()
+    job_id = queue.submit(data.get('type'), payload, user_id=session['user_id'])
+    response, status = job_response(queue.get(job_id), 202)
+    response.headers['Location'] = url_for('api_job_status', job_id=job_id)
+    return response, status
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+@login_required
+def api_job_status(job_id):
+    """Status and progress of a job"""
+    job = get_own_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return job_response(job)
+
+@app.route('/api/jobs/<job_id>/result', methods=['GET'])
+@login_required
+def api_job_result(job_id):
+    """Result of a finished job as JSON, or as a file with ?download=1"""
+    queue = get_job_queue()
+    job = get_own_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    if job['status'] != SUCCEEDED:
+        return jsonify({'error': f"Job is {job['status']}", 'status': job['status']}), 409
+    
+    result = queue.result(job_id)
+    if request.args.get('download', '').lower() in ('1', 'true', 'yes'):
+        if job['type'] == 'subtitles':
+            body, mimetype, extension = result['content'], SUBTITLE_MIMETYPES[result['format']], result['format']
+        else:
+            body, mimetype, extension = result['translated_text'], 'text/plain', 'txt'
+        response = Response(body, mimetype=mimetype)
+        response.headers['Content-Disposition'] = f'attachment; filename="{job_id}.{extension}"'
+        return response
+    
+    with metrics.timer('json_serialization'):
+        response = jsonify(result)
+    return response, 200
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+@login_required
+def api_cancel_job(job_id):
+    """Cancel a queued or running job"""
+    if get_own_job(job_id) is None:
+        return jsonify({'error': 'Job not found'}), 404
+    job = get_job_queue().cancel(job_id)
+    if job['status'] in (SUCCEEDED, FAILED):
+        return jsonify({'error': f"Job already {job['status']}", 'status': job['status']}), 409
+    return job_response(job)
+
+@app.route('/api/jobs/<job_id>/retry', methods=['POST'])
+@login_required
+def api_retry_job(job_id):
+    """Queue a failed or cancelled job again"""
+    queue = get_job_queue()
+    job = get_own_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    if job['status'] not in (FAILED, CANCELLED):
+        return jsonify({'error': f"Only failed or cancelled jobs can be retried (job is {job['status']})",
+                        'status': job['status']}), 409
+    return job_response(queue.retry(job_id), 202)
+
+# ==================== METRICS ====================
+
+@app.before_request
+def start_request_timer():
+    """Remember when an API request started"""
+    if request.path.startswith('/api/'):
+        g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    """Record latency, status and body size of finished API requests"""
+    started = g.pop('request_started', None)
+    if started is not None:
+        metrics.record_request(
+            request.endpoint or request.path,
+            response.status_code,
+            time.perf_counter() - started,
+            request.content_length
+        )
+        metrics.shared.maybe_flush()
+    return response
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus metrics merged across all workers on this node"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+# ==================== ADMISSION CONTROL ====================
+
+def get_admission_controller():
+    """Rate limiter and concurrency limiter shared by the workers on this node"""
+    return get_controller(config.RATE_LIMIT_DB, config.MAX_CONCURRENT_REQUESTS,
+                          config.CONCURRENCY_SLOT_TTL, config.OVERLOAD_RETRY_AFTER)
+
+def admission_limit(endpoint):
+    """Limits of an endpoint (config.RATE_LIMITS, falling back to 'default')"""
+    return Limit(*config.RATE_LIMITS.get(endpoint, config.RATE_LIMITS['default']))
+
+def admission_client():
+    """
+    Rate-limit key of the caller: the logged-in user, else the IP address
+    (the client's, from X-Forwarded-For, when DESI_TRUSTED_PROXIES is set)
+    """
+    user_id = session.get('user_id')
+    return f"user:{user_id}" if user_id is not None else f"ip:{request.remote_addr}"
+
+@app.before_request
+def admit_request():
+    """Reject API requests over the caller's rate (429) or the node's capacity (503) before doing any work"""
+    if not config.RATE_LIMIT_ENABLED or not request.path.startswith('/api/') or request.endpoint is None:
+        return None
+    
+    limit = admission_limit(request.endpoint)
+    cost = request_cost(request.content_length, config.RATE_LIMIT_BYTES_PER_TOKEN, limit,
+                        unknown_length='Transfer-Encoding' in request.headers)
+    try:
+        decision = get_admission_controller().admit(request.endpoint, admission_client(), cost, limit)
+    except sqlite3.Error as e:
+        # Never turn a limiter failure into an outage
+        print(f"Warning: admission control unavailable: {e}")
+        return None
+    
+    if decision.allowed:
+        g.admission_slot = decision.slot
+        return None
+    
+    error = 'Too many requests, slow down' if decision.status == 429 else 'Server is busy, try again shortly'
+    response = jsonify({'error': error, 'retry_after': decision.retry_after})
+    response.status_code = decision.status
+    response.headers['Retry-After'] = str(decision.retry_after)
+    return response
+
+@app.teardown_request
+def release_admission_slot(error=None):
+    """Free the request's concurrency slot (after a streamed body has been sent)"""
+    slot = g.pop('admission_slot', None)
+    if slot is not None:
+        try:
+            get_admission_controller().release(slot)
+        except sqlite3.Error as e:
+            print(f"Warning: could not release admission slot: {e}")
+
+# ==================== WARM-UP & HEALTH ====================
+
+def warmup_sentences():
+    """
+    (text, source_lang, target_lang) translated during warm-up: the warm-up
+    file in every target language, then the most frequent recent history
+    """
+    sentences = [(sentence, 'en', language)
+                 for sentence in load_sentences(config.WARMUP_SENTENCES_FILE)
+                 for language in config.WARMUP_TARGET_LANGUAGES]
+    if config.HISTORY_ENABLED and config.WARMUP_HISTORY_LIMIT:
+        sentences += get_history().frequent_texts(config.WARMUP_HISTORY_LIMIT,
+                                                  endpoints=('translate', 'translate-detailed'))
+    return sentences
+
+def warmup_steps():
+    """What a cold worker would otherwise do on its first requests"""
+    pairs = [f"en_{language}" for language in config.WARMUP_TARGET_LANGUAGES]
+    
+    def load_lexicons():
+        get_normalizer(SLANG_LEXICON)
+        get_normalizer(HISTORICAL_LEXICON)
+    
+    def load_pair_indexes():
+        for pair in pairs:
+            get_lemmatizer(pair)
+            get_phrase_trie(pair)
+            get_reverse_index(pair)
+    
+    def translate_common_sentences():
+        # Fills the dictionary, lemma and lexicon caches with the usual working set
+        for text, source_lang, target_lang in warmup_sentences():
+            translate_text(text, source_lang or 'en', target_lang or 'hindi')
+    
+    return [
+        ('rules_snapshot', load_translation_rules),
+        ('lexicons', load_lexicons),
+        ('pair_indexes', load_pair_indexes),
+        ('translations', translate_common_sentences)
+    ]
+
+def start_warmup():
+    """Warm this worker up in the background (gunicorn post_worker_init, python app.py or the first /readyz)"""
+    if config.WARMUP_ENABLED:
+        warmup.start(warmup_steps)
+
+@app.route('/healthz')
+def healthz():
+    """Liveness: the process is up and serving requests (checks nothing else)"""
+    return Response('ok\n', mimetype='text/plain')
+
+@app.route('/readyz')
+def readyz():
+    """Readiness: 200 once this worker has warmed up, 503 with Retry-After until then"""
+    if not config.WARMUP_ENABLED:
+        return jsonify({'status': 'ready', 'warmup': 'disabled'}), 200
+    start_warmup()  # No-op once started
+    if warmup.ready:
+        return jsonify(warmup.report()), 200
+    response = jsonify(warmup.report())
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+# ==================== PROFILING ====================
+
+@app.before_request
+def start_request_profile():
+    """Profile this API request if requested by header/config or slow-request mode"""
+    if request.path.startswith('/api/'):
+        g.profile = profiling.profiler.start(request.headers)
+
+@app.after_request
+def finish_request_profile(response):
+    """Write the request's profile and describe it in response headers"""
+    profile = g.pop('profile', None)
+    if profile is not None:
+        response.headers.update(profiling.profiler.finish(profile))
+    return response
+
+@app.teardown_request
+def abandon_request_profile(error=None):
+    """Make sure a profiler never outlives a request that raised"""
+    profile = g.pop('profile', None)
+    if profile is not None:
+        profiling.profiler.abandon(profile)
+
+# ==================== RESPONSE COMPRESSION ====================
+
+@app.after_request
+def compress_api_response(response):
+    """gzip/brotli large API responses the client accepts (registered last, so runs first)"""
+    if request.path.startswith('/api/'):
+        with metrics.timer('compression'):
+            compress_response(response, request.headers.get('Accept-Encoding'))
+    return response
 
 @app.errorhandler(404)
 def not_found(error):
@@ -1099,4 +1860,16 @@ def internal_error(error):
 
 if __name__ == '__main__':
     init_db()
-    app.run(debug=False, host='0.0.0.0', port=5000)
+    # The development server runs its own job workers; under gunicorn they
+    # run as a separate process (Procfile: worker)
+    job_workers, job_workers_stop = start_workers(
+        config.JOB_DB, JOB_HANDLERS, config.JOB_WORKERS,
+        lease_seconds=config.JOB_LEASE_SECONDS, max_attempts=config.JOB_MAX_ATTEMPTS,
+        poll_interval=config.JOB_POLL_INTERVAL, progress_interval=config.JOB_PROGRESS_INTERVAL
+    )
+    # After forking the job workers: never fork while the warm-up thread holds a lock
+    start_warmup()
+    try:
+        app.run(debug=False, host='0.0.0.0', port=5000)
+    finally:
+        stop_workers(job_workers, job_workers_stop)
@@ -0,0 +1,200 @@
+"""
+Audio Levels Module for Desi Translate
+Streaming loudness normalization and silence trimming for PCM WAV files.
+
+Files are read in fixed-size blocks of frames through the stdlib wave
+module, so memory stays constant whatever the recording's length:
+normalization makes one pass to measure the RMS level and one to apply
+the gain, and trimming scans silence from the start and (seeking
+backwards) from the end, then copies the frames in between. Block math is
+vectorized with NumPy when it is installed and falls back to the pcm
+module otherwise (audioop, or pure Python where audioop is gone); all give
+the same levels.
+"""
+
+import math
+import wave
+from typing import Dict, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import pcm
+
+# Frames read or written at a time
+BLOCK_FRAMES = 65536
+
+# NumPy sample types per sample width (8-bit WAV is unsigned)
+_DTYPES = {1: 'u1', 2: '<i2', 4: '<i4'}
+
+
+def _use_numpy(sample_width: int) -> bool:
+    return np is not None and sample_width in _DTYPES
+
+
+def _samples(block: bytes, sample_width: int):
+    """Block as float64 samples centred on zero"""
+    samples = np.frombuffer(block, dtype=_DTYPES[sample_width]).astype(np.float64)
+    if sample_width == 1:
+        samples -= 128.0
+    return samples
+
+
+def _pcm_rms(block: bytes, sample_width: int) -> float:
+    """pcm.rms of a block; 8-bit (unsigned) audio is widened first, as rms returns an integer"""
+    if sample_width == 1:
+        return pcm.rms(pcm.lin2lin(pcm.bias(block, 1, -128), 1, 2), 2) / 256.0
+    return float(pcm.rms(block, sample_width))
+
+
+def full_scale(sample_width: int) -> float:
+    """Largest sample amplitude of the width (dBFS reference)"""
+    return float(2 ** (8 * sample_width - 1))
+
+
+def to_dbfs(rms: float, sample_width: int) -> float:
+    """RMS amplitude -> dBFS (-inf for digital silence)"""
+    return 20 * math.log10(rms / full_scale(sample_width)) if rms > 0 else float('-inf')
+
+
+def block_sum_squares(block: bytes, sample_width: int) -> float:
+    """Sum of squared samples of a block"""
+    if _use_numpy(sample_width):
+        samples = _samples(block, sample_width)
+        return float(np.dot(samples, samples))
+    return _pcm_rms(block, sample_width) ** 2 * (len(block) // sample_width)
+
+
+def chunk_rms(block: bytes, sample_width: int, chunk_bytes: int) -> List[float]:
+    """RMS of each chunk_bytes-long piece of a block (the last may be shorter)"""
+    if _use_numpy(sample_width):
+        samples = _samples(block, sample_width)
+        per_chunk = chunk_bytes // sample_width
+        whole = len(samples) // per_chunk * per_chunk
+        levels = np.sqrt(np.mean(np.square(samples[:whole]).reshape(-1, per_chunk), axis=1)).tolist()
+        if whole < len(samples):
+            levels.append(float(np.sqrt(np.mean(np.square(samples[whole:])))))
+        return levels
+    return [_pcm_rms(block[i:i + chunk_bytes], sample_width) for i in range(0, len(block), chunk_bytes)]
+
+
+def scale_block(block: bytes, sample_width: int, factor: float) -> bytes:
+    """Block multiplied by factor, clipped to the sample range"""
+    if _use_numpy(sample_width):
+        samples = _samples(block, sample_width) * factor
+        limit = full_scale(sample_width)
+        np.clip(samples, -limit, limit - 1, out=samples)
+        if sample_width == 1:
+            samples += 128.0
+        return np.rint(samples).astype(_DTYPES[sample_width]).tobytes()
+    if sample_width == 1:
+        return pcm.bias(pcm.mul(pcm.bias(block, 1, -128), 1, factor), 1, 128)
+    return pcm.mul(block, sample_width, factor)
+
+
+def _copy_params(source: wave.Wave_read, target: wave.Wave_write):
+    target.setnchannels(source.getnchannels())
+    target.setsampwidth(source.getsampwidth())
+    target.setframerate(source.getframerate())
+
+
+def wav_dbfs(path: str, block_frames: int = BLOCK_FRAMES) -> float:
+    """Average loudness (RMS over the whole file) of a PCM WAV file in dBFS"""
+    with wave.open(path, 'rb') as wav:
+        width = wav.getsampwidth()
+        total, count = 0.0, 0
+        while True:
+            block = wav.readframes(block_frames)
+            if not block:
+                break
+            total += block_sum_squares(block, width)
+            count += len(block) // width
+    return to_dbfs(math.sqrt(total / count) if count else 0.0, width)
+
+
+def normalize_wav(source_path: str, target_path: str, target_db: float = -20.0,
+                  block_frames: int = BLOCK_FRAMES) -> Dict:
+    """
+    Apply the gain that brings a PCM WAV file's average loudness to target_db.
+
+    Returns:
+        Dict with source_dbfs and gain_db (gain 0 for a silent file)
+    """
+    source_dbfs = wav_dbfs(source_path, block_frames)
+    gain_db = target_db - source_dbfs if math.isfinite(source_dbfs) else 0.0
+    factor = 10 ** (gain_db / 20)
+
+    with wave.open(source_path, 'rb') as source, wave.open(target_path, 'wb') as target:
+        _copy_params(source, target)
+        width = source.getsampwidth()
+        while True:
+            block = source.readframes(block_frames)
+            if not block:
+                break
+            target.writeframesraw(scale_block(block, width, factor) if gain_db else block)
+    return {'source_dbfs': round(source_dbfs, 2), 'gain_db': round(gain_db, 2)}
+
+
+def silence_bounds(path: str, threshold_db: float = -40.0, chunk_ms: int = 10,
+                   block_frames: int = BLOCK_FRAMES) -> Tuple[int, int]:
+    """
+    Frame range [start, end) left after removing leading and trailing chunks
+    quieter than threshold_db (like pydub's detect_leading/trailing_silence).
+    A file that is silent throughout gives (0, 0).
+    """
+    with wave.open(path, 'rb') as wav:
+        width, channels, rate = wav.getsampwidth(), wav.getnchannels(), wav.getframerate()
+        total = wav.getnframes()
+        chunk_frames = max(1, rate * chunk_ms // 1000)
+        block_frames = max(chunk_frames, block_frames // chunk_frames * chunk_frames)
+        threshold = full_scale(width) * 10 ** (threshold_db / 20)
+
+        # Leading silence: first loud chunk from the start
+        start = None
+        position = 0
+        while position < total:
+            levels = chunk_rms(wav.readframes(block_frames), width, chunk_frames * channels * width)
+            loud = next((i for i, level in enumerate(levels) if level >= threshold), None)
+            if loud is not None:
+                start = position + loud * chunk_frames
+                break
+            position += block_frames
+        if start is None:
+            return 0, 0
+
+        # Trailing silence: last loud chunk, reading blocks backwards from the end
+        end = total
+        while end > start:
+            block_start = max(start, end - block_frames)
+            wav.setpos(block_start)
+            levels = chunk_rms(wav.readframes(end - block_start), width, chunk_frames * channels * width)
+            loud = next((i for i in range(len(levels) - 1, -1, -1) if levels[i] >= threshold), None)
+            if loud is not None:
+                return start, min(end, block_start + (loud + 1) * chunk_frames)
+            end = block_start
+        return start, start
+
+
+def trim_wav(source_path: str, target_path: str, threshold_db: float = -40.0, chunk_ms: int = 10,
+             block_frames: int = BLOCK_FRAMES) -> Dict:
+    """
+    Copy a PCM WAV file without its leading and trailing silence.
+
+    Returns:
+        Dict with leading_seconds and trailing_seconds removed
+    """
+    start, end = silence_bounds(source_path, threshold_db, chunk_ms, block_frames)
+    with wave.open(source_path, 'rb') as source, wave.open(target_path, 'wb') as target:
+        _copy_params(source, target)
+        rate, total = source.getframerate(), source.getnframes()
+        source.setpos(start)
+        remaining = end - start
+        while remaining > 0:
+            block = source.readframes(min(block_frames, remaining))
+            if not block:
+                break
+            target.writeframesraw(block)
+            remaining -= len(block) // (source.getsampwidth() * source.getnchannels())
+    return {'leading_seconds': round(start / rate, 3), 'trailing_seconds': round((total - end) / rate, 3)}
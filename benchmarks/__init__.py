@@ -0,0 +1,8 @@
+"""
+Benchmark Suite for Desi Translate
+Micro-benchmarks for the translation hot paths.
+
+Usage:
+    python -m benchmarks run --output bench_results.json
+    python -m benchmarks compare baseline.json bench_results.json
+"""
@@ -0,0 +1,117 @@
+"""
+Benchmark command line for Desi Translate
+
+    python -m benchmarks run [--output FILE] [--filter TEXT] [--min-time SECONDS]
+    python -m benchmarks compare BASELINE CURRENT [--threshold 0.10] [--metric p50_ms]
+    python -m benchmarks memory [--entries 1000000]
+    python -m benchmarks tts [--clients 16] [--utterances 20]
+
+`compare` exits with status 1 when any case regressed.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+# Allow `python benchmarks` as well as `python -m benchmarks` from the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.harness import compare_results, load_results, run_cases, save_results
+from benchmarks.suites import all_cases
+
+
+def cmd_run(args) -> int:
+    """Run the suite and save results"""
+    work_dir = tempfile.mkdtemp(prefix='desi_bench_')
+    try:
+        print("Desi Translate benchmarks")
+        print("-" * 50)
+        results = run_cases(all_cases(work_dir), min_time=args.min_time, name_filter=args.filter)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    save_results(results, args.output)
+    print(f"\n✓ Results saved: {args.output}")
+    return 0
+
+
+def cmd_compare(args) -> int:
+    """Compare current results against a baseline"""
+    rows = compare_results(load_results(args.baseline), load_results(args.current),
+                           threshold=args.threshold, metric=args.metric)
+
+    print(f"{'case':50} {'baseline':>12} {'current':>12} {'change':>9}")
+    print("-" * 86)
+    for row in rows:
+        marker = {'regression': '  ✗ REGRESSION', 'improvement': '  ✓ faster'}.get(row['status'], '')
+        print(f"{row['name']:50} {row['baseline']:>12.4f} {row['current']:>12.4f} {row['change']:>+8.1%}{marker}")
+
+    regressions = [row for row in rows if row['status'] == 'regression']
+    print(f"\n{len(rows)} cases compared, {len(regressions)} regression(s) above {args.threshold:.0%} ({args.metric})")
+    return 1 if regressions else 0
+
+
+def cmd_memory(args) -> int:
+    """Memory of one language pair: parsed JSON dicts vs ColumnarLexicon"""
+    from benchmarks.memory import measure_dictionary_memory
+
+    result = measure_dictionary_memory(args.entries)
+    print(f"Dictionary memory at {result['entries']:,} entries")
+    print("-" * 50)
+    print(f"  {'parsed JSON (dict per entry)':32} {result['json_bytes'] / 1e6:>10.1f} MB"
+          f"  {result['json_bytes'] / result['entries']:>7.0f} B/entry")
+    print(f"  {'ColumnarLexicon':32} {result['columnar_bytes'] / 1e6:>10.1f} MB"
+          f"  {result['columnar_bytes'] / result['entries']:>7.0f} B/entry")
+    print(f"\n{result['ratio']}x less memory")
+    return 0
+
+
+def cmd_tts(args) -> int:
+    """TTS worker throughput and latency, unbatched vs batched"""
+    from benchmarks.tts import measure_tts_queue
+
+    print(f"TTS queue: {args.clients} clients x {args.utterances} utterances (simulated engine)")
+    print("-" * 78)
+    print(f"  {'batch size':>10} {'utt/s':>8} {'batches':>8} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9} {'rejected':>9}")
+    for batch_size in (1, args.batch_size):
+        result = measure_tts_queue(args.clients, args.utterances, batch_size=batch_size)
+        print(f"  {batch_size:>10} {result['utterances_per_sec']:>8.1f} {result['batches']:>8}"
+              f" {result['p50_ms']:>9.1f} {result['p99_ms']:>9.1f} {result['max_ms']:>9.1f} {result['rejected']:>9}")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Desi Translate micro-benchmarks')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run = sub.add_parser('run', help='run the benchmark suite')
+    run.add_argument('--output', default='bench_results.json', help='where to save results JSON')
+    run.add_argument('--filter', default=None, help='only run cases whose name contains this text')
+    run.add_argument('--min-time', type=float, default=0.5, help='minimum seconds spent timing each case')
+    run.set_defaults(handler=cmd_run)
+
+    compare = sub.add_parser('compare', help='flag regressions against a stored baseline')
+    compare.add_argument('baseline', help='baseline results JSON')
+    compare.add_argument('current', help='current results JSON')
+    compare.add_argument('--threshold', type=float, default=0.10, help='relative slowdown treated as a regression')
+    compare.add_argument('--metric', default='p50_ms', choices=['p50_ms', 'p99_ms', 'mean_ms', 'min_ms'])
+    compare.set_defaults(handler=cmd_compare)
+
+    memory = sub.add_parser('memory', help='measure dictionary memory per layout')
+    memory.add_argument('--entries', type=int, default=1_000_000, help='synthetic dictionary size')
+    memory.set_defaults(handler=cmd_memory)
+
+    tts = sub.add_parser('tts', help='measure TTS worker throughput and latency under concurrent load')
+    tts.add_argument('--clients', type=int, default=16, help='concurrent caller threads')
+    tts.add_argument('--utterances', type=int, default=20, help='utterances per caller')
+    tts.add_argument('--batch-size', type=int, default=16, help='batch size compared against unbatched')
+    tts.set_defaults(handler=cmd_tts)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
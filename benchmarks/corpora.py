@@ -0,0 +1,136 @@
+"""
+Synthetic Corpora for Desi Translate Benchmarks
+Deterministic text generators with fixed sizes and vocabulary mixes.
+
+The word lists are embedded here (not read from rules/) so that a corpus
+stays byte-for-byte identical when the dictionaries change, which keeps
+results comparable across commits.
+"""
+
+import random
+from typing import Dict, List
+
+# Fixed seed: every run generates exactly the same corpora
+DEFAULT_SEED = 2026
+
+# Number of words per generated sentence/document
+SIZES = {
+    'small': 8,
+    'medium': 64,
+    'large': 512
+}
+
+# Headwords present in rules/dictionaries_comprehensive.json (en_hindi)
+KNOWN_WORDS = [
+    'i', 'you', 'he', 'she', 'we', 'they', 'is', 'are', 'was', 'will',
+    'hello', 'good', 'morning', 'water', 'food', 'love', 'house', 'book',
+    'eat', 'go', 'come', 'see', 'read', 'write', 'school', 'market',
+    'friend', 'mother', 'father', 'big', 'small', 'happy', 'today', 'tree'
+]
+
+# Pseudo-words guaranteed to miss every dictionary
+OOV_WORDS = [
+    'zorvex', 'plimber', 'quandle', 'frobnic', 'mirkle', 'snadget',
+    'tralvin', 'blorpish', 'wexfield', 'grommle', 'vintrax', 'dappled'
+]
+
+SLANG_WORDS = [
+    'u', 'ur', 'r', 'gr8', 'l8r', 'b4', 'thx', 'pls', 'lol', 'omg',
+    'brb', 'btw', 'nvm', 'gud', 'cuz', 'luv', 'ttyl', '2day'
+]
+
+HISTORICAL_WORDS = [
+    'thee', 'thou', 'thy', 'hath', 'doth', 'art', 'ere', 'prithee',
+    'verily', 'methinks', 'betwixt', 'wherefore', 'whence', 'hither',
+    'naught', 'oft', 'mayhap', 'knoweth', 'speaketh', 'saith'
+]
+
+PUNCTUATION = ['', '', '', '', ',', '.', '!', '?']
+
+# Vocabulary mixes: list of (word list, weight)
+MIXES = {
+    'known': [(KNOWN_WORDS, 1.0)],
+    'mixed': [(KNOWN_WORDS, 0.7), (OOV_WORDS, 0.3)],
+    'oov': [(OOV_WORDS, 1.0)],
+    'slang': [(SLANG_WORDS, 0.5), (KNOWN_WORDS, 0.5)],
+    'historical': [(HISTORICAL_WORDS, 0.4), (KNOWN_WORDS, 0.6)]
+}
+
+IDIOMS = [
+    'break a leg',
+    'piece of cake',
+    'once in a blue moon',
+    'hit the nail on the head',
+    'not a real idiom at all'
+]
+
+
+def generate_text(size: str = 'small', mix: str = 'known', seed: int = DEFAULT_SEED) -> str:
+    """
+    Generate a deterministic synthetic text.
+
+    Args:
+        size: Key of SIZES ('small', 'medium', 'large')
+        mix: Key of MIXES ('known', 'mixed', 'oov', 'slang', 'historical')
+        seed: Random seed
+
+    Returns:
+        Text with SIZES[size] words and occasional punctuation
+    """
+    rng = random.Random(f"{seed}:{size}:{mix}")
+    pools = [pool for pool, _ in MIXES[mix]]
+    weights = [weight for _, weight in MIXES[mix]]
+
+    words = []
+    for _ in range(SIZES[size]):
+        pool = rng.choices(pools, weights=weights)[0]
+        words.append(rng.choice(pool) + rng.choice(PUNCTUATION))
+
+    return ' '.join(words)
+
+
+def generate_corpus(mix: str = 'known', seed: int = DEFAULT_SEED) -> Dict[str, str]:
+    """Generate one text per size for the given vocabulary mix"""
+    return {size: generate_text(size, mix, seed) for size in SIZES}
+
+
+def generate_srt(entries: int = 200, mix: str = 'mixed', seed: int = DEFAULT_SEED) -> str:
+    """
+    Generate a deterministic SRT subtitle track.
+
+    Args:
+        entries: Number of subtitle cues
+        mix: Vocabulary mix for the cue text
+        seed: Random seed
+
+    Returns:
+        SRT file content
+    """
+    rng = random.Random(f"{seed}:srt:{mix}")
+    pools = [pool for pool, _ in MIXES[mix]]
+    weights = [weight for _, weight in MIXES[mix]]
+
+    blocks = []
+    for i in range(entries):
+        start_ms = i * 2500
+        end_ms = start_ms + 2000
+        words = []
+        for _ in range(rng.randint(4, 12)):
+            pool = rng.choices(pools, weights=weights)[0]
+            words.append(rng.choice(pool))
+        blocks.append(f"{i + 1}\n{_srt_time(start_ms)} --> {_srt_time(end_ms)}\n{' '.join(words)}.\n")
+
+    return '\n'.join(blocks)
+
+
+def _srt_time(ms: int) -> str:
+    """Format milliseconds as HH:MM:SS,mmm"""
+    hours, ms = divmod(ms, 3600000)
+    minutes, ms = divmod(ms, 60000)
+    seconds, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{ms:03d}"
+
+
+def sample_idioms() -> List[str]:
+    """Idioms used by the idiom benchmark (last one is a deliberate miss)"""
+    return list(IDIOMS)
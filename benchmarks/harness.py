@@ -0,0 +1,211 @@
+"""
+Benchmark Harness for Desi Translate
+Timing, allocation tracking, result persistence and regression comparison.
+"""
+
+import json
+import math
+import platform
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+
+class BenchmarkCase:
+    """A single named benchmark"""
+
+    def __init__(self, name: str, func: Callable[[], object], group: str = '', skip_reason: Optional[str] = None):
+        """
+        Initialize benchmark case.
+
+        Args:
+            name: Unique case name (e.g. 'translate_text[medium/mixed]')
+            func: Zero-argument callable that performs one operation
+            group: Hot path being measured (e.g. 'translate_text')
+            skip_reason: If set, the case is reported as skipped
+        """
+        self.name = name
+        self.func = func
+        self.group = group or name.split('[')[0]
+        self.skip_reason = skip_reason
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def measure(func: Callable[[], object],
+            min_iterations: int = 20,
+            min_time: float = 0.5,
+            max_iterations: int = 100000,
+            warmup: int = 3) -> Dict:
+    """
+    Time repeated calls of func and measure its peak allocations.
+
+    Timing and allocation tracking run in separate passes because
+    tracemalloc slows every allocation down and would distort latencies.
+
+    Args:
+        func: Zero-argument callable
+        min_iterations: Minimum number of timed calls
+        min_time: Keep calling until this many seconds have elapsed
+        max_iterations: Hard upper bound on timed calls
+        warmup: Untimed calls made first
+
+    Returns:
+        Dict with iterations, ops_per_sec, mean/p50/p99/min latencies (ms)
+        and peak_alloc_kb; output_bytes too when func returns bytes or str
+    """
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < max_iterations:
+        t0 = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - t0)
+        if len(timings) >= min_iterations and time.perf_counter() - started >= min_time:
+            break
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        output = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    total = sum(timings)
+    stats = {
+        'iterations': len(timings),
+        'ops_per_sec': round(len(timings) / total, 2) if total else 0.0,
+        'mean_ms': round(total / len(timings) * 1000, 4),
+        'p50_ms': round(percentile(timings, 50) * 1000, 4),
+        'p99_ms': round(percentile(timings, 99) * 1000, 4),
+        'min_ms': round(timings[0] * 1000, 4),
+        'peak_alloc_kb': round(max(0, peak - baseline) / 1024, 2)
+    }
+    if isinstance(output, str):
+        output = output.encode('utf-8')
+    if isinstance(output, bytes):
+        stats['output_bytes'] = len(output)
+    return stats
+
+
+def run_cases(cases: List[BenchmarkCase],
+              min_time: float = 0.5,
+              name_filter: Optional[str] = None,
+              verbose: bool = True) -> Dict:
+    """
+    Run benchmark cases and collect results.
+
+    Args:
+        cases: Cases to run
+        min_time: Minimum seconds spent timing each case
+        name_filter: Only run cases whose name contains this substring
+        verbose: Print one line per case while running
+
+    Returns:
+        Results document (see save_results)
+    """
+    results = {}
+
+    for case in cases:
+        if name_filter and name_filter not in case.name:
+            continue
+
+        if case.skip_reason:
+            results[case.name] = {'group': case.group, 'skipped': case.skip_reason}
+            if verbose:
+                print(f"  {case.name:50} SKIPPED ({case.skip_reason})")
+            continue
+
+        try:
+            stats = measure(case.func, min_time=min_time)
+        except Exception as e:
+            results[case.name] = {'group': case.group, 'skipped': f"error: {e}"}
+            if verbose:
+                print(f"  {case.name:50} ERROR ({e})")
+            continue
+
+        stats['group'] = case.group
+        results[case.name] = stats
+        if verbose:
+            print(f"  {case.name:50} {stats['ops_per_sec']:>12.1f} ops/s"
+                  f"  p50 {stats['p50_ms']:>9.3f} ms  p99 {stats['p99_ms']:>9.3f} ms"
+                  f"  peak {stats['peak_alloc_kb']:>9.1f} KB"
+                  + (f"  out {stats['output_bytes']:>9} B" if 'output_bytes' in stats else ''))
+
+    return {
+        'metadata': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'min_time': min_time
+        },
+        'results': results
+    }
+
+
+def save_results(results: Dict, output_path: str):
+    """Save a results document as JSON"""
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+def load_results(path: str) -> Dict:
+    """Load a results document from JSON"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_results(baseline: Dict, current: Dict, threshold: float = 0.10, metric: str = 'p50_ms') -> List[Dict]:
+    """
+    Compare two results documents case by case.
+
+    Args:
+        baseline: Stored baseline results document
+        current: Freshly measured results document
+        threshold: Relative slowdown that counts as a regression (0.10 = 10%)
+        metric: Latency metric to compare (lower is better)
+
+    Returns:
+        One row per case present in both documents, with baseline, current,
+        relative change and a status of 'regression', 'improvement' or 'ok'
+    """
+    rows = []
+    base_results = baseline.get('results', {})
+
+    for name, stats in current.get('results', {}).items():
+        base = base_results.get(name)
+        if not base or 'skipped' in base or 'skipped' in stats:
+            continue
+
+        old = base.get(metric, 0.0)
+        new = stats.get(metric, 0.0)
+        change = (new - old) / old if old else 0.0
+
+        if change > threshold:
+            status = 'regression'
+        elif change < -threshold:
+            status = 'improvement'
+        else:
+            status = 'ok'
+
+        rows.append({
+            'name': name,
+            'baseline': old,
+            'current': new,
+            'change': round(change, 4),
+            'status': status
+        })
+
+    return rows
@@ -0,0 +1,80 @@
+"""
+Dictionary Memory Benchmark for Desi Translate
+Compares the memory held by a language-pair dictionary loaded as parsed
+JSON dicts against the compiled ColumnarLexicon.
+
+The synthetic dictionary is modelled on rules/dictionaries_comprehensive.json:
+every entry reuses the real pos/rule/source/confidence distributions, and
+translations and meanings are made unique per entry so string pooling gets
+no unfair advantage.
+"""
+
+import gc
+import json
+import os
+import random
+import tracemalloc
+from typing import Dict
+
+from benchmarks.corpora import DEFAULT_SEED
+
+RULES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'rules')
+
+
+def synthetic_dictionary_json(entries: int, seed: int = DEFAULT_SEED) -> str:
+    """JSON text of a synthetic en_hindi dictionary with the given number of entries"""
+    with open(os.path.join(RULES_DIR, 'dictionaries_comprehensive.json'), 'r', encoding='utf-8') as f:
+        samples = list(json.load(f)['en_hindi'].values())
+
+    rng = random.Random(f"{seed}:memory")
+    words = {}
+    for i in range(entries):
+        sample = rng.choice(samples)
+        words[f"w{i:07d}"] = {
+            'word': f"{sample['word']}{i}",
+            'pos': sample['pos'],
+            'meaning': f"{sample['meaning']} ({i % 997})",
+            'rule': sample['rule'],
+            'confidence': sample['confidence'],
+            'source': sample['source']
+        }
+    return json.dumps(words, ensure_ascii=False)
+
+
+def _traced_size(build) -> int:
+    """Bytes still allocated by the object build() returns"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        obj = build()
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del obj
+    return after - before
+
+
+def measure_dictionary_memory(entries: int = 1_000_000) -> Dict:
+    """
+    Measure one language pair as parsed JSON and as a ColumnarLexicon.
+
+    Returns:
+        Dict with entries, json_bytes, columnar_bytes and ratio
+    """
+    from columnar_lexicon import ColumnarLexicon
+
+    text = synthetic_dictionary_json(entries)
+    json_bytes = _traced_size(lambda: json.loads(text))
+
+    parsed = json.loads(text)
+    del text
+    columnar_bytes = _traced_size(lambda: ColumnarLexicon(parsed))
+
+    return {
+        'entries': entries,
+        'json_bytes': json_bytes,
+        'columnar_bytes': columnar_bytes,
+        'ratio': round(json_bytes / columnar_bytes, 2) if columnar_bytes else 0.0
+    }
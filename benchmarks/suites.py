@@ -0,0 +1,191 @@
+"""
+Benchmark Suites for Desi Translate
+Builds the benchmark cases for each translation hot path.
+"""
+
+import os
+import tempfile
+from typing import List
+
+from benchmarks.corpora import SIZES, generate_corpus, generate_srt, sample_idioms
+from benchmarks.harness import BenchmarkCase
+
+
+def translation_cases() -> List[BenchmarkCase]:
+    """translate_text and translate_text_detailed over every size/mix"""
+    import app
+
+    cases = []
+    for mix in ['known', 'mixed', 'oov']:
+        corpus = generate_corpus(mix)
+        for size in SIZES:
+            text = corpus[size]
+            cases.append(BenchmarkCase(
+                f"translate_text[{size}/{mix}]",
+                lambda text=text: app.translate_text(text, 'en', 'hindi')
+            ))
+            cases.append(BenchmarkCase(
+                f"translate_text_detailed[{size}/{mix}]",
+                lambda text=text: app.translate_text_detailed(text, 'en', 'hindi')
+            ))
+    return cases
+
+
+def document_cases() -> List[BenchmarkCase]:
+    """translate_document over growing documents; time per sentence should stay flat"""
+    import app
+    from document_translator import translate_document
+
+    corpus = generate_corpus('mixed')
+    cases = []
+    for sentences in [10, 100, 1000]:
+        text = ' '.join(corpus['small'].rstrip('.!?,') + '.' for _ in range(sentences))
+        cases.append(BenchmarkCase(
+            f"translate_document[{sentences}_sentences]",
+            lambda text=text: translate_document(text, 'en', 'hindi', app.translate_text, include_sentences=False),
+            group='document'
+        ))
+    return cases
+
+
+def idiom_cases() -> List[BenchmarkCase]:
+    """translate_idiom for hits and a full-scan miss"""
+    import app
+
+    cases = []
+    for idiom in sample_idioms():
+        cases.append(BenchmarkCase(
+            f"translate_idiom[{idiom}]",
+            lambda idiom=idiom: app.translate_idiom(idiom, 'hindi')
+        ))
+    return cases
+
+
+def normalizer_cases() -> List[BenchmarkCase]:
+    """normalize_slang and translate_historical"""
+    import app
+
+    cases = []
+    slang = generate_corpus('slang')
+    historical = generate_corpus('historical')
+    for size in SIZES:
+        cases.append(BenchmarkCase(
+            f"normalize_slang[{size}]",
+            lambda text=slang[size]: app.normalize_slang(text)
+        ))
+        cases.append(BenchmarkCase(
+            f"translate_historical[{size}]",
+            lambda text=historical[size]: app.translate_historical(text)
+        ))
+    return cases
+
+
+def nlp_cases() -> List[BenchmarkCase]:
+    """NLPEngine.analyze_text (skipped when NLTK data is not installed)"""
+    import nltk
+
+    skip_reason = None
+    for resource in ['tokenizers/punkt', 'taggers/averaged_perceptron_tagger']:
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            skip_reason = f"NLTK resource '{resource}' not installed"
+            break
+
+    engine = None
+    if not skip_reason:
+        from nlp_engine import NLPEngine
+        engine = NLPEngine()
+
+    cases = []
+    corpus = generate_corpus('mixed')
+    for size in SIZES:
+        cases.append(BenchmarkCase(
+            f"analyze_text[{size}]",
+            lambda text=corpus[size]: engine.analyze_text(text),
+            skip_reason=skip_reason
+        ))
+    return cases
+
+
+def subtitle_cases(work_dir: str) -> List[BenchmarkCase]:
+    """SubtitleProcessor parse, translate and save for a synthetic track"""
+    import app
+    from subtitle_processor import SubtitleEntry, SubtitleProcessor
+
+    srt_path = os.path.join(work_dir, 'track.srt')
+    with open(srt_path, 'w', encoding='utf-8') as f:
+        f.write(generate_srt(entries=200))
+
+    parsed = SubtitleProcessor.parse_srt_file(srt_path)
+    translated = SubtitleProcessor.translate_entries(
+        [SubtitleEntry(e.index, e.start_time, e.end_time, e.text) for e in parsed],
+        app.translate_text
+    )
+
+    def translate_track():
+        # Fresh entries each time: translate_entries mutates its input
+        entries = [SubtitleEntry(e.index, e.start_time, e.end_time, e.text) for e in parsed]
+        return SubtitleProcessor.translate_entries(entries, app.translate_text)
+
+    return [
+        BenchmarkCase('subtitle_parse_srt[200]', lambda: SubtitleProcessor.parse_srt_file(srt_path),
+                      group='subtitle_parse'),
+        BenchmarkCase('subtitle_translate[200]', translate_track, group='subtitle_translate'),
+        BenchmarkCase('subtitle_save_srt[200]',
+                      lambda: SubtitleProcessor.save_to_srt(translated, os.path.join(work_dir, 'out.srt')),
+                      group='subtitle_save'),
+        BenchmarkCase('subtitle_save_vtt[200]',
+                      lambda: SubtitleProcessor.save_to_vtt(translated, os.path.join(work_dir, 'out.vtt')),
+                      group='subtitle_save')
+    ]
+
+
+def serialization_cases() -> List[BenchmarkCase]:
+    """Encoding (and compressing) a full /api/translate-video response; reports bytes on the wire"""
+    import json
+
+    import app
+    import response_encoder
+
+    # Cue text of a 200-entry track (third line of each SRT block)
+    subtitles = [block.split('\n', 2)[2] for block in generate_srt(entries=200).strip().split('\n\n')]
+
+    client = app.app.test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = 0
+    payload = client.post('/api/translate-video', json={'subtitles': subtitles}).get_json()
+
+    def flask_default():
+        # What jsonify produced before: sorted keys, ASCII escapes
+        return json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+    cases = [BenchmarkCase('encode_subtitles[flask_default]', flask_default, group='serialization')]
+    for backend, (dumps, available) in response_encoder.BACKENDS.items():
+        if not available:
+            cases.append(BenchmarkCase(f"encode_subtitles[{backend}]", lambda: None, group='serialization',
+                                       skip_reason=f"{backend} not installed"))
+            continue
+        encode = lambda dumps=dumps: dumps(payload, None, True)
+        cases.append(BenchmarkCase(f"encode_subtitles[{backend}]", encode, group='serialization'))
+        for encoding in ['gzip', 'br']:
+            skip = 'brotli not installed' if encoding == 'br' and response_encoder.brotli is None else None
+            cases.append(BenchmarkCase(
+                f"encode_subtitles[{backend}+{encoding}]",
+                lambda encode=encode, encoding=encoding: response_encoder.compress(encode(), encoding),
+                group='serialization',
+                skip_reason=skip
+            ))
+    return cases
+
+
+def all_cases(work_dir: str = None) -> List[BenchmarkCase]:
+    """Every benchmark case, in a stable order"""
+    work_dir = work_dir or tempfile.mkdtemp(prefix='desi_bench_')
+    return (translation_cases()
+            + document_cases()
+            + idiom_cases()
+            + normalizer_cases()
+            + nlp_cases()
+            + subtitle_cases(work_dir)
+            + serialization_cases())
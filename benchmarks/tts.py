@@ -0,0 +1,90 @@
+"""
+TTS Queue Benchmark for Desi Translate
+Throughput and latency of the TTS worker under concurrent callers.
+
+Uses a simulated engine whose runAndWait costs a fixed overhead plus a
+per-utterance time (the shape of a real pyttsx3 driver), so the benchmark
+runs without audio hardware and isolates the queueing and batching.
+"""
+
+import threading
+import time
+from typing import Dict
+
+from benchmarks.harness import percentile
+from tts_worker import TTSQueueFull, TTSWorker, VoiceSettings
+
+
+class SimulatedEngine:
+    """pyttsx3-like engine: runAndWait sleeps overhead + per_utterance * queued"""
+
+    def __init__(self, overhead: float, per_utterance: float):
+        self.overhead = overhead
+        self.per_utterance = per_utterance
+        self.properties = {}
+        self.pending = 0
+
+    def setProperty(self, name, value):
+        self.properties[name] = value
+
+    def say(self, text):
+        self.pending += 1
+
+    def save_to_file(self, text, path):
+        self.pending += 1
+
+    def runAndWait(self):
+        time.sleep(self.overhead + self.per_utterance * self.pending)
+        self.pending = 0
+
+
+def measure_tts_queue(clients: int = 16, utterances: int = 20, batch_size: int = 16, max_queue: int = 64,
+                      overhead_ms: float = 20.0, per_utterance_ms: float = 2.0) -> Dict:
+    """
+    Submit utterances from concurrent client threads and time them.
+
+    Returns:
+        Dict with completed, rejected, seconds, utterances_per_sec and
+        p50/p99/max latency (ms, submit to rendered)
+    """
+    worker = TTSWorker(lambda: SimulatedEngine(overhead_ms / 1000, per_utterance_ms / 1000),
+                       max_queue=max_queue, batch_size=batch_size)
+    latencies = []
+    rejected = [0]
+    lock = threading.Lock()
+
+    def client(index):
+        settings = VoiceSettings(rate=150, volume=0.9)
+        for i in range(utterances):
+            started = time.perf_counter()
+            try:
+                worker.submit(f"client {index} utterance {i}", settings).result()
+            except TTSQueueFull:
+                with lock:
+                    rejected[0] += 1
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - started
+    worker.close()
+
+    latencies.sort()
+    return {
+        'clients': clients,
+        'batch_size': batch_size,
+        'completed': len(latencies),
+        'rejected': rejected[0],
+        'batches': worker.batches,
+        'seconds': round(seconds, 3),
+        'utterances_per_sec': round(len(latencies) / seconds, 1) if seconds else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'max_ms': round(latencies[-1] * 1000, 2) if latencies else 0.0
+    }
@@ -0,0 +1,353 @@
+"""
+Columnar Lexicon Module for Desi Translate
+Compact, read-only representation of a language-pair dictionary.
+
+A dictionary loaded from JSON is one dict per entry with repeated keys and
+its own copy of every string ('noun', 'Direct translation', ...), which
+costs several hundred bytes per entry. ColumnarLexicon compiles it into:
+
+- a word -> row id hash table held in arrays (open addressing over the
+  words packed as UTF-8), so no per-word str or int objects are kept
+- one column per field: string fields hold ids into an interned string
+  pool (small pools stay Python lists, large ones are packed into a single
+  UTF-8 blob), numeric fields live in array('f') with an exact decode table
+- a per-row shape id recording which fields the entry had, in order
+
+Lookups return EntryView objects: lightweight read-only Mappings that
+decode fields on access, so callers keep using entry['word'] and
+entry.get('confidence', 0.8). An optional LRU keeps the hot working set
+decoded as dicts. Entries that do not fit the columns (nested values,
+mixed types) are kept as they are. Cached and overflow entries are shared
+by every caller, so they are returned as read-only MappingProxyType views;
+copy with dict(entry) to modify.
+"""
+
+import functools
+import sys
+from array import array
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# String pools with more distinct values than this are packed into a blob
+PACK_THRESHOLD = 256
+
+
+def _smallest_typecode(max_value: int) -> str:
+    """Smallest unsigned array typecode that holds max_value"""
+    if max_value < 1 << 8:
+        return 'B'
+    if max_value < 1 << 16:
+        return 'H'
+    return 'I'
+
+
+def _pack(strings: List[str]) -> Tuple[bytes, array]:
+    """Concatenate strings as UTF-8; offsets[i]:offsets[i + 1] spans string i"""
+    encoded = [value.encode('utf-8') for value in strings]
+    offsets = array('I', [0]) * (len(encoded) + 1)
+    total = 0
+    for i, data in enumerate(encoded):
+        total += len(data)
+        offsets[i + 1] = total
+    return b''.join(encoded), offsets
+
+
+class KeyIndex:
+    """
+    Read-only word -> row id hash table stored in arrays.
+
+    Words are packed into one UTF-8 blob; slots use linear probing with a
+    32-bit hash fingerprint so most misses never touch the blob.
+    """
+
+    def __init__(self, words: List[str]):
+        self._blob, self._offsets = _pack(words)
+        size = 8
+        while size < 2 * len(words):  # Load factor <= 0.5
+            size <<= 1
+        self._mask = mask = size - 1
+        slots = array('I', [0]) * size  # row + 1; 0 marks an empty slot
+        fingerprints = array('I', [0]) * size
+        for row, word in enumerate(words):
+            h = hash(word)
+            i = h & mask
+            while slots[i]:
+                i = (i + 1) & mask
+            slots[i] = row + 1
+            fingerprints[i] = (h >> 32) & 0xFFFFFFFF
+        self._slots = slots
+        self._fingerprints = fingerprints
+
+    def find(self, word: str) -> int:
+        """Row id of word, or -1"""
+        h = hash(word)
+        mask, slots, fingerprints = self._mask, self._slots, self._fingerprints
+        fingerprint = (h >> 32) & 0xFFFFFFFF
+        i = h & mask
+        data = None
+        while True:
+            slot = slots[i]
+            if not slot:
+                return -1
+            if fingerprints[i] == fingerprint:
+                if data is None:
+                    data = word.encode('utf-8')
+                offsets = self._offsets
+                if self._blob[offsets[slot - 1]:offsets[slot]] == data:
+                    return slot - 1
+            i = (i + 1) & mask
+
+    def word(self, row: int) -> str:
+        """Word stored at a row"""
+        return self._blob[self._offsets[row]:self._offsets[row + 1]].decode('utf-8')
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the index"""
+        return (sys.getsizeof(self._blob)
+                + sum(a.buffer_info()[1] * a.itemsize for a in (self._offsets, self._slots, self._fingerprints)))
+
+
+class StringPool:
+    """Interned strings addressed by id; frozen into a list or a UTF-8 blob"""
+
+    def __init__(self):
+        self._ids: Optional[Dict[str, int]] = {}
+        self._strings: Optional[List[str]] = []
+        self._blob = b''
+        self._offsets: Optional[array] = None
+
+    def add(self, value: str) -> int:
+        """Id of value, adding it on first sight (build phase only)"""
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = self._ids[value] = len(self._strings)
+            self._strings.append(value)
+        return string_id
+
+    def freeze(self):
+        """Finish building; large pools are packed into one UTF-8 blob"""
+        self._ids = None
+        if len(self._strings) > PACK_THRESHOLD:
+            self._blob, self._offsets = _pack(self._strings)
+            self._strings = None
+        else:
+            # Few distinct values ('noun', 'Direct translation'): share them
+            self._strings = [sys.intern(value) for value in self._strings]
+
+    def __getitem__(self, string_id: int) -> str:
+        if self._strings is not None:
+            return self._strings[string_id]
+        offsets = self._offsets
+        return self._blob[offsets[string_id]:offsets[string_id + 1]].decode('utf-8')
+
+    def __len__(self) -> int:
+        return len(self._strings) if self._strings is not None else len(self._offsets) - 1
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the pool"""
+        if self._strings is not None:
+            return sys.getsizeof(self._strings) + sum(sys.getsizeof(s) for s in self._strings)
+        return sys.getsizeof(self._blob) + self._offsets.buffer_info()[1] * self._offsets.itemsize
+
+
+class EntryView(Mapping):
+    """Read-only view of one ColumnarLexicon row, decoded on access"""
+
+    __slots__ = ('_lexicon', '_row')
+
+    def __init__(self, lexicon: 'ColumnarLexicon', row: int):
+        self._lexicon = lexicon
+        self._row = row
+
+    def get(self, key, default=None):
+        return self._lexicon.field(self._row, key, default)
+
+    def __getitem__(self, key):
+        value = self._lexicon.field(self._row, key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key) -> bool:
+        return key in self._lexicon.row_fields(self._row)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._lexicon.row_fields(self._row))
+
+    def __len__(self) -> int:
+        return len(self._lexicon.row_fields(self._row))
+
+    def to_dict(self) -> Dict:
+        """Plain dict copy of the entry"""
+        return {key: self.get(key) for key in self}
+
+    def __repr__(self) -> str:
+        return f"EntryView({self.to_dict()!r})"
+
+
+_MISSING = object()
+
+
+class ColumnarLexicon(Mapping):
+    """Read-only word -> entry mapping stored column-wise"""
+
+    def __init__(self, entries: Dict[str, Dict], hot_cache_size: int = 0):
+        """
+        Compile a dictionary.
+
+        Args:
+            entries: Mapping of word -> entry dict (one language pair)
+            hot_cache_size: Entries kept decoded as dicts in an LRU (0 disables)
+        """
+        self._overflow: Dict[int, Dict] = {}  # row -> entry that did not fit the columns
+        self._string_columns: Dict[str, Tuple[StringPool, array]] = {}
+        self._float_columns: Dict[str, array] = {}
+        self._float_decode: Dict[str, Dict[float, float]] = {}
+        self._shapes: List[Tuple[str, ...]] = []
+        shape_ids: Dict[Tuple[str, ...], int] = {}
+        row_shapes = array('I')
+
+        words = []
+        for row, (word, entry) in enumerate(entries.items()):
+            words.append(word)
+            shape = tuple(entry) if type(entry) is dict else ()
+            if type(entry) is not dict or not self._store_row(row, entry):
+                self._overflow[row] = entry
+                shape = ()
+            shape_id = shape_ids.get(shape)
+            if shape_id is None:
+                shape_id = shape_ids[shape] = len(self._shapes)
+                self._shapes.append(shape)
+            row_shapes.append(shape_id)
+
+        self._keys = KeyIndex(words)
+        del words
+
+        # Every column is padded to the full row count; copying also drops
+        # the arrays' growth slack and shrinks ids to the smallest typecode
+        size = len(self._keys)
+        for name, (pool, ids) in list(self._string_columns.items()):
+            ids.extend([0] * (size - len(ids)))
+            pool.freeze()
+            self._string_columns[name] = (pool, array(_smallest_typecode(max(len(pool) - 1, 0)), ids))
+        for name, values in list(self._float_columns.items()):
+            values.extend([0.0] * (size - len(values)))
+            self._float_columns[name] = array('f', values)
+        self._row_shapes = array(_smallest_typecode(max(len(self._shapes) - 1, 0)), row_shapes)
+        self._shape_fields = [frozenset(shape) for shape in self._shapes]
+
+        self._hot = None
+        if hot_cache_size > 0:
+            self._hot = functools.lru_cache(maxsize=hot_cache_size)(self._decode)
+
+    def _store_row(self, row: int, entry: Dict) -> bool:
+        """Write an entry into the columns; False if it must overflow"""
+        # Check first so a half-written row never happens
+        for key, value in entry.items():
+            kind = type(value)
+            if kind is str:
+                if key in self._float_columns:
+                    return False
+            elif kind is float or kind is int:
+                if key in self._string_columns:
+                    return False
+                # The float32 value must decode back to exactly this number
+                stored = array('f', [value])[0]
+                known = self._float_decode.get(key, {}).get(stored)
+                if known is not None and (type(known) is not kind or known != value):
+                    return False
+            else:
+                return False
+
+        for key, value in entry.items():
+            if type(value) is str:
+                column = self._string_columns.get(key)
+                if column is None:
+                    column = self._string_columns[key] = (StringPool(), array('I'))
+                pool, ids = column
+                ids.extend([0] * (row - len(ids)))
+                ids.append(pool.add(value))
+            else:
+                values = self._float_columns.get(key)
+                if values is None:
+                    values = self._float_columns[key] = array('f')
+                    self._float_decode[key] = {}
+                values.extend([0.0] * (row - len(values)))
+                values.append(value)
+                self._float_decode[key].setdefault(values[-1], value)
+        return True
+
+    # ---------- entry access ----------
+
+    def row_fields(self, row: int) -> Tuple[str, ...]:
+        """Field names of a columnar row, in the original order"""
+        return self._shapes[self._row_shapes[row]]
+
+    def field(self, row: int, name: str, default=None):
+        """Decode one field of a columnar row"""
+        if name not in self._shape_fields[self._row_shapes[row]]:
+            return default
+        column = self._string_columns.get(name)
+        if column is not None:
+            return column[0][column[1][row]]
+        return self._float_decode[name][self._float_columns[name][row]]
+
+    def row_of(self, word: str) -> Optional[int]:
+        """Row id of a word, or None"""
+        if type(word) is not str:
+            return None
+        row = self._keys.find(word)
+        return None if row < 0 else row
+
+    # ---------- Mapping interface ----------
+
+    def _decode(self, word: str):
+        """Entry for word as a read-only dict view (or the overflow value), None if absent"""
+        entry = self._lookup(word)
+        return MappingProxyType(entry.to_dict()) if type(entry) is EntryView else entry
+
+    def _lookup(self, word: str):
+        row = self._keys.find(word)
+        if row < 0:
+            return None
+        if self._overflow and row in self._overflow:
+            entry = self._overflow[row]
+            return MappingProxyType(entry) if type(entry) is dict else entry
+        return EntryView(self, row)
+
+    def get(self, word, default=None):
+        if type(word) is not str:
+            return default
+        entry = self._hot(word) if self._hot is not None else self._lookup(word)
+        return default if entry is None else entry
+
+    def __getitem__(self, word):
+        entry = self.get(word, _MISSING)
+        if entry is _MISSING:
+            raise KeyError(word)
+        return entry
+
+    def __contains__(self, word) -> bool:
+        return self.get(word) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        keys = self._keys
+        return (keys.word(row) for row in range(len(keys)))
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the lexicon (keys, columns and pools)"""
+        total = self._keys.nbytes()
+        for pool, ids in self._string_columns.values():
+            total += pool.nbytes() + ids.buffer_info()[1] * ids.itemsize
+        for values in self._float_columns.values():
+            total += values.buffer_info()[1] * values.itemsize
+        total += self._row_shapes.buffer_info()[1] * self._row_shapes.itemsize
+        total += sum(sys.getsizeof(entry) for entry in self._overflow.values())
+        return total
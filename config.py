@@ -1,5 +1,8 @@
 # Desi Translate Configuration File
 
+import os
+import tempfile
+
 # Application Settings
 APP_NAME = "Desi Translate"
 APP_VERSION = "1.0.0"
@@ -56,3 +59,112 @@ SESSION_COOKIE_SAMESITE = "Lax"
 # Logging
 LOG_LEVEL = "INFO"
 LOG_FILE = "app.log"
+
+# Metrics (Prometheus text at /metrics, merged across gunicorn workers)
+METRICS_ENABLED = os.environ.get('DESI_METRICS_ENABLED', '1') == '1'
+METRICS_DIR = os.environ.get('DESI_METRICS_DIR', os.path.join(tempfile.gettempdir(), 'desi_translate_metrics'))
+METRICS_FLUSH_INTERVAL = 5.0  # seconds between per-worker snapshot writes
+
+# Per-request profiling (/api/* only)
+PROFILING_ENABLED = os.environ.get('DESI_PROFILING_ENABLED', '0') == '1'  # cProfile every request
+PROFILE_ADMIN_TOKEN = os.environ.get('DESI_PROFILE_TOKEN', '')  # send as X-Desi-Profile header to profile one request
+PROFILE_DIR = os.environ.get('DESI_PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'desi_translate_profiles'))
+SLOW_REQUEST_THRESHOLD = float(os.environ.get('DESI_SLOW_REQUEST_SECONDS', '0'))  # 0 disables slow-request capture
+PROFILE_SAMPLE_INTERVAL = 0.005  # seconds between stack samples
+PROFILE_MAX_FILES = 200
+PROFILE_MAX_BYTES = 50 * 1024 * 1024  # 50MB
+
+# API response encoding
+JSON_BACKEND = os.environ.get('DESI_JSON_BACKEND', 'auto')  # auto, orjson, ujson or json
+COMPRESSION_MIN_BYTES = int(os.environ.get('DESI_COMPRESSION_MIN_BYTES', '1024'))  # smaller responses are sent as-is
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # used when the brotli package is installed
+
+# Dictionary backend: 'json' loads rules/dictionaries*.json into memory;
+# 'sqlite' reads LEXICON_DB (fill it with `manage_translations.py import-lexicon`)
+LEXICON_BACKEND = os.environ.get('DESI_LEXICON_BACKEND', 'json')
+LEXICON_DB = os.environ.get('DESI_LEXICON_DB', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rules', 'lexicon.db'))
+LEXICON_CACHE_SIZE = int(os.environ.get('DESI_LEXICON_CACHE_SIZE', '65536'))  # LRU entries per language pair
+LEXICON_BLOOM_ERROR_RATE = 0.01
+
+# In-memory dictionary layout: 'columnar' (compact, interned columns) or 'dict' (parsed JSON as-is)
+DICTIONARY_LAYOUT = os.environ.get('DESI_DICTIONARY_LAYOUT', 'columnar')
+DICTIONARY_HOT_CACHE_SIZE = 4096  # columnar entries kept decoded per language pair
+
+# Morphological fallback: map inflected forms ("walked", "books") to dictionary headwords
+MORPHOLOGY_ENABLED = os.environ.get('DESI_MORPHOLOGY_ENABLED', '1') == '1'
+MORPHOLOGY_INDEX_MAX_LEMMAS = 200000  # larger vocabularies use memoized suffix stripping instead of a full index
+LEMMA_CACHE_SIZE = 65536
+MORPHOLOGY_CONFIDENCE_FACTOR = 0.9  # confidence of a lemma match relative to an exact match
+
+# Precompute X_Y tables between non-English languages by pivoting through the en_* tables
+PIVOT_TABLES_ENABLED = os.environ.get('DESI_PIVOT_TABLES', '1') == '1'
+
+# Typo correction (opt-in per request with "spellcheck": true)
+SPELLING_MAX_DISTANCE = 2
+SPELLING_INDEX_MAX_WORDS = 50000  # larger vocabularies get no spelling index (memory grows ~30x per word)
+SPELLING_CONFIDENCE_FACTOR = 0.8  # confidence of a corrected word relative to an exact match
+
+# Match multi-word dictionary headwords ("good morning") before word-by-word translation
+PHRASE_MATCHING_ENABLED = os.environ.get('DESI_PHRASE_MATCHING', '1') == '1'
+
+# Document translation (/api/translate-document): sentences are spread over a
+# process pool once a document has at least DOCUMENT_PARALLEL_MIN_SENTENCES
+DOCUMENT_WORKERS = int(os.environ.get('DESI_DOCUMENT_WORKERS', min(4, os.cpu_count() or 1)))
+DOCUMENT_PARALLEL_MIN_SENTENCES = 200
+
+# Streaming historical modernization (/api/translate-historical/stream): characters read per chunk
+HISTORICAL_STREAM_CHUNK_CHARS = int(os.environ.get('DESI_HISTORICAL_STREAM_CHUNK_CHARS', '65536'))
+
+# Background jobs (/api/jobs): SQLite queue shared by web workers, run by
+# `python manage_translations.py work-jobs` (or alongside `python app.py`)
+JOB_DB = os.environ.get('DESI_JOB_DB', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'jobs.db'))
+JOB_WORKERS = int(os.environ.get('DESI_JOB_WORKERS', min(4, os.cpu_count() or 1)))
+JOB_LEASE_SECONDS = 300  # a running job silent for this long is re-queued (worker died)
+JOB_MAX_ATTEMPTS = 3
+JOB_POLL_INTERVAL = 0.5  # seconds an idle worker waits before checking the queue again
+JOB_PROGRESS_INTERVAL = 0.5  # minimum seconds between progress writes of a running job
+
+# Admission control for /api/*: per-client token buckets (429) and concurrency limits (503).
+# Clients are logged-in users, or IP addresses for anonymous requests.
+# Behind a reverse proxy (Render, nginx) set DESI_TRUSTED_PROXIES to the number of proxies in
+# front of the app so the client address is taken from X-Forwarded-For; 0 trusts no forwarded headers.
+TRUSTED_PROXY_HOPS = int(os.environ.get('DESI_TRUSTED_PROXIES', '0'))
+RATE_LIMIT_ENABLED = os.environ.get('DESI_RATE_LIMIT', '1') == '1'
+RATE_LIMIT_DB = os.environ.get('DESI_RATE_LIMIT_DB', os.path.join(tempfile.gettempdir(), 'desi_translate_admission.db'))
+RATE_LIMIT_BYTES_PER_TOKEN = 4096  # a request costs 1 token plus 1 per 4KB of body
+MAX_CONCURRENT_REQUESTS = int(os.environ.get('DESI_MAX_CONCURRENT_REQUESTS', '64')) or None  # node-wide; 0 disables
+CONCURRENCY_SLOT_TTL = 300  # seconds before a slot left by a killed worker stops counting
+OVERLOAD_RETRY_AFTER = 1  # Retry-After seconds of a 503
+# Endpoint -> (tokens per second, burst, max concurrent requests or None); 'default' covers the rest
+RATE_LIMITS = {
+    'default': (10.0, 60, None),
+    'api_translate_detailed': (2.0, 20, 8),
+    'api_translate_document': (1.0, 20, 4),
+    'api_translate_historical_stream': (0.5, 10, 4),
+    'api_submit_job': (0.5, 10, None),
+}
+
+# Per-user translation history (/api/history), written to SQLite behind the request
+HISTORY_ENABLED = os.environ.get('DESI_HISTORY', '1') == '1'
+HISTORY_DB = os.environ.get('DESI_HISTORY_DB', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'history.db'))
+HISTORY_BUFFER_SIZE = 10000  # pending records per worker; the oldest are dropped beyond this
+HISTORY_BATCH_SIZE = 500  # records per write transaction
+HISTORY_FLUSH_INTERVAL = 1.0  # seconds between background writes
+HISTORY_MAX_TEXT_CHARS = 2000  # longer source/translated texts are stored truncated
+
+# Worker warm-up: load rules and indexes and translate common sentences at boot; /readyz waits for it
+WARMUP_ENABLED = os.environ.get('DESI_WARMUP', '1') == '1'
+WARMUP_SENTENCES_FILE = os.environ.get('DESI_WARMUP_SENTENCES', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rules', 'warmup_sentences.txt'))
+WARMUP_TARGET_LANGUAGES = ('hindi', 'telugu', 'tamil')
+WARMUP_HISTORY_LIMIT = 200  # also translate the most frequent recent history entries (0 disables)
+
+# Text-to-speech disk cache: each (text, language, rate, volume, voice) is synthesized once
+TTS_CACHE_ENABLED = os.environ.get('DESI_TTS_CACHE', '1') == '1'
+TTS_CACHE_DIR = os.environ.get('DESI_TTS_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tts_cache'))
+TTS_CACHE_MAX_BYTES = int(os.environ.get('DESI_TTS_CACHE_MAX_MB', '512')) * 1024 * 1024  # least recently used files are deleted beyond this
+
+# Text-to-speech worker: one thread owns the pyttsx3 engine and renders queued utterances in batches
+TTS_QUEUE_SIZE = 64  # utterances waiting at most
+TTS_BATCH_SIZE = 16  # utterances per runAndWait at most
+TTS_SUBMIT_TIMEOUT = 5.0  # seconds a caller waits for room in a full queue before TTSQueueFull
@@ -0,0 +1,204 @@
+"""
+Document Translator Module for Desi Translate
+Translates multi-sentence text one sentence at a time.
+
+translate_text treats its input as a single sentence (one subject, one
+verb, one SOV reorder). Documents are split on sentence boundaries in one
+linear pass, every sentence is translated independently, and the results
+are joined back with the original whitespace between them. Large documents
+are spread over a process pool (translation is pure Python, so threads
+would serialize on the GIL).
+"""
+
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Characters that end a sentence, and closers that may follow them ("Hi!")
+SENTENCE_TERMINATORS = '.!?।॥'
+CLOSING_PUNCTUATION = '\'")]}'
+
+# Tokens whose final period does not end a sentence
+ABBREVIATIONS = frozenset({
+    'mr.', 'mrs.', 'ms.', 'dr.', 'prof.', 'sr.', 'jr.', 'st.', 'vs.', 'no.', 'e.g.', 'i.e.', 'approx.'
+})
+
+_WHITESPACE = re.compile(r'\s+')
+
+# A sentence and the whitespace that followed it in the original text
+Segment = Tuple[str, str]
+
+
+def _ends_sentence(token: str) -> bool:
+    stripped = token.rstrip(CLOSING_PUNCTUATION)
+    if not stripped or stripped[-1] not in SENTENCE_TERMINATORS:
+        return False
+    if stripped[-1] == '.':
+        lowered = stripped.lower()
+        # Abbreviations and initials ("J. R. R.") keep the sentence going
+        if lowered in ABBREVIATIONS or (len(stripped) == 2 and stripped[0].isalpha()):
+            return False
+    return True
+
+
+def split_sentences(text: str) -> Tuple[str, List[Segment]]:
+    """
+    Split text into sentences in one pass. A sentence ends at whitespace
+    following a terminator (. ! ? । ॥, optionally closed by quotes or
+    brackets) or containing a line break.
+
+    Returns:
+        (leading whitespace, [(sentence, following whitespace), ...]);
+        joining them reproduces text exactly
+    """
+    segments: List[Segment] = []
+    sentence_start = 0
+    token_start = 0
+    leading = ''
+    for match in _WHITESPACE.finditer(text):
+        start, end = match.span()
+        if start == 0:
+            leading = match.group()
+            sentence_start = token_start = end
+            continue
+        if '\n' in match.group() or _ends_sentence(text[token_start:start]):
+            segments.append((text[sentence_start:start], match.group()))
+            sentence_start = end
+        token_start = end
+    if sentence_start < len(text):
+        segments.append((text[sentence_start:], ''))
+    return leading, segments
+
+
+def _translate_batch(translate: Callable, source_lang: str, target_lang: str, sentences: List[str]) -> List[Dict]:
+    """Translate a batch of sentences (runs in pool workers)"""
+    return [translate(sentence, source_lang, target_lang, fields=frozenset()) for sentence in sentences]
+
+
+# ==================== WORKER POOL ====================
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_pid: Optional[int] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Process pool of this process (created on first use, recreated after fork).
+    Pool processes are started by a forkserver: by the time a request needs
+    the pool, the worker runs background threads (history writer, warm-up,
+    samplers) whose locks a plain fork could copy while held.
+    """
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('forkserver'))
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def _discard_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        _pool = None
+
+
+def translate_sentences(sentences: List[str], source_lang: str, target_lang: str, translate: Callable,
+                        workers: int = 1, parallel_min_sentences: int = 200,
+                        progress: Optional[Callable[[int, int], None]] = None) -> List[Dict]:
+    """
+    Translate sentences independently, in order.
+
+    Args:
+        sentences: Sentences to translate
+        translate: translate_text-compatible function (module-level, so
+            pool workers can unpickle it)
+        workers: Pool size; 1 translates in this process
+        parallel_min_sentences: Smaller documents are not worth the
+            inter-process round trip
+        progress: Called as progress(sentences done, total) while translating
+
+    Returns:
+        One lean translate result per sentence
+    """
+    if workers <= 1 or len(sentences) < parallel_min_sentences:
+        if progress is None:
+            return _translate_batch(translate, source_lang, target_lang, sentences)
+        results = []
+        for sentence in sentences:
+            results.extend(_translate_batch(translate, source_lang, target_lang, [sentence]))
+            progress(len(results), len(sentences))
+        return results
+
+    # A few batches per worker keeps the pool busy without per-sentence IPC
+    batch_size = max(1, -(-len(sentences) // (workers * 4)))
+    batches = [sentences[i:i + batch_size] for i in range(0, len(sentences), batch_size)]
+    try:
+        pool = get_pool(workers)
+        futures = [pool.submit(_translate_batch, translate, source_lang, target_lang, batch) for batch in batches]
+        results = []
+        for future in futures:
+            results.extend(future.result())
+            if progress is not None:
+                progress(len(results), len(sentences))
+        return results
+    except BrokenProcessPool:
+        print("Warning: document translation pool failed, translating sequentially")
+        _discard_pool()
+        return _translate_batch(translate, source_lang, target_lang, sentences)
+
+
+def translate_document(text: str, source_lang: str, target_lang: str, translate: Callable,
+                       workers: int = 1, parallel_min_sentences: int = 200,
+                       include_sentences: bool = True,
+                       progress: Optional[Callable[[int, int], None]] = None) -> Dict:
+    """
+    Translate a multi-sentence document sentence by sentence.
+
+    Args:
+        text: Document text (any length)
+        translate: translate_text-compatible function
+        workers, parallel_min_sentences, progress: See translate_sentences
+        include_sentences: Add the per-sentence breakdown
+
+    Returns:
+        Dict with translated_text (original spacing between sentences kept),
+        confidence (word-weighted average), sentence_count and optionally
+        sentences
+    """
+    leading, segments = split_sentences(text)
+    sentences = [sentence for sentence, _ in segments]
+    results = translate_sentences(sentences, source_lang, target_lang, translate,
+                                  workers=workers, parallel_min_sentences=parallel_min_sentences,
+                                  progress=progress)
+
+    parts = [leading]
+    weighted_confidence = 0.0
+    total_words = 0
+    for (sentence, separator), result in zip(segments, results):
+        parts.append(result['translated_text'])
+        parts.append(separator)
+        words = len(sentence.split())
+        weighted_confidence += result['confidence'] * words
+        total_words += words
+
+    document = {
+        'translated_text': ''.join(parts),
+        'confidence': round(weighted_confidence / total_words, 2) if total_words else 0,
+        'sentence_count': len(segments),
+        # Normalized language names ('hi' -> 'hindi') as translate reports them
+        'source_language': results[0]['source_language'] if results else source_lang,
+        'target_language': results[0]['target_language'] if results else target_lang
+    }
+    if include_sentences:
+        document['sentences'] = [
+            {'original': sentence, 'translated': result['translated_text'], 'confidence': result['confidence']}
+            for (sentence, _), result in zip(segments, results)
+        ]
+    return document
@@ -0,0 +1,190 @@
+"""
+Dubbing Module for Desi Translate
+Builds a translated audio track from translated subtitle cues.
+
+Every cue's translated_text is synthesized (through the TTS worker and its
+cache) and converted to the track's PCM format in a thread pool. Each cue
+may use the time up to the next cue's start: shorter audio is padded with
+silence, longer audio is sped up (up to max_speedup) and cut at the end of
+the slot if it still does not fit. Cues are written to the output WAV in
+order as they become ready; only a bounded number of fitted cues is held
+in memory, so a feature-length track streams straight to disk.
+"""
+
+import re
+import wave
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import pcm
+from subtitle_processor import SubtitleEntry
+
+TIME_PATTERN = re.compile(r'(\d+):(\d{2}):(\d{2})[,.](\d{3})')
+
+# Silence is written in blocks of this many frames
+SILENCE_BLOCK_FRAMES = 65536
+
+
+class Cue(NamedTuple):
+    """One cue to dub: start time and available slot in seconds"""
+    start: float
+    slot: float
+    text: str
+
+
+class FittedCue(NamedTuple):
+    pcm: bytes
+    status: str  # 'fitted', 'stretched', 'truncated', 'failed' or 'empty'
+
+
+def time_to_seconds(time_str: str) -> float:
+    """HH:MM:SS,mmm (or HH:MM:SS.mmm) -> seconds"""
+    match = TIME_PATTERN.match(time_str.strip())
+    if not match:
+        raise ValueError(f"Invalid subtitle time: {time_str!r}")
+    hours, minutes, seconds, milliseconds = (int(part) for part in match.groups())
+    return hours * 3600 + minutes * 60 + seconds + milliseconds / 1000
+
+
+def plan_cues(entries: List[SubtitleEntry]) -> List[Cue]:
+    """
+    Cues in start order; each may last until the next cue starts (the last
+    one until its own end time). Untranslated cues use their original text.
+    """
+    timed = sorted(((time_to_seconds(e.start_time), time_to_seconds(e.end_time), e.translated_text or e.text)
+                    for e in entries), key=lambda cue: cue[0])
+    cues = []
+    for i, (start, end, text) in enumerate(timed):
+        slot_end = timed[i + 1][0] if i + 1 < len(timed) else end
+        cues.append(Cue(start, max(0.0, slot_end - start), (text or '').strip()))
+    return cues
+
+
+def read_pcm(wav_path: str, sample_rate: int, sample_width: int, speed: float = 1.0) -> bytes:
+    """
+    Frames of a PCM WAV file as mono audio at sample_rate/sample_width,
+    played `speed` times faster (pitch rises with the speed).
+    """
+    with wave.open(wav_path, 'rb') as wav:
+        width, channels, rate = wav.getsampwidth(), wav.getnchannels(), wav.getframerate()
+        audio = wav.readframes(wav.getnframes())
+    if width == 1:
+        # 8-bit WAV samples are unsigned; audioop-style operations expect signed
+        audio = pcm.bias(audio, 1, -128)
+    if channels == 2:
+        audio = pcm.tomono(audio, width, 0.5, 0.5)
+    if width != sample_width:
+        audio = pcm.lin2lin(audio, width, sample_width)
+    source_rate = int(round(rate * speed))
+    if source_rate != sample_rate:
+        audio, _ = pcm.ratecv(audio, sample_width, 1, source_rate, sample_rate, None)
+    return audio
+
+
+def fit_cue(wav_path: Optional[str], slot: float, sample_rate: int, sample_width: int,
+            max_speedup: float) -> FittedCue:
+    """Cue audio in the track format, sped up or cut to fit its slot"""
+    if not wav_path:
+        return FittedCue(b'', 'failed')
+    with wave.open(wav_path, 'rb') as wav:
+        duration = wav.getnframes() / wav.getframerate()
+    if not duration:
+        return FittedCue(b'', 'empty')
+
+    status = 'fitted'
+    speed = 1.0
+    if duration > slot > 0:
+        speed = min(duration / slot, max_speedup)
+        status = 'stretched'
+    audio = read_pcm(wav_path, sample_rate, sample_width, speed)
+
+    slot_bytes = int(slot * sample_rate) * sample_width
+    if len(audio) > slot_bytes:
+        audio = audio[:slot_bytes]
+        status = 'truncated'
+    return FittedCue(audio, status)
+
+
+def _write_silence(output: wave.Wave_write, frames: int, sample_width: int):
+    block = b'\x00' * (SILENCE_BLOCK_FRAMES * sample_width)
+    while frames > 0:
+        count = min(frames, SILENCE_BLOCK_FRAMES)
+        output.writeframesraw(block[:count * sample_width])
+        frames -= count
+
+
+def render_dubbing_track(entries: List[SubtitleEntry], synthesize: Callable[[str], Optional[str]],
+                         output_path: str, sample_rate: int = 22050, sample_width: int = 2,
+                         max_workers: int = 4, max_speedup: float = 1.35,
+                         lookahead: Optional[int] = None,
+                         progress: Optional[Callable[[int, int], None]] = None) -> Dict:
+    """
+    Write a mono WAV dubbing track with every cue at its start time.
+
+    Args:
+        entries: Subtitle entries (translated_text is spoken when set)
+        synthesize: Returns the path of a PCM WAV file speaking the text
+            (None if synthesis failed); called concurrently, e.g.
+            VoiceHandler.cached_audio
+        output_path: WAV file to write
+        sample_rate: Output sample rate
+        sample_width: Output bytes per sample
+        max_workers: Cues synthesized and fitted at the same time
+        max_speedup: Fastest a cue is played to fit its slot
+        lookahead: Fitted cues held in memory at most (default 4 * max_workers)
+        progress: Called with (cues written, total cues)
+
+    Returns:
+        Dict with cues, duration and counts per fit status
+    """
+    cues = plan_cues(entries)
+    counts = {'fitted': 0, 'stretched': 0, 'truncated': 0, 'failed': 0, 'empty': 0}
+    lookahead = lookahead or 4 * max(1, max_workers)
+
+    def prepare(cue: Cue) -> FittedCue:
+        if not cue.text:
+            return FittedCue(b'', 'empty')
+        try:
+            return fit_cue(synthesize(cue.text), cue.slot, sample_rate, sample_width, max_speedup)
+        except Exception as e:
+            print(f"Warning: could not dub cue at {cue.start:.3f}s: {e}")
+            return FittedCue(b'', 'failed')
+
+    written = 0  # frames
+    with wave.open(output_path, 'wb') as output, ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        output.setnchannels(1)
+        output.setsampwidth(sample_width)
+        output.setframerate(sample_rate)
+
+        pending = deque()
+        next_cue = 0
+        for done in range(len(cues)):
+            # Keep the pool busy without fitting the whole film ahead of the writer
+            while next_cue < len(cues) and len(pending) < lookahead:
+                pending.append(pool.submit(prepare, cues[next_cue]))
+                next_cue += 1
+            fitted = pending.popleft().result()
+            counts[fitted.status] += 1
+
+            start_frame = int(round(cues[done].start * sample_rate))
+            if start_frame > written:
+                _write_silence(output, start_frame - written, sample_width)
+                written = start_frame
+            output.writeframesraw(fitted.pcm)
+            written += len(fitted.pcm) // sample_width
+            if progress:
+                progress(done + 1, len(cues))
+
+        if cues:
+            # Keep the track as long as the subtitles
+            end_frame = int(round((cues[-1].start + cues[-1].slot) * sample_rate))
+            if end_frame > written:
+                _write_silence(output, end_frame - written, sample_width)
+                written = end_frame
+
+    return {
+        'cues': len(cues),
+        'duration': round(written / sample_rate, 3),
+        **counts
+    }
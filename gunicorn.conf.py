@@ -0,0 +1,10 @@
+"""
+Gunicorn settings for Desi Translate (read automatically from the working
+directory, so the Procfile's `gunicorn app:app` picks it up)
+"""
+
+
+def post_worker_init(worker):
+    """Warm every worker up in the background; /readyz reports 503 until it is done"""
+    from app import start_warmup
+    start_warmup()
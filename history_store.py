@@ -0,0 +1,221 @@
+"""
+History Store Module for Desi Translate
+Per-user translation history, written behind the request.
+
+Requests only append a record to an in-memory ring buffer (a lock and a
+deque append). A background thread per worker writes the buffer to SQLite
+in batched transactions every flush interval, or sooner once a batch has
+filled up. When the database falls behind and the buffer is full, the
+oldest pending record is dropped and counted rather than slowing requests
+down; a worker killed before its next flush loses at most one interval of
+history.
+"""
+
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+_SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS history (
+           id INTEGER PRIMARY KEY,
+           user_id INTEGER NOT NULL,
+           endpoint TEXT NOT NULL,
+           source_lang TEXT,
+           target_lang TEXT,
+           source_text TEXT NOT NULL,
+           translated_text TEXT,
+           confidence REAL,
+           created_at REAL NOT NULL
+       )''',
+    'CREATE INDEX IF NOT EXISTS history_by_user ON history (user_id, created_at)'
+]
+
+_COLUMNS = ('user_id', 'endpoint', 'source_lang', 'target_lang', 'source_text', 'translated_text',
+            'confidence', 'created_at')
+
+# One pending row, in _COLUMNS order
+Record = Tuple[int, str, Optional[str], Optional[str], str, Optional[str], Optional[float], float]
+
+
+class HistoryStore:
+    """Write-behind SQLite history with a bounded in-memory buffer"""
+
+    def __init__(self, path: str, capacity: int = 10000, batch_size: int = 500,
+                 flush_interval: float = 1.0, max_text_chars: int = 2000):
+        """
+        Initialize history store (creates the database on first use).
+
+        Args:
+            path: SQLite database file
+            capacity: Pending records kept in memory; older ones are dropped
+                when the writer falls this far behind
+            batch_size: Pending records that trigger a flush before the
+                interval is up
+            flush_interval: Seconds between background flushes
+            max_text_chars: Longer texts are stored truncated
+        """
+        self.path = path
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_text_chars = max_text_chars
+        self.dropped = 0
+        self.written = 0
+        self._buffer: Deque[Record] = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # one writer at a time (thread, query, exit)
+        self._wakeup = threading.Event()
+        self._writer_pid: Optional[int] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        conn = self._connection()
+        conn.execute('PRAGMA journal_mode=WAL')
+        for statement in _SCHEMA:
+            conn.execute(statement)
+        conn.commit()
+        atexit.register(self.flush)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connection of this process (only used under _flush_lock or at init)"""
+        if self._conn is None or self._conn_pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    def _ensure_writer(self):
+        """Start this process's flush thread (again after a fork)"""
+        pid = os.getpid()
+        if self._writer_pid != pid:
+            self._writer_pid = pid
+            threading.Thread(target=self._run, name='desi-history-writer', daemon=True).start()
+
+    def record(self, user_id: int, endpoint: str, source_text: str, translated_text: Optional[str],
+               source_lang: Optional[str] = None, target_lang: Optional[str] = None,
+               confidence: Optional[float] = None) -> bool:
+        """
+        Queue one translation for writing (never blocks on the database).
+
+        Returns:
+            False if the buffer was full and its oldest record was dropped
+        """
+        limit = self.max_text_chars
+        row = (user_id, endpoint, source_lang, target_lang, source_text[:limit],
+               translated_text[:limit] if translated_text is not None else None, confidence, time.time())
+        with self._lock:
+            if self._writer_pid != os.getpid():
+                self._ensure_writer()
+            kept_all = len(self._buffer) < self.capacity
+            if not kept_all:
+                self._buffer.popleft()
+                self.dropped += 1
+            self._buffer.append(row)
+            full_batch = len(self._buffer) >= self.batch_size
+        if full_batch:
+            self._wakeup.set()
+        return kept_all
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                print(f"Warning: history flush failed: {e}")
+
+    def flush(self) -> int:
+        """Write every pending record in batched transactions; returns the number written"""
+        written = 0
+        with self._flush_lock:
+            conn = self._connection()
+            while True:
+                with self._lock:
+                    batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+                if not batch:
+                    break
+                with conn:
+                    conn.executemany(
+                        f"INSERT INTO history ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                        batch)
+                written += len(batch)
+            self.written += written
+        return written
+
+    def pending(self) -> int:
+        """Records waiting to be written by this process"""
+        return len(self._buffer)
+
+    def query(self, user_id: int, limit: int = 20, before: Optional[str] = None) -> Dict:
+        """
+        One page of a user's history, newest first.
+
+        Args:
+            limit: Page size
+            before: next_cursor of the previous page
+
+        Returns:
+            {'history': [...], 'next_cursor': cursor or None on the last page}
+
+        Raises:
+            ValueError: Malformed cursor
+        """
+        # This worker's own pending records (e.g. the request just made) first
+        self.flush()
+
+        sql = f"SELECT id, {', '.join(_COLUMNS[1:])} FROM history WHERE user_id = ?"
+        params: List = [user_id]
+        if before:
+            created_at, _, row_id = before.partition(':')
+            try:
+                params += [float(created_at), int(row_id)]
+            except ValueError:
+                raise ValueError('Invalid cursor')
+            sql += ' AND (created_at, id) < (?, ?)'
+        sql += ' ORDER BY created_at DESC, id DESC LIMIT ?'
+        params.append(limit + 1)
+
+        with self._flush_lock:
+            rows = self._connection().execute(sql, params).fetchall()
+        history = [dict(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = history[-1]
+            next_cursor = f"{last['created_at']!r}:{last['id']}"
+        return {'history': history, 'next_cursor': next_cursor}
+
+    def frequent_texts(self, limit: int = 100, endpoints: Tuple[str, ...] = ('translate',),
+                       recent: int = 10000) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        """
+        Most repeated translations among the latest records (e.g. for cache
+        warming). Scans at most `recent` rows by id, so it stays cheap on a
+        large table.
+
+        Returns:
+            [(source_text, source_lang, target_lang), ...], most frequent first
+        """
+        placeholders = ', '.join('?' * len(endpoints))
+        with self._flush_lock:
+            rows = self._connection().execute(
+                'SELECT source_text, source_lang, target_lang, COUNT(*) AS uses FROM history '
+                f'WHERE id > (SELECT COALESCE(MAX(id), 0) FROM history) - ? AND endpoint IN ({placeholders}) '
+                'GROUP BY source_text, source_lang, target_lang ORDER BY uses DESC LIMIT ?',
+                (recent, *endpoints, limit)).fetchall()
+        return [(row['source_text'], row['source_lang'], row['target_lang']) for row in rows]
+
+
+_stores: Dict[str, HistoryStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_history_store(path: str, **options) -> HistoryStore:
+    """Process-wide HistoryStore for a database file (options as for HistoryStore)"""
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = HistoryStore(path, **options)
+        return store
@@ -0,0 +1,376 @@
+"""
+Job Queue Module for Desi Translate
+Persistent background jobs for work too long for an HTTP request (full
+subtitle tracks, large documents).
+
+Jobs live in a SQLite table, so they survive restarts and are shared by
+every web worker and every job worker on the host. Web workers only
+submit jobs and read their state; a separate pool of worker processes
+claims queued jobs one at a time, so throughput scales with the pool size
+and no web worker is blocked by a long job.
+
+A running job holds a lease that its worker renews with every progress
+report. Jobs whose lease expires (worker killed mid-job) are queued again,
+up to a maximum number of attempts. Cancelling a running job is
+cooperative: the worker stops at its next progress report.
+"""
+
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Job states
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED_STATES = frozenset({SUCCEEDED, FAILED, CANCELLED})
+
+_SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS jobs (
+           id TEXT PRIMARY KEY,
+           kind TEXT NOT NULL,
+           status TEXT NOT NULL,
+           payload TEXT NOT NULL,
+           user_id INTEGER,
+           result TEXT,
+           error TEXT,
+           progress_done INTEGER NOT NULL DEFAULT 0,
+           progress_total INTEGER NOT NULL DEFAULT 0,
+           attempts INTEGER NOT NULL DEFAULT 0,
+           cancel_requested INTEGER NOT NULL DEFAULT 0,
+           worker TEXT,
+           created_at REAL NOT NULL,
+           started_at REAL,
+           heartbeat_at REAL,
+           finished_at REAL
+       )''',
+    'CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, created_at)'
+]
+
+_STATUS_COLUMNS = ('id, kind, status, error, progress_done, progress_total, attempts, cancel_requested, '
+                   'created_at, started_at, finished_at')
+
+
+class JobCancelled(Exception):
+    """Raised in a worker when its job was cancelled or its lease was lost"""
+
+
+class JobQueue:
+    """SQLite-backed job table shared by web workers and job workers"""
+
+    def __init__(self, path: str, lease_seconds: float = 300.0, max_attempts: int = 3):
+        """
+        Initialize job queue (creates the database on first use).
+
+        Args:
+            path: SQLite database file
+            lease_seconds: A running job not heard from for this long is
+                considered lost and queued again
+            max_attempts: Lost jobs are failed instead of queued again
+                after this many attempts
+        """
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute('PRAGMA journal_mode=WAL')
+        for statement in _SCHEMA:
+            conn.execute(statement)
+        columns = {row['name'] for row in conn.execute('PRAGMA table_info(jobs)')}
+        if 'user_id' not in columns:
+            # Databases created before jobs had owners
+            conn.execute('ALTER TABLE jobs ADD COLUMN user_id INTEGER')
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connection of the calling thread (connections are not shared across forks)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            # Autocommit: every operation below is a single atomic statement
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    # ---- Web side ----
+
+    def submit(self, kind: str, payload: Dict, user_id: Optional[int] = None) -> str:
+        """Queue a job for a user and return its id"""
+        job_id = uuid.uuid4().hex
+        self._connection().execute(
+            'INSERT INTO jobs (id, kind, status, payload, user_id, created_at) VALUES (?, ?, ?, ?, ?, ?)',
+            (job_id, kind, QUEUED, json.dumps(payload, ensure_ascii=False), user_id, time.time()))
+        return job_id
+
+    def get(self, job_id: str, user_id: Optional[int] = None) -> Optional[Dict]:
+        """
+        Status and progress of a job (None if unknown, or if user_id is
+        given and the job belongs to someone else)
+        """
+        sql = f'SELECT {_STATUS_COLUMNS} FROM jobs WHERE id = ?'
+        params = [job_id]
+        if user_id is not None:
+            sql += ' AND user_id = ?'
+            params.append(user_id)
+        row = self._connection().execute(sql, params).fetchone()
+        return _status(row) if row else None
+
+    def result(self, job_id: str) -> Optional[Dict]:
+        """Result of a succeeded job (None otherwise)"""
+        row = self._connection().execute(
+            'SELECT result FROM jobs WHERE id = ? AND status = ?', (job_id, SUCCEEDED)).fetchone()
+        return json.loads(row['result']) if row else None
+
+    def cancel(self, job_id: str) -> Optional[Dict]:
+        """
+        Cancel a job. Queued jobs are cancelled at once; running jobs stop at
+        their worker's next progress report. Finished jobs are left as they are.
+
+        Returns:
+            The job's status after the request (None if unknown)
+        """
+        conn = self._connection()
+        conn.execute('UPDATE jobs SET status = ?, finished_at = ? WHERE id = ? AND status = ?',
+                     (CANCELLED, time.time(), job_id, QUEUED))
+        conn.execute('UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = ?',
+                     (job_id, RUNNING))
+        return self.get(job_id)
+
+    def retry(self, job_id: str) -> Optional[Dict]:
+        """
+        Queue a failed or cancelled job again from the start.
+
+        Returns:
+            The job's status after the request (None if unknown)
+        """
+        self._connection().execute(
+            'UPDATE jobs SET status = ?, result = NULL, error = NULL, progress_done = 0, progress_total = 0, '
+            'attempts = 0, cancel_requested = 0, worker = NULL, started_at = NULL, heartbeat_at = NULL, '
+            'finished_at = NULL WHERE id = ? AND status IN (?, ?)',
+            (QUEUED, job_id, FAILED, CANCELLED))
+        return self.get(job_id)
+
+    def depth(self) -> int:
+        """Number of queued jobs"""
+        return self._connection().execute(
+            'SELECT COUNT(*) FROM jobs WHERE status = ?', (QUEUED,)).fetchone()[0]
+
+    # ---- Worker side ----
+
+    def claim(self, worker: str) -> Optional[Dict]:
+        """
+        Take the oldest queued job (after re-queueing jobs whose lease expired).
+
+        Returns:
+            {'id', 'kind', 'payload'} or None if the queue is empty
+        """
+        now = time.time()
+        conn = self._connection()
+        conn.execute(
+            'UPDATE jobs SET '
+            'status = CASE WHEN cancel_requested THEN ? WHEN attempts >= ? THEN ? ELSE ? END, '
+            'error = CASE WHEN cancel_requested THEN error WHEN attempts >= ? THEN ? ELSE error END, '
+            'finished_at = CASE WHEN cancel_requested OR attempts >= ? THEN ? ELSE NULL END, '
+            'worker = NULL WHERE status = ? AND heartbeat_at < ?',
+            (CANCELLED, self.max_attempts, FAILED, QUEUED, self.max_attempts, 'Worker lost',
+             self.max_attempts, now, RUNNING, now - self.lease_seconds))
+        row = conn.execute(
+            'UPDATE jobs SET status = ?, worker = ?, attempts = attempts + 1, started_at = ?, heartbeat_at = ?, '
+            'progress_done = 0, progress_total = 0 '
+            'WHERE id = (SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1) AND status = ? '
+            'RETURNING id, kind, payload',
+            (RUNNING, worker, now, now, QUEUED, QUEUED)).fetchone()
+        if row is None:
+            return None
+        return {'id': row['id'], 'kind': row['kind'], 'payload': json.loads(row['payload'])}
+
+    def report(self, job_id: str, worker: str, done: int, total: int):
+        """
+        Record progress and renew the lease.
+
+        Raises:
+            JobCancelled: The job was cancelled, or the lease was lost to
+                another worker
+        """
+        row = self._connection().execute(
+            'UPDATE jobs SET progress_done = ?, progress_total = ?, heartbeat_at = ? '
+            'WHERE id = ? AND status = ? AND worker = ? RETURNING cancel_requested',
+            (done, total, time.time(), job_id, RUNNING, worker)).fetchone()
+        if row is None or row['cancel_requested']:
+            raise JobCancelled(job_id)
+
+    def finish(self, job_id: str, worker: str, status: str, result: Optional[Dict] = None,
+               error: Optional[str] = None):
+        """Record the outcome of a claimed job (ignored if the lease was lost)"""
+        self._connection().execute(
+            'UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, worker = NULL, '
+            'progress_done = CASE WHEN ? THEN progress_total ELSE progress_done END '
+            'WHERE id = ? AND status = ? AND worker = ?',
+            (status, json.dumps(result, ensure_ascii=False) if result is not None else None, error,
+             time.time(), status == SUCCEEDED, job_id, RUNNING, worker))
+
+
+def _status(row: sqlite3.Row) -> Dict:
+    done, total = row['progress_done'], row['progress_total']
+    return {
+        'job_id': row['id'],
+        'type': row['kind'],
+        'status': row['status'],
+        'progress': {
+            'done': done,
+            'total': total,
+            'fraction': round(done / total, 4) if total else (1.0 if row['status'] == SUCCEEDED else 0.0)
+        },
+        'attempts': row['attempts'],
+        'cancel_requested': bool(row['cancel_requested']),
+        'error': row['error'],
+        'created_at': row['created_at'],
+        'started_at': row['started_at'],
+        'finished_at': row['finished_at']
+    }
+
+
+_queues: Dict[str, JobQueue] = {}
+_queues_lock = threading.Lock()
+
+
+def get_queue(path: str, lease_seconds: float = 300.0, max_attempts: int = 3) -> JobQueue:
+    """Process-wide JobQueue for a database file"""
+    with _queues_lock:
+        queue = _queues.get(path)
+        if queue is None:
+            queue = _queues[path] = JobQueue(path, lease_seconds, max_attempts)
+        return queue
+
+
+# ==================== WORKERS ====================
+
+class ProgressReporter:
+    """Progress callback handed to job handlers: progress(done, total)"""
+
+    def __init__(self, queue: JobQueue, job_id: str, worker: str, interval: float):
+        """
+        Args:
+            interval: Minimum seconds between database writes (every write
+                renews the lease and checks for cancellation)
+        """
+        self.queue = queue
+        self.job_id = job_id
+        self.worker = worker
+        self.interval = interval
+        self._last = 0.0
+
+    def __call__(self, done: int, total: int):
+        now = time.monotonic()
+        if now - self._last >= self.interval:
+            self._last = now
+            self.queue.report(self.job_id, self.worker, done, total)
+
+
+def run_job(queue: JobQueue, job: Dict, handlers: Dict[str, Callable], worker: str,
+            progress_interval: float = 0.5):
+    """Run one claimed job with its handler and record the outcome"""
+    handler = handlers.get(job['kind'])
+    if handler is None:
+        queue.finish(job['id'], worker, FAILED, error=f"Unknown job type '{job['kind']}'")
+        return
+
+    progress = ProgressReporter(queue, job['id'], worker, progress_interval)
+    try:
+        result = handler(job['payload'], progress)
+    except JobCancelled:
+        queue.finish(job['id'], worker, CANCELLED)
+    except Exception as e:
+        print(f"Warning: job {job['id']} ({job['kind']}) failed: {e}")
+        queue.finish(job['id'], worker, FAILED, error=str(e))
+    else:
+        queue.finish(job['id'], worker, SUCCEEDED, result=result)
+
+
+def work(queue: JobQueue, handlers: Dict[str, Callable], stop: Optional[threading.Event] = None,
+         poll_interval: float = 0.5, progress_interval: float = 0.5):
+    """Claim and run jobs until stop is set (forever if None)"""
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    while stop is None or not stop.is_set():
+        job = queue.claim(worker)
+        if job is None:
+            if stop is None:
+                time.sleep(poll_interval)
+            else:
+                stop.wait(poll_interval)
+            continue
+        run_job(queue, job, handlers, worker, progress_interval)
+
+
+def _worker_main(path: str, handlers: Dict[str, Callable], stop, lease_seconds: float,
+                 max_attempts: int, poll_interval: float, progress_interval: float):
+    # SIGTERM finishes the current job; the parent decides how long to wait
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    queue = JobQueue(path, lease_seconds, max_attempts)
+    work(queue, handlers, stop, poll_interval, progress_interval)
+
+
+def start_workers(path: str, handlers: Dict[str, Callable], count: int, lease_seconds: float = 300.0,
+                  max_attempts: int = 3, poll_interval: float = 0.5,
+                  progress_interval: float = 0.5) -> Tuple[List[multiprocessing.Process], object]:
+    """
+    Start a pool of job worker processes.
+
+    Args:
+        path: Job database file
+        handlers: Job type -> handler(payload, progress) returning the
+            JSON-serializable result (module-level functions, so any
+            multiprocessing start method can pass them)
+        count: Number of worker processes
+
+    Returns:
+        (processes, stop event); set the event to let workers exit after
+        their current job
+    """
+    JobQueue(path, lease_seconds, max_attempts)  # Create the schema before workers race for it
+    stop = multiprocessing.Event()
+    processes = []
+    for i in range(count):
+        process = multiprocessing.Process(
+            target=_worker_main, name=f"desi-job-worker-{i}",
+            args=(path, handlers, stop, lease_seconds, max_attempts, poll_interval, progress_interval))
+        process.start()
+        processes.append(process)
+    return processes, stop
+
+
+def stop_workers(processes: List[multiprocessing.Process], stop, timeout: float = 30.0):
+    """Let workers finish their current job, then terminate stragglers (their jobs are re-queued when the lease expires)"""
+    stop.set()
+    deadline = time.monotonic() + timeout
+    for process in processes:
+        process.join(max(0.0, deadline - time.monotonic()))
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+            process.join()
+
+
+def run_workers(path: str, handlers: Dict[str, Callable], count: int, shutdown_timeout: float = 30.0, **options):
+    """Run a worker pool in the foreground until SIGTERM or Ctrl-C (see start_workers)"""
+    processes, stop = start_workers(path, handlers, count, **options)
+    print(f"Job workers started: {count} process(es) on {path}")
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    try:
+        while not stop.is_set() and any(process.is_alive() for process in processes):
+            stop.wait(1.0)
+    except KeyboardInterrupt:
+        pass
+    stop_workers(processes, stop, shutdown_timeout)
+    print("Job workers stopped")
@@ -0,0 +1,332 @@
+"""
+Lexicon Normalizer Module for Desi Translate
+Compiles word/phrase lexicons (slang, historical English) from rule files
+into a token trie and rewrites text with longest-match semantics.
+
+Lexicons are compiled once per process and recompiled only when their rule
+file changes on disk, so lookups cost O(tokens x longest phrase) no matter
+how many entries a lexicon holds.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from spelling import SpellingIndex
+
+RULES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rules')
+
+# Seconds between checks of a rule file's mtime for changes
+RELOAD_CHECK_INTERVAL = 1.0
+
+# Characters stripped from the end of a token before lookup
+TRAILING_PUNCTUATION = '.,!?;:'
+
+
+# A normalized span: (original tokens, replacement or None if unmatched,
+# trailing punctuation). Plain tuples: spans are created per token.
+Match = Tuple[str, Optional[str], str]
+
+# A matched phrase: (end token index, replacement, trailing punctuation)
+Span = Tuple[int, str, str]
+
+_WHITESPACE_SPLIT = re.compile(r'(\s+)')
+
+
+class TokenTrie:
+    """Trie keyed by whole tokens; values are stored on the node ending a phrase"""
+
+    _VALUE = None  # Node key holding the value (never a real token)
+
+    def __init__(self):
+        self.root: Dict = {}
+        self.size = 0
+        self.max_length = 0
+
+    def insert(self, phrase_tokens: List[str], value):
+        """Add a phrase (list of tokens) with its value"""
+        node = self.root
+        for token in phrase_tokens:
+            node = node.setdefault(token, {})
+        if self._VALUE not in node:
+            self.size += 1
+        node[self._VALUE] = value
+        self.max_length = max(self.max_length, len(phrase_tokens))
+
+    def longest_match(self, keys: List[str], start: int, boundaries: Optional[List[bool]] = None) -> Tuple[int, object]:
+        """
+        Find the longest phrase starting at keys[start].
+
+        Args:
+            keys: Token lookup keys
+            start: Index to start matching at
+            boundaries: Optional flags per token; a phrase may end at a
+                flagged token but never continue past it
+
+        Returns:
+            (number of tokens matched, value); (0, None) if nothing matches
+        """
+        node = self.root
+        best_length, best_value = 0, None
+        i = start
+        while i < len(keys):
+            node = node.get(keys[i])
+            if node is None:
+                break
+            i += 1
+            if self._VALUE in node:
+                best_length, best_value = i - start, node[self._VALUE]
+            if boundaries is not None and boundaries[i - 1]:
+                break
+        return best_length, best_value
+
+    def __len__(self) -> int:
+        return self.size
+
+
+def build_phrase_trie(words: Iterable[str]) -> TokenTrie:
+    """Trie of the multi-word entries among words; each phrase maps to itself"""
+    trie = TokenTrie()
+    for word in words:
+        tokens = word.split()
+        if len(tokens) > 1:
+            trie.insert(tokens, word)
+    return trie
+
+
+class LexiconNormalizer:
+    """Longest-match rewriter over a compiled lexicon"""
+
+    def __init__(self, entries: Dict[str, str]):
+        """
+        Compile a lexicon.
+
+        Args:
+            entries: Mapping of lowercase word or phrase -> replacement
+        """
+        self.trie = TokenTrie()
+        # Single-word entries, for the one-dict-lookup fast path
+        self.words: Dict[str, str] = {}
+        for phrase, replacement in entries.items():
+            tokens = phrase.lower().split()
+            if len(tokens) == 1:
+                self.words[tokens[0]] = replacement
+            if tokens:
+                self.trie.insert(tokens, replacement)
+        # First tokens of multi-word entries; only these need a trie walk
+        self.phrase_heads = frozenset(token for token, node in self.trie.root.items()
+                                      if any(key is not TokenTrie._VALUE for key in node))
+        self._spelling: Optional[SpellingIndex] = None
+
+    def spelling_index(self) -> SpellingIndex:
+        """Typo-correction index over the single-word entries (built on first use)"""
+        if self._spelling is None:
+            self._spelling = SpellingIndex(self.words)
+        return self._spelling
+
+    def find_spans(self, words: List[str]) -> Dict[int, Span]:
+        """
+        Find lexicon matches in a list of lowercase whitespace tokens,
+        preferring the longest phrase at each position.
+
+        A phrase never spans punctuation: 'by and by' matches "by and by."
+        but not "by, and by". Tokens are compared with their trailing
+        punctuation stripped.
+
+        Returns:
+            Mapping of start index -> (end index, replacement, trailing
+            punctuation of the last token). Unmatched tokens are absent.
+        """
+        single = self.words
+        phrase_heads = self.phrase_heads
+        value_key = TokenTrie._VALUE
+        n = len(words)
+
+        spans = {}
+        skip = 0
+        for i, word in enumerate(words):
+            if skip:
+                skip -= 1
+                continue
+
+            key = word.rstrip(TRAILING_PUNCTUATION)
+            # Fast path: a token that cannot start a phrase is one dict lookup
+            if key not in phrase_heads:
+                replacement = single.get(key)
+                if replacement is not None:
+                    spans[i] = (i + 1, replacement, word[len(key):])
+                continue
+
+            # Walk the trie for the longest phrase; a phrase may end at a
+            # token carrying punctuation but never continue past it
+            node = self.trie.root[key]
+            best_end, best_value, best_punctuation = i, None, ''
+            if value_key in node:
+                best_end, best_value, best_punctuation = i + 1, node[value_key], word[len(key):]
+            j, last_word, last_key = i + 1, word, key
+            while j < n and len(last_word) == len(last_key):
+                last_word = words[j]
+                last_key = last_word.rstrip(TRAILING_PUNCTUATION)
+                node = node.get(last_key)
+                if node is None:
+                    break
+                j += 1
+                if value_key in node:
+                    best_end, best_value, best_punctuation = j, node[value_key], last_word[len(last_key):]
+
+            if best_end > i:
+                spans[i] = (best_end, best_value, best_punctuation)
+                skip = best_end - i - 1
+        return spans
+
+    def normalize(self, text: str) -> List[Match]:
+        """
+        Rewrite text token by token with longest-match semantics.
+
+        Returns:
+            List of (original, replacement or None, trailing punctuation)
+            covering every token in order
+        """
+        words = text.lower().split()
+        spans = self.find_spans(words)
+
+        matches = []
+        end = 0
+        for i, word in enumerate(words):
+            if i < end:
+                continue
+            span = spans.get(i)
+            if span is None:
+                key = word.rstrip(TRAILING_PUNCTUATION)
+                matches.append((word, None, word[len(key):]))
+                end = i + 1
+            else:
+                end, replacement, punctuation = span
+                matches.append((' '.join(words[i:end]), replacement, punctuation))
+        return matches
+
+    def normalize_many(self, texts: List[str]) -> List[List[Match]]:
+        """Batch version of normalize"""
+        return [self.normalize(text) for text in texts]
+
+    def rewrite(self, text: str) -> Tuple[str, int]:
+        """
+        Rewrite text in place: matched spans are replaced, everything else
+        (whitespace, line breaks, case of unmatched words) is kept as is.
+        A replacement is capitalized when the word it replaces was.
+
+        Returns:
+            (rewritten text, number of replaced spans)
+        """
+        # Tokens at even indexes, the whitespace after each at odd indexes
+        parts = _WHITESPACE_SPLIT.split(text)
+        tokens = parts[0::2]
+        separators = parts[1::2]
+        return self._render(tokens, separators, self.find_spans([token.lower() for token in tokens]))
+
+    @staticmethod
+    def _render(tokens: List[str], separators: List[str], spans: Dict) -> Tuple[str, int]:
+        """Join tokens and separators, replacing the spans found by a left-to-right walk"""
+        out = []
+        replaced = 0
+        i = 0
+        while i < len(tokens):
+            span = spans.get(i)
+            if span is None:
+                out.append(tokens[i])
+                last = i
+            else:
+                end, replacement, punctuation = span
+                if tokens[i][:1].isupper():
+                    replacement = replacement[:1].upper() + replacement[1:]
+                out.append(replacement + punctuation)
+                replaced += 1
+                last = end - 1
+            if last < len(separators):
+                out.append(separators[last])
+            i = last + 1
+        return ''.join(out), replaced
+
+    def rewrite_stream(self, stream: TextIO, chunk_chars: int = 65536) -> Iterator[str]:
+        """
+        rewrite() over a text stream of any size in bounded memory.
+
+        The stream is read chunk_chars at a time. Spans are found over every
+        complete token of the buffer, and the text is emitted up to the last
+        (longest phrase - 1) complete tokens, whose matches may still depend
+        on text not read yet. When a span starting before that point runs
+        into the held tokens, the cut moves to the span's end. The rest is
+        carried into the next chunk with any partially read token, so the
+        output equals rewrite() of the whole text.
+
+        Yields:
+            Rewritten text pieces, in order
+        """
+        hold = max(self.trie.max_length - 1, 0)
+        buffer = ''
+        while True:
+            data = stream.read(chunk_chars)
+            if not data:
+                break
+            buffer += data
+            parts = _WHITESPACE_SPLIT.split(buffer)
+            tokens = parts[0::2]
+            separators = parts[1::2]
+            # The last token is partial (or '' after trailing whitespace)
+            complete = len(tokens) - 1
+            settled = complete - hold
+            if settled <= 0:
+                continue  # Not a full token past the held ones yet; read more
+            spans = self.find_spans([token.lower() for token in tokens[:complete]])
+
+            # Walk the spans like _render does, so the cut never splits one
+            cut = 0
+            while cut < settled:
+                span = spans.get(cut)
+                cut = span[0] if span else cut + 1
+            yield self._render(tokens[:cut], separators[:cut], spans)[0]
+            buffer = buffer[sum(len(token) + len(separator)
+                                for token, separator in zip(tokens[:cut], separators[:cut])):]
+        if buffer:
+            yield self.rewrite(buffer)[0]
+
+    def __len__(self) -> int:
+        return len(self.trie)
+
+
+# ==================== COMPILED LEXICON CACHE ====================
+
+# filename -> (mtime, monotonic time of last mtime check, normalizer)
+_cache: Dict[str, Tuple[float, float, LexiconNormalizer]] = {}
+_cache_lock = threading.Lock()
+
+
+def load_lexicon_entries(filename: str) -> Dict[str, str]:
+    """Read the 'entries' mapping of a lexicon rule file"""
+    with open(os.path.join(RULES_DIR, filename), 'r', encoding='utf-8') as f:
+        return json.load(f).get('entries', {})
+
+
+def get_normalizer(filename: str) -> LexiconNormalizer:
+    """
+    Compiled normalizer for a lexicon rule file in rules/.
+    Compiled on first use; recompiled only if the file's mtime has changed
+    (checked at most once per RELOAD_CHECK_INTERVAL).
+    """
+    now = time.monotonic()
+    cached = _cache.get(filename)
+    if cached and now - cached[1] < RELOAD_CHECK_INTERVAL:
+        return cached[2]
+
+    mtime = os.path.getmtime(os.path.join(RULES_DIR, filename))
+    with _cache_lock:
+        cached = _cache.get(filename)
+        if cached and cached[0] == mtime:
+            _cache[filename] = (mtime, now, cached[2])
+            return cached[2]
+        normalizer = LexiconNormalizer(load_lexicon_entries(filename))
+        _cache[filename] = (mtime, now, normalizer)
+        return normalizer
@@ -0,0 +1,350 @@
+"""
+Lexicon Store Module for Desi Translate
+SQLite-backed dictionaries for language pairs too large to hold as JSON
+in every worker.
+
+Each language pair is an indexed table (word -> JSON entry). Lookups go
+through an in-process LRU for the hot working set, then a Bloom filter
+that rejects most out-of-vocabulary words without touching SQLite, then
+a primary-key lookup. SQLiteLexicon is a read-only Mapping, so the
+translation code uses it exactly like the dict loaded from
+dictionaries.json.
+
+Select the backend with LEXICON_BACKEND in config.py and fill the
+database with `python manage_translations.py import-lexicon`.
+"""
+
+import functools
+import hashlib
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import config
+from lexicon_normalizer import TokenTrie, build_phrase_trie
+from morphology import Lemmatizer
+from reverse_index import ReverseIndex
+from spelling import SpellingIndex, build_spelling_index
+
+# Seconds between checks of the database mtime for re-imports
+RELOAD_CHECK_INTERVAL = 1.0
+
+# Language pair names double as table names
+PAIR_PATTERN = re.compile(r'^[a-z]+_[a-z]+$')
+
+# Top-level dictionaries.json keys that are not language pairs
+RESERVED_KEYS = frozenset({'metadata'})
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing of one blake2b digest)"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01,
+                 bits: Optional[bytearray] = None, num_hashes: Optional[int] = None):
+        """
+        Initialize Bloom filter.
+
+        Args:
+            capacity: Expected number of items
+            error_rate: Target false-positive rate at capacity
+            bits: Existing bit array (when loading a stored filter)
+            num_hashes: Hash count of the stored filter
+        """
+        capacity = max(1, capacity)
+        if bits is None:
+            num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+            bits = bytearray((num_bits + 7) // 8)
+        self.bits = bits
+        self.num_bits = len(bits) * 8
+        self.num_hashes = num_hashes or max(1, round(self.num_bits / capacity * math.log(2)))
+
+    def _hashes(self, item: str) -> Tuple[int, int]:
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+
+    def add(self, item: str):
+        """Add an item"""
+        bits, num_bits = self.bits, self.num_bits
+        h1, h2 = self._hashes(item)
+        for i in range(self.num_hashes):
+            position = (h1 + i * h2) % num_bits
+            bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        bits, num_bits = self.bits, self.num_bits
+        h1, h2 = self._hashes(item)
+        for i in range(self.num_hashes):
+            position = (h1 + i * h2) % num_bits
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class SQLiteLexicon(Mapping):
+    """Read-only word -> entry mapping for one language pair"""
+
+    def __init__(self, store: 'LexiconStore', pair: str, size: int, bloom: BloomFilter, cache_size: int):
+        self.store = store
+        self.pair = pair
+        self.size = size
+        self.bloom = bloom
+        self._select = f'SELECT entry FROM "{pair}" WHERE word = ?'
+        # C-implemented, thread-safe LRU; caches misses (None) as well
+        self._cached_lookup = functools.lru_cache(maxsize=cache_size)(self._lookup)
+
+    def _lookup(self, word: str) -> Optional[Dict]:
+        if word not in self.bloom:
+            return None
+        row = self.store.connection().execute(self._select, (word,)).fetchone()
+        # Cached and shared by every caller, so read-only
+        return MappingProxyType(json.loads(row[0])) if row else None
+
+    def get(self, word, default=None):
+        if type(word) is not str:
+            return default
+        entry = self._cached_lookup(word)
+        return default if entry is None else entry
+
+    def __getitem__(self, word):
+        entry = self.get(word)
+        if entry is None:
+            raise KeyError(word)
+        return entry
+
+    def __contains__(self, word) -> bool:
+        return self.get(word) is not None
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[str]:
+        for (word,) in self.store.connection().execute(f'SELECT word FROM "{self.pair}" ORDER BY word'):
+            yield word
+
+    def items(self) -> Iterator[Tuple[str, Dict]]:
+        """Stream (word, entry) pairs straight from SQLite"""
+        for word, entry in self.store.connection().execute(f'SELECT word, entry FROM "{self.pair}" ORDER BY word'):
+            yield word, json.loads(entry)
+
+    def cache_info(self):
+        """Hit/miss statistics of the LRU"""
+        return self._cached_lookup.cache_info()
+
+
+class LexiconStore(Mapping):
+    """
+    SQLite lexicon database: a read-only Mapping of language pair ->
+    SQLiteLexicon, plus the 'metadata' dict, mirroring dictionaries.json.
+    """
+
+    def __init__(self, path: str, cache_size: int = 65536, bloom_error_rate: float = 0.01):
+        """
+        Initialize lexicon store.
+
+        Args:
+            path: SQLite database file
+            cache_size: LRU entries kept per language pair
+            bloom_error_rate: False-positive rate of filters built on import
+        """
+        self.path = path
+        self.cache_size = cache_size
+        self.bloom_error_rate = bloom_error_rate
+        self._local = threading.local()
+        self._lexicons: Dict[str, SQLiteLexicon] = {}
+        self._lemmatizers: Dict[str, Lemmatizer] = {}
+        self._spelling: Dict[str, Optional[SpellingIndex]] = {}
+        self._reverse: Dict[str, ReverseIndex] = {}
+        self._phrases: Dict[str, Optional[TokenTrie]] = {}
+        self.metadata: Dict = {}
+        if os.path.exists(path):
+            self._load()
+
+    # ---------- connections ----------
+
+    def connection(self) -> sqlite3.Connection:
+        """Read-only connection for the calling thread (reopened after fork)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _load(self):
+        """Read pair sizes, Bloom filters and metadata"""
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        try:
+            for pair, size, bits, num_hashes in conn.execute(
+                    'SELECT pair, size, bloom, bloom_hashes FROM pairs ORDER BY pair'):
+                bloom = BloomFilter(size, bits=bytearray(bits), num_hashes=num_hashes)
+                self._lexicons[pair] = SQLiteLexicon(self, pair, size, bloom, self.cache_size)
+            row = conn.execute("SELECT value FROM meta WHERE key = 'metadata'").fetchone()
+            self.metadata = json.loads(row[0]) if row else {}
+        except sqlite3.DatabaseError as e:
+            print(f"Warning: Could not read lexicon store {self.path}: {e}")
+        finally:
+            conn.close()
+
+    # ---------- Mapping interface ----------
+
+    def __getitem__(self, key):
+        if key == 'metadata':
+            return self.metadata
+        return self._lexicons[key]
+
+    def __iter__(self) -> Iterator[str]:
+        if self.metadata:
+            yield 'metadata'
+        yield from self._lexicons
+
+    def __len__(self) -> int:
+        return len(self._lexicons) + (1 if self.metadata else 0)
+
+    def pairs(self) -> List[str]:
+        """Language pairs in the store"""
+        return list(self._lexicons)
+
+    def lemmatizer(self, pair: str) -> Optional[Lemmatizer]:
+        """Memoized suffix-stripping lemmatizer for an English-source pair, or None"""
+        if not pair.startswith('en_') or pair not in self._lexicons:
+            return None
+        lemmatizer = self._lemmatizers.get(pair)
+        if lemmatizer is None:
+            lemmatizer = self._lemmatizers[pair] = Lemmatizer(self._lexicons[pair], cache_size=self.cache_size)
+        return lemmatizer
+
+    def spelling_index(self, pair: str) -> Optional[SpellingIndex]:
+        """Typo-correction index over a pair's words (read from the table once), or None"""
+        if pair not in self._spelling:
+            lexicon = self._lexicons.get(pair)
+            self._spelling[pair] = None if lexicon is None else build_spelling_index(
+                lexicon, config.SPELLING_INDEX_MAX_WORDS, config.SPELLING_MAX_DISTANCE, name=pair)
+        return self._spelling[pair]
+
+    def phrase_trie(self, pair: str) -> Optional[TokenTrie]:
+        """Trie of a pair's multi-word headwords (queried once), or None if it has none"""
+        if pair not in self._phrases:
+            trie = None
+            if pair in self._lexicons:
+                rows = self.connection().execute(f'SELECT word FROM "{pair}" WHERE word LIKE \'% %\'')
+                trie = build_phrase_trie(word for (word,) in rows)
+            self._phrases[pair] = trie if trie is not None and len(trie) else None
+        return self._phrases[pair]
+
+    def reverse_index(self, pair: str) -> Optional[ReverseIndex]:
+        """Translation -> English headwords index of an en_X pair (read from the table once), or None"""
+        if not pair.startswith('en_') or pair not in self._lexicons:
+            return None
+        index = self._reverse.get(pair)
+        if index is None:
+            index = self._reverse[pair] = ReverseIndex(self._lexicons[pair])
+        return index
+
+    # ---------- bulk import ----------
+
+    def import_dictionaries(self, dictionaries: Dict, pairs: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """
+        Bulk-load language pairs (dictionaries.json layout), replacing any
+        existing data for those pairs. Each pair is swapped in atomically:
+        readers see the old table or the new one, never neither.
+
+        Args:
+            dictionaries: Mapping of pair -> {word: entry}, optionally with 'metadata'
+            pairs: Only import these pairs (default: all)
+
+        Returns:
+            Mapping of pair -> number of entries imported
+        """
+        selected = [p for p in (pairs or dictionaries.keys()) if p not in RESERVED_KEYS]
+        for pair in selected:
+            if not PAIR_PATTERN.match(pair):
+                raise ValueError(f"Invalid language pair name: {pair}")
+
+        # Autocommit mode: the legacy transaction handling would commit the
+        # DROP TABLE on its own, so transactions are opened explicitly
+        conn = sqlite3.connect(self.path, isolation_level=None)
+        counts = {}
+        try:
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS pairs (pair TEXT PRIMARY KEY, size INTEGER, '
+                         'bloom BLOB, bloom_hashes INTEGER)')
+            conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+
+            for pair in selected:
+                words = dictionaries[pair]
+                bloom = BloomFilter(len(words), self.bloom_error_rate)
+
+                def rows():
+                    for word, entry in words.items():
+                        key = word.lower()
+                        bloom.add(key)
+                        yield key, json.dumps(entry, ensure_ascii=False, separators=(',', ':'))
+
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    conn.execute(f'DROP TABLE IF EXISTS "{pair}"')
+                    conn.execute(f'CREATE TABLE "{pair}" (word TEXT PRIMARY KEY, entry TEXT NOT NULL) WITHOUT ROWID')
+                    conn.executemany(f'INSERT OR REPLACE INTO "{pair}" (word, entry) VALUES (?, ?)', rows())
+                    size = conn.execute(f'SELECT COUNT(*) FROM "{pair}"').fetchone()[0]
+                    conn.execute('INSERT OR REPLACE INTO pairs (pair, size, bloom, bloom_hashes) VALUES (?, ?, ?, ?)',
+                                 (pair, size, bytes(bloom.bits), bloom.num_hashes))
+                    conn.execute('COMMIT')
+                except BaseException:
+                    conn.execute('ROLLBACK')
+                    raise
+                counts[pair] = size
+
+            if 'metadata' in dictionaries:
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('metadata', ?)",
+                             (json.dumps(dictionaries['metadata'], ensure_ascii=False),))
+        finally:
+            conn.close()
+
+        self._lexicons = {}
+        self._lemmatizers = {}
+        self._spelling = {}
+        self._reverse = {}
+        self._phrases = {}
+        self._load()
+        return counts
+
+
+# ==================== STORE CACHE ====================
+
+# path -> (mtime, monotonic time of last mtime check, store)
+_stores: Dict[str, Tuple[float, float, LexiconStore]] = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path: str, cache_size: int = 65536) -> LexiconStore:
+    """
+    Shared LexiconStore for a database file.
+    Reopened only if the file's mtime has changed (a re-import), checked at
+    most once per RELOAD_CHECK_INTERVAL.
+    """
+    now = time.monotonic()
+    cached = _stores.get(path)
+    if cached and now - cached[1] < RELOAD_CHECK_INTERVAL:
+        return cached[2]
+
+    if os.path.exists(path):
+        mtime = os.path.getmtime(path)
+    else:
+        mtime = 0.0
+        if not cached:
+            print(f"Warning: Lexicon store {path} not found; run manage_translations.py import-lexicon")
+    with _stores_lock:
+        cached = _stores.get(path)
+        if cached and cached[0] == mtime:
+            _stores[path] = (mtime, now, cached[2])
+            return cached[2]
+        store = LexiconStore(path, cache_size=cache_size)
+        _stores[path] = (mtime, now, store)
+        return store
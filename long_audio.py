@@ -0,0 +1,288 @@
+"""
+Long Audio Module for Desi Translate
+Recognizes long recordings window by window.
+
+A recording is cut into windows (at silences when the file is a PCM WAV,
+otherwise fixed windows that overlap a little so no word is cut in half).
+Each window is read on its own with sr.AudioFile offset/duration, so only
+one window per thread is ever in memory, and windows are recognized
+concurrently in a thread pool (recognition is I/O-bound on the speech
+service). The partial transcripts are stitched back in order with their
+timestamps, dropping words repeated in the overlap, and convert directly
+into SubtitleEntry objects.
+
+Recognition goes through a backend: any object with
+recognize(audio, language_code) -> (text, confidence). GoogleBackend uses
+the SpeechRecognition web API; StubBackend answers locally for tests.
+"""
+
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import speech_recognition as sr
+
+import pcm
+from subtitle_processor import SubtitleEntry
+
+# Frame length used for silence detection
+SILENCE_FRAME_SECONDS = 0.03
+
+
+class Window(NamedTuple):
+    """A slice of the recording: [start, end) seconds, overlapping the previous window by `overlap`"""
+    start: float
+    end: float
+    overlap: float = 0.0
+
+
+class Segment(NamedTuple):
+    """Recognized text of one window with its (non-overlapping) time range"""
+    start: float
+    end: float
+    text: str
+    confidence: float
+
+
+# ==================== BACKENDS ====================
+
+class GoogleBackend:
+    """Google Web Speech API through SpeechRecognition"""
+
+    def __init__(self, recognizer: sr.Recognizer):
+        self.recognizer = recognizer
+
+    def recognize(self, audio: sr.AudioData, language_code: str) -> Tuple[str, float]:
+        try:
+            text = self.recognizer.recognize_google(audio, language=language_code)
+        except sr.UnknownValueError:
+            return "", 0.0
+        return text, 0.85  # Google doesn't directly provide confidence, estimate high
+
+
+class StubBackend:
+    """Local backend for tests and offline runs: no network, deterministic text"""
+
+    def __init__(self, transcribe: Optional[Callable[[sr.AudioData], str]] = None, confidence: float = 0.85):
+        """
+        Args:
+            transcribe: Returns the text for a window's audio (default
+                describes the window's length)
+            confidence: Confidence reported for non-empty text
+        """
+        self.transcribe = transcribe or (lambda audio: f"speech {audio_duration(audio):.1f} seconds")
+        self.confidence = confidence
+
+    def recognize(self, audio: sr.AudioData, language_code: str) -> Tuple[str, float]:
+        text = self.transcribe(audio)
+        return text, (self.confidence if text else 0.0)
+
+
+def audio_duration(audio: sr.AudioData) -> float:
+    """Length of an AudioData clip in seconds"""
+    return len(audio.frame_data) / (audio.sample_rate * audio.sample_width)
+
+
+# ==================== WINDOWS ====================
+
+def file_duration(audio_file_path: str) -> float:
+    """Length of an audio file in seconds (any format sr.AudioFile reads)"""
+    with sr.AudioFile(audio_file_path) as source:
+        return source.DURATION
+
+
+def fixed_windows(start: float, end: float, window_seconds: float, overlap_seconds: float,
+                  first_overlap: float = 0.0) -> List[Window]:
+    """Cover [start, end) with windows of window_seconds, each overlapping the previous by overlap_seconds"""
+    windows = []
+    position, overlap = start, first_overlap
+    while True:
+        window_end = min(position + window_seconds, end)
+        windows.append(Window(position, window_end, overlap))
+        if window_end >= end:
+            return windows
+        position, overlap = window_end - overlap_seconds, overlap_seconds
+
+
+def silence_cuts(wav_path: str, min_silence_seconds: float = 0.3, silence_ratio: float = 0.15) -> List[float]:
+    """
+    Midpoints of the silences in a PCM WAV file, in seconds.
+
+    A frame is silent when its RMS energy is below silence_ratio times the
+    90th-percentile frame energy, so the threshold follows the recording's
+    level. The file is streamed frame by frame.
+    """
+    with wave.open(wav_path, 'rb') as wav:
+        rate, width, channels = wav.getframerate(), wav.getsampwidth(), wav.getnchannels()
+        frame_count = max(1, int(rate * SILENCE_FRAME_SECONDS))
+        energies = []
+        while True:
+            chunk = wav.readframes(frame_count)
+            if not chunk:
+                break
+            if channels > 1:
+                chunk = pcm.tomono(chunk, width, 0.5, 0.5)
+            energies.append(pcm.rms(chunk, width))
+    if not energies:
+        return []
+
+    threshold = sorted(energies)[int(len(energies) * 0.9)] * silence_ratio
+    min_frames = max(1, int(min_silence_seconds / SILENCE_FRAME_SECONDS))
+    cuts = []
+    run_start = None
+    for i, energy in enumerate(energies + [threshold + 1]):  # Sentinel closes a trailing silence
+        if energy < threshold:
+            if run_start is None:
+                run_start = i
+        elif run_start is not None:
+            if i - run_start >= min_frames:
+                cuts.append((run_start + i) / 2 * SILENCE_FRAME_SECONDS)
+            run_start = None
+    return cuts
+
+
+def plan_windows(duration: float, cuts: List[float], window_seconds: float = 30.0, overlap_seconds: float = 2.0,
+                 min_window_seconds: float = 5.0) -> List[Window]:
+    """
+    Windows covering [0, duration): cut at silences where possible, packing
+    as much as fits into window_seconds. A stretch with no usable silence is
+    split into fixed, overlapping windows.
+
+    Args:
+        cuts: Candidate cut points (seconds, ascending), e.g. silence_cuts()
+        min_window_seconds: Cuts closer than this to the window start are
+            skipped (avoids tiny windows)
+    """
+    windows = []
+    start = 0.0
+    cuts = [cut for cut in cuts if 0.0 < cut < duration]
+    while start < duration:
+        if duration - start <= window_seconds:
+            windows.append(Window(start, duration))
+            break
+        limit = start + window_seconds
+        usable = [cut for cut in cuts if start + min_window_seconds <= cut <= limit]
+        if usable:
+            windows.append(Window(start, usable[-1]))
+            start = usable[-1]
+            continue
+        # No silence to cut at: fixed windows up to the next cut (or the end)
+        next_cut = next((cut for cut in cuts if cut > limit), duration)
+        windows.extend(fixed_windows(start, next_cut, window_seconds, overlap_seconds))
+        start = next_cut
+    return windows
+
+
+# ==================== RECOGNITION ====================
+
+def _recognize_window(audio_file_path: str, window: Window, recognizer: sr.Recognizer, backend,
+                      language_code: str) -> Tuple[str, float]:
+    # Each thread opens the file itself and reads only its window
+    with sr.AudioFile(audio_file_path) as source:
+        audio = recognizer.record(source, offset=window.start, duration=window.end - window.start)
+    try:
+        return backend.recognize(audio, language_code)
+    except sr.RequestError as e:
+        print(f"Speech recognition service error ({window.start:.1f}s-{window.end:.1f}s): {e}")
+        return "", 0.0
+
+
+def drop_repeated_words(previous: str, text: str, max_words: int = 8) -> str:
+    """
+    Remove the words at the start of text that repeat the end of previous
+    (both windows heard the overlap). The longest match of up to max_words
+    words wins; matching ignores case and punctuation. A window is longer
+    than the overlap, so text is never emptied entirely.
+    """
+    def key(word):
+        return word.strip('.,!?;:"\'').lower()
+
+    before = [key(w) for w in previous.split()[-max_words:]]
+    words = text.split()
+    after = [key(w) for w in words[:max_words]]
+    for length in range(min(len(before), len(after), len(words) - 1), 0, -1):
+        if before[-length:] == after[:length]:
+            return ' '.join(words[length:])
+    return text
+
+
+def stitch(windows: List[Window], results: List[Tuple[str, float]]) -> List[Segment]:
+    """
+    Join per-window results into ordered, non-overlapping segments. The time
+    two windows share is split at its middle; empty windows are dropped.
+    """
+    segments = []
+    previous_text = ''
+    for i, (window, (text, confidence)) in enumerate(zip(windows, results)):
+        start = window.start + window.overlap / 2
+        end = window.end - (windows[i + 1].overlap / 2 if i + 1 < len(windows) else 0.0)
+        if window.overlap and previous_text:
+            text = drop_repeated_words(previous_text, text)
+        if text:
+            segments.append(Segment(round(start, 3), round(end, 3), text, confidence))
+            previous_text = text
+    return segments
+
+
+def recognize_long_audio(audio_file_path: str, recognizer: sr.Recognizer, backend, language_code: str,
+                         window_seconds: float = 30.0, overlap_seconds: float = 2.0,
+                         split_on_silence: bool = True, max_workers: int = 4) -> Dict:
+    """
+    Recognize a recording of any length window by window.
+
+    Args:
+        audio_file_path: WAV/AIFF/FLAC file (silence splitting needs WAV)
+        recognizer: sr.Recognizer used to read windows
+        backend: Recognizer backend (GoogleBackend, StubBackend, ...)
+        language_code: Backend language, e.g. 'hi-IN'
+        window_seconds: Longest window sent in one call
+        overlap_seconds: Overlap of fixed windows
+        split_on_silence: Cut at silences instead of fixed windows
+        max_workers: Windows recognized at the same time
+
+    Returns:
+        Dict with text, confidence (duration-weighted), duration and
+        segments [{'start', 'end', 'text', 'confidence'}] in seconds
+    """
+    duration = file_duration(audio_file_path)
+    cuts = []
+    if split_on_silence:
+        try:
+            cuts = silence_cuts(audio_file_path)
+        except (wave.Error, EOFError):
+            pass  # Not a PCM WAV: fixed windows only
+    windows = plan_windows(duration, cuts, window_seconds, overlap_seconds)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        results = list(pool.map(
+            lambda window: _recognize_window(audio_file_path, window, recognizer, backend, language_code),
+            windows))
+    segments = stitch(windows, results)
+
+    spoken = sum(segment.end - segment.start for segment in segments)
+    confidence = sum(s.confidence * (s.end - s.start) for s in segments) / spoken if spoken else 0.0
+    return {
+        'text': ' '.join(segment.text for segment in segments),
+        'confidence': round(confidence, 4),
+        'duration': round(duration, 3),
+        'segments': [segment._asdict() for segment in segments]
+    }
+
+
+def format_timestamp(seconds: float) -> str:
+    """Seconds -> SRT time (HH:MM:SS,mmm)"""
+    milliseconds = int(round(seconds * 1000))
+    hours, milliseconds = divmod(milliseconds, 3600000)
+    minutes, milliseconds = divmod(milliseconds, 60000)
+    secs, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{milliseconds:03d}"
+
+
+def segments_to_subtitles(segments: List[Dict]) -> List[SubtitleEntry]:
+    """SubtitleEntry per recognized segment (ready for SubtitleProcessor.translate_entries/save_to_srt)"""
+    entries = []
+    for i, segment in enumerate(segments, start=1):
+        entry = SubtitleEntry(i, format_timestamp(segment['start']), format_timestamp(segment['end']),
+                              segment['text'])
+        entries.append(entry)
+    return entries
@@ -6,6 +6,7 @@ Utility script to manage dictionaries, rules, and translations
 
 import json
 import os
+import time
 from pathlib import Path
 
 RULES_DIR = Path(__file__).parent / 'rules'
@@ -152,6 +153,130 @@ def import_from_backup(filename='translation_backup.json'):
     
     print(f"✓ Backup restored from: {filename}")
 
+def import_lexicon(filename='dictionaries_comprehensive.json', language_pair=None, db_path=None):
+    """
+    Bulk-import dictionaries into the SQLite lexicon store (LEXICON_DB).
+    The file may use the dictionaries.json layout ({pair: {word: entry}})
+    or be a single {word: entry} mapping imported as language_pair.
+    """
+    import config
+    from lexicon_store import LexiconStore
+    
+    filepath = Path(filename)
+    if not filepath.exists():
+        filepath = RULES_DIR / filename
+    if not filepath.exists():
+        print(f"Dictionary file not found: {filename}")
+        return
+    
+    with open(filepath, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    # A flat word -> entry file belongs to a single language pair
+    is_flat = not any(isinstance(v, dict) and all(isinstance(e, dict) for e in v.values())
+                      for k, v in data.items() if k != 'metadata')
+    if is_flat:
+        if not language_pair:
+            print("This file holds a single dictionary; pass the language pair, e.g. en_hindi")
+            return
+        data = {language_pair: data}
+    elif language_pair and language_pair not in data:
+        print(f"Language pair {language_pair} not found in {filename}")
+        return
+    
+    if not language_pair:
+        # Same derived X_en and pivot tables the JSON backend builds in its rules snapshot
+        from pivot_tables import build_pivot_tables
+        from reverse_index import build_reverse_indexes, build_reverse_tables
+        reverse_indexes = build_reverse_indexes(data)
+        derived = build_reverse_tables(data, reverse_indexes)
+        if config.PIVOT_TABLES_ENABLED:
+            derived.update(build_pivot_tables(data, reverse_indexes))
+        data.update(derived)
+    
+    db_path = db_path or config.LEXICON_DB
+    store = LexiconStore(db_path, bloom_error_rate=config.LEXICON_BLOOM_ERROR_RATE)
+    
+    started = time.time()
+    counts = store.import_dictionaries(data, pairs=[language_pair] if language_pair else None)
+    elapsed = time.time() - started
+    
+    for pair, count in counts.items():
+        print(f"  {pair:20} : {count:8} words")
+    print(f"✓ Imported {sum(counts.values())} words into {db_path} in {elapsed:.1f}s")
+    print("  Set DESI_LEXICON_BACKEND=sqlite to serve translations from it")
+
+def work_jobs(workers=None):
+    """Run the background job workers (/api/jobs) in the foreground until stopped"""
+    import config
+    from app import JOB_HANDLERS
+    from job_queue import run_workers
+    
+    run_workers(config.JOB_DB, JOB_HANDLERS, int(workers) if workers else config.JOB_WORKERS,
+                lease_seconds=config.JOB_LEASE_SECONDS, max_attempts=config.JOB_MAX_ATTEMPTS,
+                poll_interval=config.JOB_POLL_INTERVAL, progress_interval=config.JOB_PROGRESS_INTERVAL)
+
+def prerender_tts(language='hindi', limit=None):
+    """
+    Synthesize the translations of common phrases (warm-up sentences and
+    frequent history) into the TTS cache, so they are served without waiting
+    """
+    from app import translate_text, warmup_sentences
+    from voice_handler import VoiceHandler
+    
+    handler = VoiceHandler()
+    if not handler.tts_worker or not handler.tts_cache:
+        print("✗ Text-to-speech engine or TTS cache not available")
+        return
+    
+    phrases = []
+    for text, source_lang, target_lang in warmup_sentences():
+        if (target_lang or 'hindi') == language:
+            translated = translate_text(text, source_lang or 'en', language).get('translated_text')
+            if translated and translated not in phrases:
+                phrases.append(translated)
+    if limit:
+        phrases = phrases[:int(limit)]
+    
+    started = time.time()
+    misses = handler.tts_cache.misses
+    rendered = sum(1 for phrase in phrases if handler.cached_audio(phrase, language))
+    elapsed = time.time() - started
+    
+    stats = handler.tts_cache.stats()
+    print(f"✓ {rendered}/{len(phrases)} {language} phrases cached "
+          f"({handler.tts_cache.misses - misses} synthesized) in {elapsed:.1f}s")
+    print(f"  Cache: {stats['entries']} files, {stats['bytes'] / 1024 / 1024:.1f} MB")
+
+def dub_subtitles(subtitle_file, output_path='dubbed.wav', language='hindi', source_lang='en'):
+    """Translate a subtitle file and synthesize the translation as a timed WAV track"""
+    from app import translate_text
+    from subtitle_processor import SubtitleProcessor
+    from tts_worker import close_tts_worker
+    from voice_handler import VoiceHandler
+    
+    entries, _ = SubtitleProcessor.parse_subtitle_file(subtitle_file)
+    if not entries:
+        print(f"✗ No subtitle entries found in {subtitle_file}")
+        return
+    handler = VoiceHandler()
+    if not handler.tts_worker or not handler.tts_cache:
+        print("✗ Text-to-speech engine or TTS cache not available")
+        return
+    
+    started = time.time()
+    def translate_cue(text, source_lang, target_lang):
+        return translate_text(text, source_lang, target_lang, fields=frozenset())
+    
+    SubtitleProcessor.translate_entries(entries, translate_cue, source_lang, language)
+    result = handler.render_dubbing_track(entries, output_path, language)
+    elapsed = time.time() - started
+    
+    print(f"✓ {result['cues']} cues dubbed into {output_path} ({result['duration']:.0f}s of audio) in {elapsed:.1f}s")
+    print(f"  {result['stretched']} sped up, {result['truncated']} cut short, {result['failed']} failed")
+    handler.close()
+    close_tts_worker(timeout=5)
+
 if __name__ == '__main__':
     import sys
     
@@ -163,6 +288,10 @@ if __name__ == '__main__':
         print("  python manage_translations.py list-idioms")
         print("  python manage_translations.py backup")
         print("  python manage_translations.py restore")
+        print("  python manage_translations.py import-lexicon [json_file] [language_pair]")
+        print("  python manage_translations.py work-jobs [workers]")
+        print("  python manage_translations.py prerender-tts [language] [limit]")
+        print("  python manage_translations.py dub <subtitle_file> [output.wav] [language]")
         sys.exit(1)
     
     command = sys.argv[1]
@@ -181,5 +310,16 @@ if __name__ == '__main__':
         export_for_backup()
     elif command == 'restore':
         import_from_backup()
+    elif command == 'import-lexicon':
+        import_lexicon(*sys.argv[2:4])
+    elif command == 'work-jobs':
+        work_jobs(*sys.argv[2:3])
+    elif command == 'prerender-tts':
+        prerender_tts(*sys.argv[2:4])
+    elif command == 'dub':
+        if len(sys.argv) < 3:
+            print("Usage: python manage_translations.py dub <subtitle_file> [output.wav] [language]")
+        else:
+            dub_subtitles(*sys.argv[2:5])
     else:
         print(f"Unknown command: {command}")
@@ -0,0 +1,296 @@
+"""
+Metrics Module for Desi Translate
+Lightweight per-stage timers, counters and histograms exposed in the
+Prometheus text format.
+
+Each gunicorn worker aggregates into its own in-process registry and
+periodically dumps a snapshot to a shared directory (one JSON file per
+worker pid). The /metrics route merges every worker's snapshot, so any
+worker can answer a scrape for the whole node. Clear METRICS_DIR on
+deploy to reset the counters.
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, Optional, Tuple
+
+import config
+
+# Histogram bucket upper bounds
+TIME_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (16, 64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+# Metric metadata: name -> (type, help text, buckets)
+METRICS = {
+    'desi_stage_seconds': ('histogram', 'Time spent in each translation stage', TIME_BUCKETS),
+    'desi_request_seconds': ('histogram', 'API request latency by endpoint', TIME_BUCKETS),
+    'desi_request_size_bytes': ('histogram', 'Request body size by endpoint', SIZE_BUCKETS),
+    'desi_requests_total': ('counter', 'API requests by endpoint and status', None),
+    'desi_cache_requests_total': ('counter', 'Cache and dictionary lookups by result', None),
+    'desi_dropped_records_total': ('counter', 'Records dropped by full write-behind buffers', None),
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[Dict[str, str]]) -> LabelKey:
+    """Hashable, order-independent key for a label set"""
+    if not labels:
+        return ()
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the Prometheus text format"""
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+def _format_number(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """In-process registry of counters and histograms"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.counters: Dict[Tuple[str, LabelKey], float] = {}
+        # (name, labels) -> [bucket counts..., sum, count]
+        self.histograms: Dict[Tuple[str, LabelKey], list] = {}
+
+    def inc(self, name: str, labels: Optional[Dict[str, str]] = None, value: float = 1.0):
+        """Increment a counter"""
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
+        """Record one observation in a histogram"""
+        if not self.enabled:
+            return
+        buckets = METRICS[name][2]
+        key = (name, _label_key(labels))
+        with self._lock:
+            series = self.histograms.get(key)
+            if series is None:
+                series = self.histograms[key] = [0] * (len(buckets) + 1) + [0.0, 0]
+            # Non-cumulative here; made cumulative when exported
+            series[bisect_left(buckets, value)] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def snapshot(self) -> Dict:
+        """JSON-serializable copy of the registry"""
+        with self._lock:
+            return {
+                'counters': [[name, list(map(list, key)), value]
+                             for (name, key), value in self.counters.items()],
+                'histograms': [[name, list(map(list, key)), list(series)]
+                               for (name, key), series in self.histograms.items()]
+            }
+
+    def merge(self, snapshot: Dict):
+        """Add another registry's snapshot into this one"""
+        with self._lock:
+            for name, key, value in snapshot.get('counters', []):
+                full_key = (name, tuple(tuple(pair) for pair in key))
+                self.counters[full_key] = self.counters.get(full_key, 0.0) + value
+            for name, key, series in snapshot.get('histograms', []):
+                if name not in METRICS:
+                    continue
+                full_key = (name, tuple(tuple(pair) for pair in key))
+                existing = self.histograms.get(full_key)
+                if existing is None:
+                    self.histograms[full_key] = list(series)
+                else:
+                    for i, value in enumerate(series):
+                        existing[i] += value
+
+    def to_prometheus(self) -> str:
+        """Render the registry in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items())
+
+        for name, (metric_type, help_text, buckets) in METRICS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+
+            if metric_type == 'counter':
+                for (series_name, key), value in counters:
+                    if series_name == name:
+                        lines.append(f"{name}{_format_labels(key)} {_format_number(value)}")
+                continue
+
+            for (series_name, key), series in histograms:
+                if series_name != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(buckets, series):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(key, (('le', _format_number(bound)),))} {cumulative}")
+                lines.append(f"{name}_bucket{_format_labels(key, (('le', '+Inf'),))} {series[-1]}")
+                lines.append(f"{name}_sum{_format_labels(key)} {repr(float(series[-2]))}")
+                lines.append(f"{name}_count{_format_labels(key)} {series[-1]}")
+
+        return '\n'.join(lines) + '\n'
+
+
+class StageTimer:
+    """Context manager that records elapsed time into desi_stage_seconds"""
+
+    __slots__ = ('registry', 'labels', 'started')
+
+    def __init__(self, registry: MetricsRegistry, stage: str):
+        self.registry = registry
+        self.labels = {'stage': stage}
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.observe('desi_stage_seconds', time.perf_counter() - self.started, self.labels)
+        return False
+
+
+class _NullTimer:
+    """No-op timer used while metrics are disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class SharedRegistry:
+    """
+    File-backed view of all workers' registries.
+
+    Each process writes its own snapshot to <directory>/metrics-<pid>.json
+    (atomically, at most once per flush_interval) and reads every file back
+    when rendering /metrics.
+    """
+
+    def __init__(self, registry: MetricsRegistry, directory: str, flush_interval: float = 5.0):
+        self.registry = registry
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._last_flush = 0.0
+
+    def _path(self, pid: int) -> str:
+        return os.path.join(self.directory, f"metrics-{pid}.json")
+
+    def flush(self):
+        """Write this process's snapshot to the shared directory"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(os.getpid())
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.registry.snapshot(), f)
+            os.replace(tmp_path, path)
+            self._last_flush = time.monotonic()
+        except OSError as e:
+            print(f"Warning: Could not flush metrics: {e}")
+
+    def maybe_flush(self):
+        """Flush if the last flush is older than flush_interval"""
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def collect(self) -> MetricsRegistry:
+        """Merge every worker's snapshot into a fresh registry"""
+        self.flush()
+        merged = MetricsRegistry()
+        for filename in self._snapshot_files():
+            try:
+                with open(os.path.join(self.directory, filename), 'r', encoding='utf-8') as f:
+                    merged.merge(json.load(f))
+            except (OSError, ValueError):
+                # A worker may be mid-write or gone; skip its snapshot
+                continue
+        return merged
+
+    def _snapshot_files(self) -> Iterable[str]:
+        try:
+            return [name for name in os.listdir(self.directory)
+                    if name.startswith('metrics-') and name.endswith('.json')]
+        except OSError:
+            return []
+
+
+# ==================== MODULE-LEVEL REGISTRY ====================
+
+registry = MetricsRegistry(enabled=config.METRICS_ENABLED)
+shared = SharedRegistry(registry, config.METRICS_DIR, config.METRICS_FLUSH_INTERVAL)
+
+
+def timer(stage: str):
+    """
+    Time a translation stage.
+
+    Usage:
+        with metrics.timer('tokenization'):
+            ...
+    """
+    if not registry.enabled:
+        return _NULL_TIMER
+    return StageTimer(registry, stage)
+
+
+def record_stage(stage: str, seconds: float):
+    """Record time spent in a stage measured outside a timer() block"""
+    if registry.enabled:
+        registry.observe('desi_stage_seconds', seconds, {'stage': stage})
+
+
+def record_cache(cache: str, hits: int = 0, misses: int = 0):
+    """Count lookups against a cache or dictionary"""
+    if hits:
+        registry.inc('desi_cache_requests_total', {'cache': cache, 'result': 'hit'}, hits)
+    if misses:
+        registry.inc('desi_cache_requests_total', {'cache': cache, 'result': 'miss'}, misses)
+
+
+def record_drop(buffer: str, count: int = 1):
+    """Count records a write-behind buffer dropped because its writer fell behind"""
+    registry.inc('desi_dropped_records_total', {'buffer': buffer}, count)
+
+
+def record_request(endpoint: str, status: int, seconds: float, size_bytes: Optional[int] = None):
+    """Record one finished API request"""
+    labels = {'endpoint': endpoint}
+    registry.observe('desi_request_seconds', seconds, labels)
+    registry.inc('desi_requests_total', {'endpoint': endpoint, 'status': str(status)})
+    if size_bytes is not None:
+        registry.observe('desi_request_size_bytes', size_bytes, labels)
+
+
+def render() -> str:
+    """Prometheus text for all workers on this node"""
+    return shared.collect().to_prometheus()
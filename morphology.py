@@ -0,0 +1,221 @@
+"""
+Morphology Module for Desi Translate
+Maps inflected English words ("running", "walked", "books") to their
+dictionary headwords ("run", "walk", "book").
+
+For compiled dictionaries every inflection of every headword is generated
+once, when the rules snapshot is built, into a form -> (lemma, inflection)
+index, so resolving a token is one dict lookup. Vocabularies too large for
+a full index (or served from SQLite) fall back to memoized suffix
+stripping, which applies the same rules in reverse.
+"""
+
+import functools
+from collections.abc import Mapping
+from typing import Dict, List, Optional, Tuple
+
+VOWELS = frozenset('aeiou')
+
+# Inflection -> parts of speech of the headwords it applies to
+INFLECTION_POS = {
+    'plural': frozenset({'noun'}),
+    'third_person': frozenset({'verb'}),
+    'past': frozenset({'verb'}),
+    'gerund': frozenset({'verb'}),
+    'comparative': frozenset({'adjective'}),
+    'superlative': frozenset({'adjective'}),
+}
+
+# Irregular form -> (lemma, inflection); applied whatever the headword's POS
+IRREGULAR_FORMS = {
+    # Verbs
+    'went': ('go', 'past'), 'gone': ('go', 'past'), 'goes': ('go', 'third_person'),
+    'ran': ('run', 'past'), 'ate': ('eat', 'past'), 'eaten': ('eat', 'past'),
+    'saw': ('see', 'past'), 'seen': ('see', 'past'), 'came': ('come', 'past'),
+    'took': ('take', 'past'), 'taken': ('take', 'past'), 'gave': ('give', 'past'),
+    'given': ('give', 'past'), 'made': ('make', 'past'), 'said': ('say', 'past'),
+    'told': ('tell', 'past'), 'knew': ('know', 'past'), 'known': ('know', 'past'),
+    'thought': ('think', 'past'), 'found': ('find', 'past'), 'got': ('get', 'past'),
+    'bought': ('buy', 'past'), 'brought': ('bring', 'past'), 'taught': ('teach', 'past'),
+    'caught': ('catch', 'past'), 'wrote': ('write', 'past'), 'written': ('write', 'past'),
+    'spoke': ('speak', 'past'), 'spoken': ('speak', 'past'), 'drank': ('drink', 'past'),
+    'drunk': ('drink', 'past'), 'sang': ('sing', 'past'), 'sung': ('sing', 'past'),
+    'slept': ('sleep', 'past'), 'kept': ('keep', 'past'), 'left': ('leave', 'past'),
+    'felt': ('feel', 'past'), 'met': ('meet', 'past'), 'sat': ('sit', 'past'),
+    'stood': ('stand', 'past'), 'understood': ('understand', 'past'), 'heard': ('hear', 'past'),
+    'held': ('hold', 'past'), 'built': ('build', 'past'), 'sent': ('send', 'past'),
+    'spent': ('spend', 'past'), 'lost': ('lose', 'past'), 'paid': ('pay', 'past'),
+    'read': ('read', 'past'), 'began': ('begin', 'past'), 'begun': ('begin', 'past'),
+    'swam': ('swim', 'past'), 'flew': ('fly', 'past'), 'flown': ('fly', 'past'),
+    'drove': ('drive', 'past'), 'driven': ('drive', 'past'), 'rode': ('ride', 'past'),
+    'fell': ('fall', 'past'), 'fallen': ('fall', 'past'), 'grew': ('grow', 'past'),
+    'grown': ('grow', 'past'), 'threw': ('throw', 'past'), 'thrown': ('throw', 'past'),
+    'woke': ('wake', 'past'), 'wore': ('wear', 'past'), 'won': ('win', 'past'),
+    'forgot': ('forget', 'past'), 'forgotten': ('forget', 'past'), 'broke': ('break', 'past'),
+    'broken': ('break', 'past'), 'chose': ('choose', 'past'), 'chosen': ('choose', 'past'),
+    'sold': ('sell', 'past'), 'fought': ('fight', 'past'), 'led': ('lead', 'past'),
+    'had': ('have', 'past'), 'has': ('have', 'third_person'), 'did': ('do', 'past'),
+    'done': ('do', 'past'), 'does': ('do', 'third_person'),
+    # Nouns
+    'children': ('child', 'plural'), 'men': ('man', 'plural'), 'women': ('woman', 'plural'),
+    'people': ('person', 'plural'), 'feet': ('foot', 'plural'), 'teeth': ('tooth', 'plural'),
+    'mice': ('mouse', 'plural'), 'geese': ('goose', 'plural'), 'oxen': ('ox', 'plural'),
+    'lives': ('life', 'plural'), 'wives': ('wife', 'plural'), 'knives': ('knife', 'plural'),
+    'leaves': ('leaf', 'plural'), 'wolves': ('wolf', 'plural'), 'halves': ('half', 'plural'),
+    # Adjectives
+    'better': ('good', 'comparative'), 'best': ('good', 'superlative'),
+    'worse': ('bad', 'comparative'), 'worst': ('bad', 'superlative'),
+    'more': ('many', 'comparative'), 'most': ('many', 'superlative'),
+}
+
+
+def _is_cvc(word: str) -> bool:
+    """Short consonant-vowel-consonant ending whose consonant doubles (run -> running)"""
+    return (2 <= len(word) <= 4 and word[-1] not in VOWELS and word[-1] not in 'wxy'
+            and word[-2] in VOWELS and (len(word) == 2 or word[-3] not in VOWELS))
+
+
+def _add_s(word: str) -> str:
+    if word.endswith(('s', 'x', 'z', 'ch', 'sh', 'o')):
+        return word + 'es'
+    if word.endswith('y') and len(word) > 1 and word[-2] not in VOWELS:
+        return word[:-1] + 'ies'
+    return word + 's'
+
+
+def _add_suffix(word: str, suffix: str) -> str:
+    """Attach a vowel-initial suffix (ed, ing, er, est) with English spelling rules"""
+    if suffix == 'ing':
+        if word.endswith('ie'):
+            return word[:-2] + 'ying'
+        if word.endswith('e') and not word.endswith(('ee', 'ye', 'oe')) and len(word) > 2:
+            return word[:-1] + 'ing'
+    else:
+        if word.endswith('e'):
+            return word + suffix[1:]
+        if word.endswith('y') and len(word) > 1 and word[-2] not in VOWELS:
+            return word[:-1] + 'i' + suffix
+    if _is_cvc(word):
+        return word + word[-1] + suffix
+    return word + suffix
+
+
+def inflect(lemma: str, pos: str) -> List[Tuple[str, str]]:
+    """
+    Regular inflections of a headword.
+
+    Returns:
+        List of (form, inflection) pairs
+    """
+    forms = []
+    if pos in INFLECTION_POS['plural']:
+        forms.append((_add_s(lemma), 'plural'))
+    if pos in INFLECTION_POS['past']:
+        forms.append((_add_s(lemma), 'third_person'))
+        forms.append((_add_suffix(lemma, 'ed'), 'past'))
+        forms.append((_add_suffix(lemma, 'ing'), 'gerund'))
+    if pos in INFLECTION_POS['comparative']:
+        forms.append((_add_suffix(lemma, 'er'), 'comparative'))
+        forms.append((_add_suffix(lemma, 'est'), 'superlative'))
+    return [(form, inflection) for form, inflection in forms if form != lemma]
+
+
+def candidate_lemmas(word: str) -> List[Tuple[str, str]]:
+    """
+    Possible headwords of an inflected form (inflect() in reverse), most
+    specific first. Candidates are not checked against any vocabulary.
+    """
+    candidates = []
+    irregular = IRREGULAR_FORMS.get(word)
+    if irregular:
+        candidates.append(irregular)
+
+    def stem_variants(stem: str) -> List[str]:
+        # "runn" -> "run", "hop" -> "hope", "tri" -> "try"
+        variants = [stem, stem + 'e']
+        if len(stem) > 2 and stem[-1] == stem[-2]:
+            variants.insert(0, stem[:-1])
+        if stem.endswith('i'):
+            variants.insert(0, stem[:-1] + 'y')
+        return variants
+
+    for suffix, inflection in [('ing', 'gerund'), ('ed', 'past'), ('est', 'superlative'), ('er', 'comparative')]:
+        if word.endswith(suffix) and len(word) > len(suffix) + 1:
+            stem = word[:-len(suffix)]
+            if suffix == 'ing' and stem.endswith('y'):
+                candidates.append((stem[:-1] + 'ie', inflection))
+            candidates.extend((lemma, inflection) for lemma in stem_variants(stem))
+
+    if word.endswith('ies') and len(word) > 4:
+        candidates.append((word[:-3] + 'y', 'plural'))
+        candidates.append((word[:-3] + 'y', 'third_person'))
+    if word.endswith('es') and len(word) > 3:
+        candidates.append((word[:-2], 'plural'))
+        candidates.append((word[:-2], 'third_person'))
+    if word.endswith('s') and not word.endswith('ss') and len(word) > 2:
+        candidates.append((word[:-1], 'plural'))
+        candidates.append((word[:-1], 'third_person'))
+    return candidates
+
+
+def _headword_pos(entry) -> str:
+    return entry.get('pos', '') if isinstance(entry, Mapping) else ''
+
+
+def build_inflection_index(lexicon: Mapping) -> Dict[str, Tuple[str, str]]:
+    """
+    Precompute form -> (lemma, inflection) for every single-word headword.
+    Forms that are headwords themselves are left out (the exact match wins);
+    when two headwords share a form, the first in dictionary order keeps it.
+    """
+    index: Dict[str, Tuple[str, str]] = {}
+    for lemma in lexicon:
+        if ' ' in lemma:
+            continue
+        for form, inflection in inflect(lemma, _headword_pos(lexicon.get(lemma))):
+            if form not in index and form not in lexicon:
+                index[form] = (lemma, inflection)
+
+    for form, (lemma, inflection) in IRREGULAR_FORMS.items():
+        if lemma in lexicon and form not in lexicon:
+            index[form] = (lemma, inflection)
+    return index
+
+
+class Lemmatizer:
+    """Resolves inflected forms to headwords of one language-pair dictionary"""
+
+    def __init__(self, lexicon: Mapping, index: Optional[Dict[str, Tuple[str, str]]] = None,
+                 cache_size: int = 65536):
+        """
+        Initialize lemmatizer.
+
+        Args:
+            lexicon: Headword -> entry mapping
+            index: Precomputed build_inflection_index(lexicon); without it,
+                suffix stripping is used and memoized
+            cache_size: Memoized words in stripping mode
+        """
+        self.lexicon = lexicon
+        self.index = index
+        if index is None:
+            self._strip = functools.lru_cache(maxsize=cache_size)(self._strip_uncached)
+
+    def lemmatize(self, word: str) -> Optional[Tuple[str, str]]:
+        """(lemma, inflection) for an inflected form, or None"""
+        if self.index is not None:
+            return self.index.get(word)
+        return self._strip(word)
+
+    def _strip_uncached(self, word: str) -> Optional[Tuple[str, str]]:
+        lexicon = self.lexicon
+        irregular = IRREGULAR_FORMS.get(word)
+        for lemma, inflection in candidate_lemmas(word):
+            entry = lexicon.get(lemma)
+            if entry is None:
+                continue
+            # A stem is accepted only if inflecting it gives the word back
+            # ("hoped" -> "hope", never "hop"), as in the precomputed index
+            if (lemma, inflection) == irregular or (word, inflection) in inflect(lemma, _headword_pos(entry)):
+                return lemma, inflection
+        return None
@@ -0,0 +1,123 @@
+"""
+PCM Module for Desi Translate
+The audioop operations the audio modules use, on any Python version.
+
+audioop (C, stdlib) is deprecated since Python 3.11 and removed in 3.13.
+While it is importable these functions call it (without the deprecation
+warning); otherwise they fall back to pure Python over the array module,
+with the same sample conventions: little-endian signed samples of 1, 2, 3
+or 4 bytes. The fallback is slower, which matters only for long files.
+"""
+
+import math
+import sys
+import warnings
+from array import array
+from typing import List, Optional, Tuple
+
+try:
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', DeprecationWarning)
+        import audioop
+except ImportError:  # Python 3.13+
+    audioop = None
+
+# array typecodes per sample width (3-byte samples are unpacked by hand)
+_TYPECODES = {1: 'b', 2: 'h', 4: 'i' if array('i').itemsize == 4 else 'l'}
+
+
+def _samples(fragment: bytes, width: int) -> List[int]:
+    if width == 3:
+        return [int.from_bytes(fragment[i:i + 3], 'little', signed=True)
+                for i in range(0, len(fragment) - 2, 3)]
+    samples = array(_TYPECODES[width])
+    samples.frombytes(fragment[:len(fragment) // width * width])
+    if sys.byteorder == 'big' and width > 1:
+        samples.byteswap()
+    return samples.tolist()
+
+
+def _pack(samples: List[int], width: int) -> bytes:
+    if width == 3:
+        return b''.join(int(s).to_bytes(3, 'little', signed=True) for s in samples)
+    packed = array(_TYPECODES[width], samples)
+    if sys.byteorder == 'big' and width > 1:
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _clip(value: float, width: int) -> int:
+    limit = 1 << (8 * width - 1)
+    return int(math.floor(max(-limit, min(limit - 1, value))))
+
+
+def rms(fragment: bytes, width: int) -> int:
+    """Root mean square of the samples (as audioop.rms: truncated to an int)"""
+    if audioop is not None:
+        return audioop.rms(fragment, width)
+    samples = _samples(fragment, width)
+    if not samples:
+        return 0
+    return int(math.sqrt(sum(s * s for s in samples) / len(samples)))
+
+
+def tomono(fragment: bytes, width: int, lfactor: float, rfactor: float) -> bytes:
+    """Stereo -> mono: left * lfactor + right * rfactor"""
+    if audioop is not None:
+        return audioop.tomono(fragment, width, lfactor, rfactor)
+    samples = _samples(fragment, width)
+    return _pack([_clip(left * lfactor + right * rfactor, width)
+                  for left, right in zip(samples[0::2], samples[1::2])], width)
+
+
+def mul(fragment: bytes, width: int, factor: float) -> bytes:
+    """Samples multiplied by factor, clipped to the sample range"""
+    if audioop is not None:
+        return audioop.mul(fragment, width, factor)
+    return _pack([_clip(s * factor, width) for s in _samples(fragment, width)], width)
+
+
+def bias(fragment: bytes, width: int, offset: int) -> bytes:
+    """offset added to every sample, wrapping around (8-bit signed <-> unsigned)"""
+    if audioop is not None:
+        return audioop.bias(fragment, width, offset)
+    modulus = 1 << (8 * width)
+    half = modulus >> 1
+    return _pack([(s + offset + half) % modulus - half for s in _samples(fragment, width)], width)
+
+
+def lin2lin(fragment: bytes, width: int, newwidth: int) -> bytes:
+    """Samples converted to another width (extra low-order bits are dropped)"""
+    if audioop is not None:
+        return audioop.lin2lin(fragment, width, newwidth)
+    if width == newwidth:
+        return fragment
+    shift = 8 * (newwidth - width)
+    if shift > 0:
+        return _pack([s << shift for s in _samples(fragment, width)], newwidth)
+    return _pack([s >> -shift for s in _samples(fragment, width)], newwidth)
+
+
+def ratecv(fragment: bytes, width: int, nchannels: int, inrate: int, outrate: int,
+           state: Optional[tuple]) -> Tuple[bytes, Optional[tuple]]:
+    """
+    Fragment resampled from inrate to outrate. The fallback interpolates
+    linearly and keeps no state, so convert a clip in one call.
+    """
+    if audioop is not None:
+        return audioop.ratecv(fragment, width, nchannels, inrate, outrate, state)
+    samples = _samples(fragment, width)
+    frames = len(samples) // nchannels
+    if not frames or inrate == outrate:
+        return fragment, None
+    step = inrate / outrate
+    resampled = []
+    for i in range(frames * outrate // inrate):
+        position = i * step
+        j = int(position)
+        t = position - j
+        k = min(j + 1, frames - 1)
+        for c in range(nchannels):
+            a, b = samples[j * nchannels + c], samples[k * nchannels + c]
+            resampled.append(_clip(a + (b - a) * t, width))
+    return _pack(resampled, width), None
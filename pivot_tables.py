@@ -0,0 +1,85 @@
+"""
+Pivot Tables Module for Desi Translate
+Precomputes direct dictionaries between non-English languages by pivoting
+through English.
+
+The reverse index of each en_X table (X word -> English headwords) is
+composed with every en_Y table into an X_Y table, once per rules snapshot,
+so translating Hindi to Telugu is a single lookup instead of two passes per
+request.
+"""
+
+from collections.abc import Mapping
+from typing import Dict, Optional
+
+from reverse_index import ReverseIndex, build_reverse_indexes
+
+PIVOT_LANGUAGE = 'en'
+
+
+def compose_pivot(source_index: ReverseIndex, target_lexicon: Mapping) -> Dict[str, Dict]:
+    """
+    Compose X -> en with en -> Y into an X_Y table.
+
+    For each X word the English headword giving the most confident Y
+    translation wins; confidence is the product of both legs.
+
+    Returns:
+        Mapping of X word -> entry in the dictionaries.json entry format,
+        with 'pivot' naming the English headword used
+    """
+    table = {}
+    for word, candidates in source_index.items():
+        best, best_confidence = None, -1.0
+        for headword, _, source_confidence in candidates:
+            target_entry = target_lexicon.get(headword)
+            if target_entry is None:
+                continue
+            confidence = source_confidence * target_entry.get('confidence', 0.8)
+            if confidence > best_confidence:
+                best, best_confidence = (headword, target_entry), confidence
+        if best is None:
+            continue
+
+        headword, target_entry = best
+        table[word] = {
+            'word': target_entry['word'],
+            'pos': target_entry.get('pos', 'noun'),
+            'meaning': target_entry.get('meaning', ''),
+            'rule': f"Pivot translation via English '{headword}'",
+            'confidence': round(best_confidence, 4),
+            'source': 'Pivot',
+            'pivot': headword
+        }
+    return table
+
+
+def build_pivot_tables(dictionaries: Mapping,
+                       reverse_indexes: Optional[Dict[str, ReverseIndex]] = None) -> Dict[str, Dict[str, Dict]]:
+    """
+    X_Y tables for every pair of languages that both have an en_* table.
+    Pairs already present in dictionaries are left to the curated table.
+
+    Args:
+        dictionaries: Pair name -> table (dictionaries.json layout)
+        reverse_indexes: Already built build_reverse_indexes(dictionaries)
+
+    Returns:
+        Mapping of pair name -> {word: entry}
+    """
+    if reverse_indexes is None:
+        reverse_indexes = build_reverse_indexes(dictionaries)
+    prefix = PIVOT_LANGUAGE + '_'
+
+    tables = {}
+    for source_pair, source_index in reverse_indexes.items():
+        source = source_pair[len(prefix):]
+        for target_pair in reverse_indexes:
+            target = target_pair[len(prefix):]
+            pair = f"{source}_{target}"
+            if source == target or pair in dictionaries:
+                continue
+            table = compose_pivot(source_index, dictionaries[target_pair])
+            if table:
+                tables[pair] = table
+    return tables
@@ -0,0 +1,302 @@
+"""
+Profiling Module for Desi Translate
+On-demand and slow-request profiling of single API requests.
+
+Two capture modes:
+- Explicit: a request carrying the admin header (X-Desi-Profile: <token>),
+  or every request when PROFILING_ENABLED is set, runs under cProfile and
+  its pstats file is always kept.
+- Slow request: when SLOW_REQUEST_THRESHOLD is set, every other request is
+  watched by a low-overhead sampling thread, and the collapsed stacks are
+  written only if the request turns out slower than the threshold.
+
+Profiles go to PROFILE_DIR, which is pruned oldest-first to stay within
+PROFILE_MAX_FILES / PROFILE_MAX_BYTES. Profile files are always named with
+a server-generated id; a client's X-Request-Id is only echoed back (and
+only if it is a plain token).
+"""
+
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import config
+
+PROFILE_HEADER = 'X-Desi-Profile'
+REQUEST_ID_HEADER = 'X-Request-Id'
+TOP_FUNCTIONS = 5
+
+# Client request ids echoed back in the response; anything else is replaced
+REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+
+class StackSampler(threading.Thread):
+    """Background thread that samples the stacks of watched threads"""
+
+    def __init__(self, interval: float = 0.005):
+        super().__init__(name='desi-stack-sampler', daemon=True)
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._watched: Dict[int, Counter] = {}
+
+    def watch(self, thread_id: int) -> Counter:
+        """Start sampling a thread; returns the Counter that collects its stacks"""
+        stacks = Counter()
+        with self._lock:
+            self._watched[thread_id] = stacks
+        return stacks
+
+    def unwatch(self, thread_id: int):
+        """Stop sampling a thread"""
+        with self._lock:
+            self._watched.pop(thread_id, None)
+
+    def run(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._watched:
+                    continue
+                watched = list(self._watched.items())
+
+            frames = sys._current_frames()
+            for thread_id, stacks in watched:
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    stacks[_collapse(frame)] += 1
+
+
+def _collapse(frame) -> str:
+    """Render a frame's stack root-first in collapsed-stack format"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class RequestProfile:
+    """Profiling state for one in-flight request"""
+
+    def __init__(self, request_id: str, mode: str):
+        self.request_id = request_id
+        self.file_id = uuid.uuid4().hex  # profile file name; never taken from the client
+        self.mode = mode  # 'cprofile' or 'sampling'
+        self.started = time.perf_counter()
+        self.thread_id = threading.get_ident()
+        self.profiler: Optional[cProfile.Profile] = None
+        self.stacks: Optional[Counter] = None
+
+
+class RequestProfiler:
+    """Decides which requests to profile and writes their profiles to disk"""
+
+    def __init__(self,
+                 profile_dir: str,
+                 admin_token: str = '',
+                 profile_all: bool = False,
+                 slow_threshold: float = 0.0,
+                 sample_interval: float = 0.005,
+                 max_files: int = 200,
+                 max_bytes: int = 50 * 1024 * 1024):
+        """
+        Initialize request profiler.
+
+        Args:
+            profile_dir: Directory where profiles are written
+            admin_token: Value of the X-Desi-Profile header that enables profiling
+            profile_all: Profile every request with cProfile
+            slow_threshold: Seconds above which sampled requests are kept (0 disables)
+            sample_interval: Seconds between stack samples in slow-request mode
+            max_files: Maximum number of profile files kept
+            max_bytes: Maximum total size of profile files kept
+        """
+        self.profile_dir = profile_dir
+        self.admin_token = admin_token
+        self.profile_all = profile_all
+        self.slow_threshold = slow_threshold
+        self.sample_interval = sample_interval
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self._sampler: Optional[StackSampler] = None
+        self._sampler_lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        """Whether any capture mode is configured"""
+        return bool(self.profile_all or self.admin_token or self.slow_threshold > 0)
+
+    def _is_admin_request(self, headers) -> bool:
+        token = headers.get(PROFILE_HEADER)
+        return bool(self.admin_token and token and hmac.compare_digest(token, self.admin_token))
+
+    def _get_sampler(self) -> StackSampler:
+        with self._sampler_lock:
+            if self._sampler is None:
+                self._sampler = StackSampler(self.sample_interval)
+                self._sampler.start()
+            return self._sampler
+
+    def start(self, headers) -> Optional[RequestProfile]:
+        """
+        Start profiling the current request if it qualifies.
+
+        Args:
+            headers: Incoming request headers
+
+        Returns:
+            RequestProfile to pass to finish(), or None
+        """
+        if not self.active:
+            return None
+
+        request_id = headers.get(REQUEST_ID_HEADER) or ''
+        if not REQUEST_ID_PATTERN.match(request_id):
+            request_id = uuid.uuid4().hex[:16]
+
+        if self.profile_all or self._is_admin_request(headers):
+            profile = RequestProfile(request_id, 'cprofile')
+            profile.profiler = cProfile.Profile()
+            try:
+                profile.profiler.enable()
+                return profile
+            except ValueError:
+                # Another profiler is already active in this process
+                pass
+
+        if self.slow_threshold > 0:
+            profile = RequestProfile(request_id, 'sampling')
+            profile.stacks = self._get_sampler().watch(profile.thread_id)
+            return profile
+
+        return None
+
+    def finish(self, profile: RequestProfile) -> Dict[str, str]:
+        """
+        Stop profiling and write the profile if it should be kept.
+
+        Args:
+            profile: Value returned by start()
+
+        Returns:
+            Response headers describing the profile (empty if discarded)
+        """
+        elapsed = time.perf_counter() - profile.started
+
+        if profile.mode == 'cprofile':
+            profile.profiler.disable()
+            path = self._profile_path(profile, '.pstats')
+            if not path or not self._write(path, lambda: profile.profiler.dump_stats(path)):
+                return {}
+            top = self._top_cprofile(profile.profiler)
+        else:
+            self._get_sampler().unwatch(profile.thread_id)
+            if elapsed < self.slow_threshold or not profile.stacks:
+                return {}
+            path = self._profile_path(profile, '.collapsed')
+            if not path or not self._write(path, lambda: self._dump_collapsed(profile.stacks, path)):
+                return {}
+            top = self._top_sampled(profile.stacks)
+
+        self._prune()
+
+        return {
+            REQUEST_ID_HEADER: profile.request_id,
+            'X-Profile-File': os.path.basename(path),
+            'X-Profile-Duration-Ms': f"{elapsed * 1000:.1f}",
+            'X-Profile-Top': '; '.join(top)
+        }
+
+    def abandon(self, profile: RequestProfile):
+        """Stop profiling without writing anything (request errored out)"""
+        if profile.mode == 'cprofile':
+            profile.profiler.disable()
+        else:
+            self._get_sampler().unwatch(profile.thread_id)
+
+    def _profile_path(self, profile: RequestProfile, suffix: str) -> Optional[str]:
+        """File a profile is written to, or None if it would land outside profile_dir"""
+        directory = os.path.realpath(self.profile_dir)
+        path = os.path.realpath(os.path.join(directory, f"{profile.file_id}{suffix}"))
+        if os.path.dirname(path) != directory:
+            print(f"Warning: Refusing to write profile outside {directory}: {path}")
+            return None
+        return path
+
+    def _write(self, path: str, dump) -> bool:
+        try:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            dump()
+            return True
+        except OSError as e:
+            print(f"Warning: Could not write profile {path}: {e}")
+            return False
+
+    @staticmethod
+    def _dump_collapsed(stacks: Counter, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+    @staticmethod
+    def _top_cprofile(profiler: cProfile.Profile) -> List[str]:
+        """Top functions by cumulative time, excluding the profiler itself"""
+        stats = pstats.Stats(profiler, stream=io.StringIO())
+        rows: List[Tuple[float, str]] = []
+        for (filename, line, name), (_, _, _, cumulative, _) in stats.stats.items():
+            if filename == '~' or 'profiling.py' in filename:
+                continue
+            rows.append((cumulative, f"{os.path.basename(filename)}:{name} {cumulative * 1000:.1f}ms"))
+        rows.sort(reverse=True)
+        return [label for _, label in rows[:TOP_FUNCTIONS]]
+
+    @staticmethod
+    def _top_sampled(stacks: Counter) -> List[str]:
+        """Top leaf functions by sample count"""
+        leaves = Counter()
+        for stack, count in stacks.items():
+            leaves[stack.rsplit(';', 1)[-1]] += count
+        total = sum(leaves.values())
+        return [f"{name} {count * 100 // total}%" for name, count in leaves.most_common(TOP_FUNCTIONS)]
+
+    def _prune(self):
+        """Delete the oldest profiles until within the file and byte limits"""
+        try:
+            entries = []
+            for name in os.listdir(self.profile_dir):
+                if name.endswith('.pstats') or name.endswith('.collapsed'):
+                    stat = os.stat(os.path.join(self.profile_dir, name))
+                    entries.append((stat.st_mtime, stat.st_size, name))
+        except OSError:
+            return
+
+        entries.sort()
+        total_bytes = sum(size for _, size, _ in entries)
+        while entries and (len(entries) > self.max_files or total_bytes > self.max_bytes):
+            _, size, name = entries.pop(0)
+            try:
+                os.remove(os.path.join(self.profile_dir, name))
+            except OSError:
+                pass
+            total_bytes -= size
+
+
+profiler = RequestProfiler(
+    profile_dir=config.PROFILE_DIR,
+    admin_token=config.PROFILE_ADMIN_TOKEN,
+    profile_all=config.PROFILING_ENABLED,
+    slow_threshold=config.SLOW_REQUEST_THRESHOLD,
+    sample_interval=config.PROFILE_SAMPLE_INTERVAL,
+    max_files=config.PROFILE_MAX_FILES,
+    max_bytes=config.PROFILE_MAX_BYTES
+)
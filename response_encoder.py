@@ -0,0 +1,193 @@
+"""
+Response Encoder Module for Desi Translate
+Fast JSON encoding and negotiated compression for API responses.
+
+The JSON backend is pluggable: orjson or ujson when installed, otherwise
+the stdlib json module. Every backend writes raw UTF-8 (no \\uXXXX escapes),
+which alone shrinks Devanagari/Telugu/Tamil payloads by roughly half.
+Responses above COMPRESSION_MIN_BYTES are compressed with brotli (when
+installed) or gzip, whichever the client accepts.
+"""
+
+import gzip
+import json
+from collections.abc import Mapping
+from typing import Callable, Dict, Optional, Tuple
+
+from flask.json.provider import DefaultJSONProvider
+
+import config
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Content types worth compressing
+COMPRESSIBLE_MIMETYPES = frozenset({'application/json', 'text/plain', 'text/html', 'text/vtt', 'application/x-subrip'})
+
+
+# ==================== JSON BACKENDS ====================
+
+def _stdlib_dumps(obj, default: Callable, sort_keys: bool) -> bytes:
+    return json.dumps(obj, default=default, sort_keys=sort_keys, ensure_ascii=False,
+                      separators=(',', ':')).encode('utf-8')
+
+
+def _orjson_dumps(obj, default: Callable, sort_keys: bool) -> bytes:
+    option = orjson.OPT_NON_STR_KEYS
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    return orjson.dumps(obj, default=default, option=option)
+
+
+def _ujson_dumps(obj, default: Callable, sort_keys: bool) -> bytes:
+    return ujson.dumps(obj, default=default, sort_keys=sort_keys, ensure_ascii=False,
+                       escape_forward_slashes=False).encode('utf-8')
+
+
+# name -> (dumps function, whether the library is importable)
+BACKENDS: Dict[str, Tuple[Callable, bool]] = {
+    'orjson': (_orjson_dumps, orjson is not None),
+    'ujson': (_ujson_dumps, ujson is not None),
+    'json': (_stdlib_dumps, True),
+}
+
+
+def resolve_backend(name: str = 'auto') -> Tuple[str, Callable]:
+    """
+    Pick a JSON backend.
+
+    Args:
+        name: 'auto' (fastest installed), 'orjson', 'ujson' or 'json'
+
+    Returns:
+        (backend name, dumps function)
+    """
+    if name != 'auto':
+        dumps, available = BACKENDS.get(name, (None, False))
+        if available:
+            return name, dumps
+        print(f"Warning: JSON backend '{name}' not available, falling back to auto")
+
+    for candidate in ['orjson', 'ujson', 'json']:
+        dumps, available = BACKENDS[candidate]
+        if available:
+            return candidate, dumps
+    return 'json', _stdlib_dumps
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that serializes with the configured fast backend.
+    Install with `app.json = FastJSONProvider(app)`; jsonify() then uses it.
+    """
+
+    ensure_ascii = False
+
+    def __init__(self, app, backend: str = 'auto'):
+        super().__init__(app)
+        self.backend, self._dumps = resolve_backend(backend)
+
+    def default(self, o):
+        # Read-only mappings (e.g. dictionary entry views) encode as objects
+        if isinstance(o, Mapping):
+            return dict(o)
+        return super().default(o)
+
+    def dumps_bytes(self, obj) -> bytes:
+        """Serialize to UTF-8 bytes, falling back to the stdlib on backend errors"""
+        try:
+            return self._dumps(obj, self.default, self.sort_keys)
+        except (TypeError, ValueError, OverflowError):
+            # e.g. integers beyond 64 bits under orjson
+            return _stdlib_dumps(obj, self.default, self.sort_keys)
+
+    def dumps(self, obj, **kwargs) -> str:
+        if kwargs:
+            kwargs.setdefault('default', self.default)
+            kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+            kwargs.setdefault('sort_keys', self.sort_keys)
+            return json.dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode('utf-8')
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if self.compact is False or (self.compact is None and self._app.debug):
+            # Pretty-printed output for debugging, as Flask does by default
+            return super().response(obj)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype=self.mimetype)
+
+
+# ==================== COMPRESSION ====================
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Choose a content encoding from an Accept-Encoding header.
+
+    Returns:
+        'br', 'gzip' or None
+    """
+    if not accept_encoding:
+        return None
+
+    accepted = {}
+    for part in accept_encoding.lower().split(','):
+        coding, _, params = part.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip()] = quality
+
+    for coding in (['br', 'gzip'] if brotli is not None else ['gzip']):
+        if accepted.get(coding, accepted.get('*', 0.0)) > 0:
+            return coding
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a body with the given content encoding"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=config.BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=config.GZIP_LEVEL)
+
+
+def compress_response(response, accept_encoding: Optional[str], min_bytes: int = None):
+    """
+    Compress a Flask response in place when it is large enough and the
+    client accepts a supported encoding. Streamed and already-encoded
+    responses are left alone.
+    """
+    min_bytes = config.COMPRESSION_MIN_BYTES if min_bytes is None else min_bytes
+    if (response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or not 200 <= response.status_code < 300):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    if len(body) < min_bytes:
+        return response
+
+    encoding = negotiate_encoding(accept_encoding)
+    if encoding is None:
+        return response
+
+    response.set_data(compress(body, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
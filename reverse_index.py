@@ -0,0 +1,104 @@
+"""
+Reverse Index Module for Desi Translate
+Inverted target -> source indexes over the en_X dictionaries.
+
+A ReverseIndex maps each translation (Hindi, Telugu, Tamil word) to the
+English headwords that produce it, so reverse lookups never scan dictionary
+values. Keys are Unicode NFC-normalized: the same Devanagari/Telugu/Tamil
+word typed with combining sequences or precomposed characters resolves to
+one entry. Indexes are built once per rules snapshot in one pass over the
+table.
+"""
+
+import unicodedata
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Tuple
+
+# (English headword, pos, confidence)
+Candidate = Tuple[str, str, float]
+
+
+def normalize_key(word: str) -> str:
+    """Lookup key for a word: NFC-normalized, lowercase, stripped"""
+    return unicodedata.normalize('NFC', word.strip().lower())
+
+
+class ReverseIndex(Mapping):
+    """Read-only translation -> [(headword, pos, confidence), ...] mapping"""
+
+    def __init__(self, lexicon: Mapping):
+        """
+        Invert a headword -> entry table.
+
+        Args:
+            lexicon: One en_X dictionary (dict, ColumnarLexicon or SQLiteLexicon)
+        """
+        index: Dict[str, List[Candidate]] = {}
+        for headword, entry in lexicon.items():
+            if not isinstance(entry, Mapping) or not entry.get('word'):
+                continue
+            candidate = (headword, entry.get('pos', 'noun'), entry.get('confidence', 0.8))
+            index.setdefault(normalize_key(entry['word']), []).append(candidate)
+
+        # Most confident first; dictionary order among equals (sort is stable)
+        self._index: Dict[str, Tuple[Candidate, ...]] = {
+            key: tuple(sorted(candidates, key=lambda c: -c[2])) if len(candidates) > 1 else (candidates[0],)
+            for key, candidates in index.items()
+        }
+
+    def lookup(self, word: str) -> Tuple[Candidate, ...]:
+        """Headwords translating to word, most confident first (empty if none)"""
+        return self._index.get(normalize_key(word), ())
+
+    def __getitem__(self, word: str) -> Tuple[Candidate, ...]:
+        return self._index[normalize_key(word)]
+
+    def __contains__(self, word) -> bool:
+        return isinstance(word, str) and normalize_key(word) in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def to_table(self, lexicon: Mapping, pair: str) -> Dict[str, Dict]:
+        """
+        X -> English dictionary (dictionaries.json entry format) using the
+        most confident headword of each translation.
+
+        Args:
+            lexicon: The en_X table this index was built from (for meanings)
+            pair: Its name, quoted in each entry's rule
+        """
+        table = {}
+        for key, candidates in self._index.items():
+            headword, pos, confidence = candidates[0]
+            table[key] = {
+                'word': headword,
+                'pos': pos,
+                'meaning': lexicon[headword].get('meaning', ''),
+                'rule': f"Reverse lookup in {pair}",
+                'confidence': confidence,
+                'source': 'Reverse index'
+            }
+        return table
+
+
+def build_reverse_indexes(dictionaries: Mapping) -> Dict[str, ReverseIndex]:
+    """ReverseIndex per en_X table, keyed by the table name"""
+    return {pair: ReverseIndex(lexicon) for pair, lexicon in dictionaries.items()
+            if pair.startswith('en_') and isinstance(lexicon, Mapping)}
+
+
+def build_reverse_tables(dictionaries: Mapping, reverse_indexes: Mapping) -> Dict[str, Dict[str, Dict]]:
+    """
+    X_en tables from en_X reverse indexes (en_hindi -> hindi_en). Pairs
+    already present in dictionaries are left to the curated table.
+    """
+    tables = {}
+    for pair, index in reverse_indexes.items():
+        reverse_pair = f"{pair[3:]}_en"
+        if reverse_pair not in dictionaries:
+            tables[reverse_pair] = index.to_table(dictionaries[pair], pair)
+    return tables
@@ -0,0 +1,170 @@
+"""
+Rules Snapshot Module for Desi Translate
+Compiles the translation rule files (dictionaries, grammar rules, idioms)
+once per process into an immutable snapshot.
+
+The snapshot is rebuilt only when one of its rule files changes on disk
+(checked at most once per RELOAD_CHECK_INTERVAL), so request handlers get
+ready-to-use, precomputed structures instead of re-reading JSON.
+"""
+
+import json
+import os
+import threading
+import time
+from collections.abc import Mapping
+from typing import Dict, Optional, Tuple
+
+import config
+from columnar_lexicon import ColumnarLexicon
+from lexicon_normalizer import TokenTrie, build_phrase_trie
+from morphology import Lemmatizer, build_inflection_index
+from pivot_tables import build_pivot_tables
+from reverse_index import ReverseIndex, build_reverse_indexes, build_reverse_tables
+from spelling import SpellingIndex, build_spelling_index
+
+RULES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rules')
+
+# Seconds between checks of the rule files' mtimes for changes
+RELOAD_CHECK_INTERVAL = 1.0
+
+# Rule file name -> fallback used when the comprehensive version is missing
+RULE_FILES = {
+    'dictionaries': ('dictionaries_comprehensive.json', 'dictionaries.json'),
+    'grammar_rules': ('grammar_rules_comprehensive.json', 'grammar_rules.json'),
+    'idioms': ('idioms_comprehensive.json', 'idioms.json'),
+}
+
+
+def rule_file_path(kind: str) -> str:
+    """Path of the rule file in use for kind (comprehensive version preferred)"""
+    preferred, fallback = RULE_FILES[kind]
+    path = os.path.join(RULES_DIR, preferred)
+    if not os.path.exists(path):
+        path = os.path.join(RULES_DIR, fallback)
+    return path
+
+
+def _load_json(path: str) -> Dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class RulesSnapshot:
+    """Immutable, compiled view of all translation rule files"""
+
+    def __init__(self, dictionaries: Dict, grammar_rules: Dict, idioms: Dict, layout: str = 'columnar'):
+        """
+        Compile a snapshot.
+
+        Args:
+            dictionaries: Parsed dictionaries JSON (pair -> {word: entry}, plus metadata)
+            grammar_rules: Parsed grammar rules JSON
+            idioms: Parsed idioms JSON
+            layout: 'columnar' to compile language pairs into ColumnarLexicon,
+                'dict' to keep the parsed dicts
+        """
+        self.grammar_rules = grammar_rules
+        self.idioms = idioms
+
+        # Translation -> English headwords indexes over the en_X tables power
+        # reverse lookups, the X_en tables and (composed) the X_Y pivot tables
+        self.reverse_indexes: Dict[str, ReverseIndex] = build_reverse_indexes(dictionaries)
+        derived = build_reverse_tables(dictionaries, self.reverse_indexes)
+        if config.PIVOT_TABLES_ENABLED:
+            derived.update(build_pivot_tables(dictionaries, self.reverse_indexes))
+        dictionaries = {**dictionaries, **derived}
+        self.dictionaries = {}
+        for key, value in dictionaries.items():
+            if layout == 'columnar' and key != 'metadata' and isinstance(value, dict):
+                value = ColumnarLexicon(value, hot_cache_size=config.DICTIONARY_HOT_CACHE_SIZE)
+            self.dictionaries[key] = value
+
+        # English-source pairs get a precomputed inflection -> lemma index;
+        # vocabularies above MORPHOLOGY_INDEX_MAX_LEMMAS use memoized stripping
+        self.lemmatizers: Dict[str, Lemmatizer] = {}
+        for key, lexicon in self.dictionaries.items():
+            if key.startswith('en_') and isinstance(lexicon, Mapping):
+                index = None
+                if len(lexicon) <= config.MORPHOLOGY_INDEX_MAX_LEMMAS:
+                    index = build_inflection_index(lexicon)
+                self.lemmatizers[key] = Lemmatizer(lexicon, index, cache_size=config.LEMMA_CACHE_SIZE)
+
+        # Multi-word headwords ("good morning") per pair, matched longest-first
+        # before word lookups
+        self.phrase_tries: Dict[str, TokenTrie] = {}
+        for key, lexicon in self.dictionaries.items():
+            if key != 'metadata' and isinstance(lexicon, Mapping):
+                trie = build_phrase_trie(lexicon)
+                if len(trie):
+                    self.phrase_tries[key] = trie
+
+        # Typo-correction indexes, built on first use (only spellcheck requests need them)
+        self._spelling: Dict[str, Optional[SpellingIndex]] = {}
+
+    def lemmatizer(self, pair: str) -> Optional[Lemmatizer]:
+        """Lemmatizer for an English-source language pair, or None"""
+        return self.lemmatizers.get(pair)
+
+    def phrase_trie(self, pair: str) -> Optional[TokenTrie]:
+        """Trie of a pair's multi-word headwords, or None if it has none"""
+        return self.phrase_tries.get(pair)
+
+    def reverse_index(self, pair: str) -> Optional[ReverseIndex]:
+        """Translation -> English headwords index of an en_X pair, or None"""
+        return self.reverse_indexes.get(pair)
+
+    def spelling_index(self, pair: str) -> Optional[SpellingIndex]:
+        """Typo-correction index over a language pair's headwords, or None"""
+        if pair not in self._spelling:
+            lexicon = self.dictionaries.get(pair)
+            index = None
+            if pair != 'metadata' and isinstance(lexicon, Mapping):
+                index = build_spelling_index(lexicon, config.SPELLING_INDEX_MAX_WORDS,
+                                             config.SPELLING_MAX_DISTANCE, name=pair)
+            self._spelling[pair] = index
+        return self._spelling[pair]
+
+    @classmethod
+    def from_files(cls, layout: str = 'columnar') -> 'RulesSnapshot':
+        """Read and compile the rule files from RULES_DIR"""
+        return cls(
+            _load_json(rule_file_path('dictionaries')),
+            _load_json(rule_file_path('grammar_rules')),
+            _load_json(rule_file_path('idioms')),
+            layout=layout
+        )
+
+
+# ==================== SNAPSHOT CACHE ====================
+
+# (mtimes of the rule files, monotonic time of last check, snapshot)
+_current: Optional[Tuple[Tuple[float, ...], float, RulesSnapshot]] = None
+_lock = threading.Lock()
+
+
+def _rule_mtimes() -> Tuple[float, ...]:
+    return tuple(os.path.getmtime(rule_file_path(kind)) for kind in RULE_FILES)
+
+
+def get_snapshot() -> RulesSnapshot:
+    """
+    Current compiled rules snapshot.
+    Built on first use; rebuilt only if a rule file's mtime has changed
+    (checked at most once per RELOAD_CHECK_INTERVAL).
+    """
+    global _current
+    now = time.monotonic()
+    current = _current
+    if current and now - current[1] < RELOAD_CHECK_INTERVAL:
+        return current[2]
+
+    mtimes = _rule_mtimes()
+    with _lock:
+        current = _current
+        if current and current[0] == mtimes:
+            _current = (mtimes, now, current[2])
+            return current[2]
+        snapshot = RulesSnapshot.from_files(layout=config.DICTIONARY_LAYOUT)
+        _current = (mtimes, now, snapshot)
+        return snapshot
@@ -0,0 +1,192 @@
+"""
+Spelling Module for Desi Translate
+Typo-tolerant lookup over a vocabulary (dictionary headwords, slang terms).
+
+SpellingIndex is a symmetric-delete (SymSpell) index: every vocabulary word
+is stored under all strings obtainable by deleting up to max_distance
+characters from its prefix. A misspelled word is resolved by generating its
+own deletes and verifying only the vocabulary words sharing one of them, so
+a lookup touches a handful of candidates instead of scanning the vocabulary.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Only the first PREFIX_LENGTH characters of a word are indexed (SymSpell's
+# prefix optimization); candidates are verified against the whole word
+PREFIX_LENGTH = 7
+
+# Words that are never treated as typos: correcting "the" to "thx" or "he"
+# to "hi" would corrupt far more text than it fixes
+FUNCTION_WORDS = frozenset({
+    'a', 'an', 'the', 'and', 'but', 'or', 'nor', 'yet', 'so', 'if', 'of', 'in', 'on', 'at',
+    'by', 'to', 'for', 'from', 'with', 'as', 'into', 'than', 'that', 'this', 'these', 'those',
+    'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them', 'my', 'your',
+    'his', 'its', 'our', 'their', 'is', 'are', 'was', 'were', 'be', 'been', 'am', 'do', 'does',
+    'did', 'will', 'shall', 'can', 'could', 'may', 'might', 'must', 'should', 'would', 'have',
+    'has', 'had', 'not', 'no', 'yes', 'what', 'who', 'when', 'where', 'why', 'how', 'which',
+})
+
+
+def max_distance_for(word: str, limit: int = 2) -> int:
+    """Edit distance worth correcting for a word of this length (0 for very short words)"""
+    if len(word) < 3:
+        return 0
+    if len(word) < 6:
+        return min(1, limit)
+    return limit
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance (insertions, deletions, substitutions
+    and adjacent transpositions cost 1).
+
+    Returns:
+        The distance, or max_distance + 1 as soon as it is known to exceed it
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if len(a) > len(b):
+        a, b = b, a
+    previous_previous: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        ca = a[i - 1]
+        for j in range(1, len(b) + 1):
+            cb = b[j - 1]
+            cost = 0 if ca == cb else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                value = min(value, previous_previous[j - 2] + 1)
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return min(previous[-1], max_distance + 1)
+
+
+def _deletes(word: str, max_distance: int) -> List[str]:
+    """word plus every string reachable by deleting up to max_distance characters"""
+    found = {word}
+    frontier = [word]
+    for _ in range(max_distance):
+        next_frontier = []
+        for candidate in frontier:
+            for i in range(len(candidate)):
+                deleted = candidate[:i] + candidate[i + 1:]
+                if deleted not in found:
+                    found.add(deleted)
+                    next_frontier.append(deleted)
+        frontier = next_frontier
+    return list(found)
+
+
+class SpellingIndex:
+    """Symmetric-delete index resolving misspellings to vocabulary words"""
+
+    def __init__(self, words: Iterable[str], max_distance: int = 2):
+        """
+        Build the index.
+
+        Args:
+            words: Vocabulary; earlier words win ties between equally close
+                corrections. Multi-word entries are skipped.
+            max_distance: Largest edit distance a lookup may correct
+        """
+        self.max_distance = max_distance
+        self.words: List[str] = []
+        self._ranks: Dict[str, int] = {}
+        # delete string -> ids of the words producing it
+        self._deletes: Dict[str, List[int]] = {}
+        for word in words:
+            if ' ' in word or not word or word in self._ranks:
+                continue
+            word_id = self._ranks[word] = len(self.words)
+            self.words.append(word)
+            for deleted in _deletes(word[:PREFIX_LENGTH], max_distance):
+                ids = self._deletes.get(deleted)
+                if ids is None:
+                    self._deletes[deleted] = [word_id]
+                else:
+                    ids.append(word_id)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._ranks
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def lookup(self, word: str, max_distance: Optional[int] = None) -> Optional[Tuple[str, int]]:
+        """
+        Closest vocabulary word within max_distance edits.
+
+        Args:
+            word: Lowercase token
+            max_distance: Defaults to max_distance_for(word), capped at the
+                index's max_distance
+
+        Returns:
+            (word, distance), distance 0 for vocabulary words; None when
+            nothing is close enough
+        """
+        if word in self._ranks:
+            return word, 0
+        if max_distance is None:
+            max_distance = max_distance_for(word, self.max_distance)
+        max_distance = min(max_distance, self.max_distance)
+        if max_distance <= 0:
+            return None
+
+        prefix = word[:PREFIX_LENGTH]
+        best_distance, best_id = max_distance + 1, -1
+        checked = set()
+        seen = {prefix}
+        queue = deque([prefix])
+        while queue:
+            candidate = queue.popleft()
+            deleted_count = len(prefix) - len(candidate)
+            # Candidates come out shortest-deletion first; none further out can do better
+            if deleted_count > best_distance:
+                break
+
+            for word_id in self._deletes.get(candidate, ()):
+                if word_id in checked:
+                    continue
+                checked.add(word_id)
+                distance = edit_distance(word, self.words[word_id], max_distance)
+                if distance < best_distance or (distance == best_distance and word_id < best_id):
+                    best_distance, best_id = distance, word_id
+
+            if deleted_count < max_distance:
+                for i in range(len(candidate)):
+                    deleted = candidate[:i] + candidate[i + 1:]
+                    if deleted not in seen:
+                        seen.add(deleted)
+                        queue.append(deleted)
+
+        if best_id < 0 or best_distance > max_distance:
+            return None
+        return self.words[best_id], best_distance
+
+    def correct(self, word: str) -> Optional[Tuple[str, int]]:
+        """lookup() for tokens worth correcting: None for vocabulary and function words"""
+        if word in self._ranks or word in FUNCTION_WORDS or not word.isalpha():
+            return None
+        return self.lookup(word)
+
+
+def build_spelling_index(vocabulary, max_words: int, max_distance: int = 2, name: str = 'vocabulary') -> Optional[SpellingIndex]:
+    """
+    SpellingIndex over a vocabulary's words, or None (with a warning) when
+    it holds more than max_words: the delete table takes roughly thirty
+    entries per word.
+    """
+    if len(vocabulary) > max_words:
+        print(f"Warning: {name} has {len(vocabulary)} words (limit {max_words}); spelling correction disabled for it")
+        return None
+    return SpellingIndex(vocabulary, max_distance)
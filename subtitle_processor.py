@@ -294,7 +294,8 @@ class SubtitleProcessor:
                          translate_func,
                          source_lang: str = 'en',
                          target_lang: str = 'hindi',
-                         batch_size: int = 10) -> List[SubtitleEntry]:
+                         batch_size: int = 10,
+                         progress=None) -> List[SubtitleEntry]:
         """
         Translate subtitle entries in batches.
         
@@ -304,6 +305,7 @@ class SubtitleProcessor:
             source_lang: Source language code
             target_lang: Target language code
             batch_size: Number of entries to translate at once
+            progress: Optional callback called as progress(entries done, total)
         
         Returns:
             Updated entries with translations
@@ -329,6 +331,9 @@ class SubtitleProcessor:
                 print(f"Error translating entry {entry.index}: {e}")
                 entry.translated_text = entry.text  # Keep original on error
                 entry.translation_confidence = 0.0
+            
+            if progress is not None:
+                progress(i + 1, len(entries))
         
         return entries
     
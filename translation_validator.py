@@ -11,32 +11,100 @@ logging.basicConfig(level=logging.WARNING)
 logger = logging.getLogger(__name__)
 
 
+# Output schema, compiled once at import time
+REQUIRED_FIELDS = {
+    'translated_text': '',
+    'confidence': 0,
+    'explanations': [],
+    'word_mappings': [],
+    'source_language': 'unknown',
+    'target_language': 'unknown',
+    'error': None,
+    'warnings': []
+}
+REQUIRED_KEYS = frozenset(REQUIRED_FIELDS)
+# Fields that lean responses (detail=none / fields=...) may leave out
+OPTIONAL_DETAIL_FIELDS = frozenset({'explanations', 'word_mappings'})
+LEAN_REQUIRED_KEYS = REQUIRED_KEYS - OPTIONAL_DETAIL_FIELDS
+# Defaults are copied on use so results never share a mutable list
+_MUTABLE_DEFAULTS = frozenset(k for k, v in REQUIRED_FIELDS.items() if isinstance(v, list))
+
+EXPLANATION_DEFAULTS = {
+    'original': '?',
+    'translated': '?',
+    'pos': 'unknown',
+    'confidence': 0.5,
+    'rule': 'unknown rule',
+    'meaning': ''
+}
+EXPLANATION_KEYS = frozenset(EXPLANATION_DEFAULTS)
+
+
 class TranslationValidator:
     """Validates and ensures robust translation output"""
     
     @staticmethod
-    def validate_translation_output(result: Dict) -> Dict:
+    def conforms(result: Dict, check_explanations: bool = True) -> bool:
+        """
+        Single pass check that a result already satisfies the output schema.
+        When it does, validate_translation_output has nothing to repair.
+        With check_explanations=False, explanations and word_mappings may
+        be absent (lean responses).
+        """
+        if not (REQUIRED_KEYS if check_explanations else LEAN_REQUIRED_KEYS) <= result.keys():
+            return False
+        
+        text = result['translated_text']
+        if not text or not isinstance(text, str):
+            return False
+        
+        conf = result['confidence']
+        if type(conf) not in (int, float) or not (0 <= conf <= 100):
+            return False
+        
+        if type(result['warnings']) is not list:
+            return False
+        if not check_explanations:
+            return True
+        
+        explanations = result['explanations']
+        if type(explanations) is not list:
+            return False
+        
+        for exp in explanations:
+            if type(exp) is not dict or not EXPLANATION_KEYS <= exp.keys():
+                return False
+        
+        # A text of n characters holds at most (n + 1) // 2 words, so the
+        # word count only needs computing for short explanation lists
+        if len(explanations) < (len(text) + 1) // 2 and len(explanations) < len(text.split()):
+            return False
+        
+        return True
+    
+    @staticmethod
+    def validate_translation_output(result: Dict, check_explanations: bool = True) -> Dict:
         """
         Validates translation result and fills missing fields
         Ensures output always has required fields
         """
+        if TranslationValidator.conforms(result, check_explanations):
+            return result
+        return TranslationValidator.repair_translation_output(result, check_explanations)
+    
+    @staticmethod
+    def repair_translation_output(result: Dict, check_explanations: bool = True) -> Dict:
+        """
+        Fills missing fields and fixes invalid values.
+        Slow path of validate_translation_output.
+        """
         try:
             # Ensure all required fields exist
-            required_fields = {
-                'translated_text': '',
-                'confidence': 0,
-                'explanations': [],
-                'word_mappings': [],
-                'source_language': 'unknown',
-                'target_language': 'unknown',
-                'error': None,
-                'warnings': []
-            }
-            
-            # Merge with actual result
-            for field, default in required_fields.items():
+            for field, default in REQUIRED_FIELDS.items():
+                if not check_explanations and field in OPTIONAL_DETAIL_FIELDS:
+                    continue
                 if field not in result:
-                    result[field] = default
+                    result[field] = list(default) if field in _MUTABLE_DEFAULTS else default
             
             # Validate translated_text is not empty
             if not result.get('translated_text'):
@@ -54,6 +122,9 @@ class TranslationValidator:
                 result['confidence'] = 0
                 result['warnings'].append('Invalid confidence value - set to 0')
             
+            if not check_explanations:
+                return result
+            
             # Validate explanations list
             if not isinstance(result['explanations'], list):
                 result['explanations'] = []
@@ -63,26 +134,26 @@ class TranslationValidator:
             for exp in result['explanations']:
                 if not isinstance(exp, dict):
                     continue
-                exp.setdefault('original', '?')
-                exp.setdefault('translated', '?')
-                exp.setdefault('pos', 'unknown')
-                exp.setdefault('confidence', 0.5)
-                exp.setdefault('rule', 'unknown rule')
-                exp.setdefault('meaning', '')
+                if not EXPLANATION_KEYS <= exp.keys():
+                    for key, default in EXPLANATION_DEFAULTS.items():
+                        exp.setdefault(key, default)
             
             # Ensure at least one explanation per word
             words_in_text = result['translated_text'].split()
-            if len(result['explanations']) < len(words_in_text):
+            explanations = result['explanations']
+            if len(explanations) < len(words_in_text):
                 # Add placeholder explanations for missing words
-                while len(result['explanations']) < len(words_in_text):
-                    result['explanations'].append({
+                explanations.extend(
+                    {
                         'original': '?',
-                        'translated': words_in_text[len(result['explanations'])],
+                        'translated': word,
                         'pos': 'unknown',
                         'confidence': 0.3,
                         'rule': 'No explanation available',
                         'meaning': ''
-                    })
+                    }
+                    for word in words_in_text[len(explanations):]
+                )
                 result['warnings'].append('Added placeholder explanations for missing entries')
             
             return result
@@ -0,0 +1,194 @@
+"""
+TTS Cache Module for Desi Translate
+Content-addressed disk cache for synthesized speech.
+
+Each rendering is stored once under the hash of everything that changes
+the audio (text, language, rate, volume, voice, format). Files are
+rendered to a temporary name and renamed into place, so readers (other
+threads or gunicorn workers sharing the directory) never see a partial
+file. An in-memory index keeps entries in least-recently-used order; once
+the directory grows past its size cap the oldest entries are deleted.
+Hits bump the file's mtime, so the order survives restarts.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+# Temporary files older than this are left over from a crashed render
+STALE_TEMP_SECONDS = 3600
+
+
+def cache_key(text: str, language: str, rate: Optional[int] = None, volume: Optional[float] = None,
+              voice: Optional[str] = None, ext: str = 'wav') -> str:
+    """File name (hash + extension) of one rendering"""
+    payload = json.dumps([text, language, rate, volume, voice], ensure_ascii=False)
+    return f"{hashlib.sha256(payload.encode('utf-8')).hexdigest()}.{ext}"
+
+
+class TTSCache:
+    """Size-capped LRU cache of audio files in one directory"""
+
+    def __init__(self, directory: str, max_bytes: int = 512 * 1024 * 1024):
+        """
+        Initialize cache (creates the directory and indexes existing files).
+
+        Args:
+            directory: Cache directory (may be shared by several processes)
+            max_bytes: Size cap; least recently used files are deleted beyond it
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.total_bytes = 0
+        self._index: 'OrderedDict[str, int]' = OrderedDict()  # key -> size, oldest first
+        self._lock = threading.Lock()
+        self._rendering: Dict[str, threading.Event] = {}  # keys being rendered by a thread of this process
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        now = time.time()
+        entries = []
+        with os.scandir(self.directory) as files:
+            for entry in files:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+                if entry.name.startswith('.'):
+                    if now - stat.st_mtime > STALE_TEMP_SECONDS:
+                        self._remove(entry.name)
+                    continue
+                entries.append((stat.st_mtime, entry.name, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self.total_bytes += size
+        with self._lock:
+            self._evict()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def _remove(self, key: str):
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        """Delete least recently used entries until under the size cap (caller holds _lock)"""
+        while self.total_bytes > self.max_bytes and len(self._index) > 1:
+            key, size = self._index.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+            self._remove(key)
+
+    def get(self, key: str) -> Optional[str]:
+        """Path of a cached file (marked as recently used), or None on a miss"""
+        path = self.path(key)
+        with self._lock:
+            known = key in self._index
+        try:
+            # Another worker may have rendered it, or evicted it
+            os.utime(path)
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            with self._lock:
+                if known:
+                    self.total_bytes -= self._index.pop(key, 0)
+                self.misses += 1
+            return None
+        with self._lock:
+            if key in self._index:
+                self._index.move_to_end(key)
+            else:
+                self._index[key] = size
+                self.total_bytes += size
+                self._evict()
+            self.hits += 1
+        return path
+
+    def put(self, key: str, render: Callable[[str], None]) -> Optional[str]:
+        """
+        Render a file into the cache atomically. If another thread is
+        already rendering the same key, wait for its file instead.
+
+        Args:
+            key: cache_key() of the rendering
+            render: Writes the audio to the path it is given
+
+        Returns:
+            Path of the cached file, or None if render produced nothing
+        """
+        with self._lock:
+            pending = self._rendering.get(key)
+            if pending is None:
+                self._rendering[key] = threading.Event()
+        if pending is not None:
+            pending.wait()
+            return self.path(key) if os.path.exists(self.path(key)) else None
+        try:
+            return self._render(key, render)
+        finally:
+            with self._lock:
+                self._rendering.pop(key).set()
+
+    def _render(self, key: str, render: Callable[[str], None]) -> Optional[str]:
+        ext = os.path.splitext(key)[1]
+        fd, temp_path = tempfile.mkstemp(prefix='.render-', suffix=ext, dir=self.directory)
+        os.close(fd)
+        try:
+            render(temp_path)
+            size = os.path.getsize(temp_path) if os.path.exists(temp_path) else 0
+            if not size:
+                return None
+            os.replace(temp_path, self.path(key))
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        with self._lock:
+            self.total_bytes += size - self._index.pop(key, 0)
+            self._index[key] = size
+            self._evict()
+        return self.path(key)
+
+    def get_or_render(self, key: str, render: Callable[[str], None]) -> Optional[str]:
+        """Cached path for key, rendering it first on a miss"""
+        return self.get(key) or self.put(key, render)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict:
+        return {
+            'entries': len(self._index),
+            'bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hit_rate, 4),
+            'evictions': self.evictions
+        }
+
+
+_caches: Dict[str, TTSCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_tts_cache(directory: str, max_bytes: int = 512 * 1024 * 1024) -> TTSCache:
+    """Process-wide TTSCache for a directory"""
+    with _caches_lock:
+        cache = _caches.get(directory)
+        if cache is None:
+            cache = _caches[directory] = TTSCache(directory, max_bytes)
+        return cache
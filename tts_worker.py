@@ -0,0 +1,268 @@
+"""
+TTS Worker Module for Desi Translate
+Text-to-speech through engine-owning worker threads.
+
+pyttsx3 engines are not thread-safe, so no caller touches one directly:
+utterances go into a bounded queue and each worker thread is the only user
+of its engine. A worker takes what is waiting (up to a batch), groups
+consecutive utterances with the same voice settings, sets the properties
+once per group and renders the whole group with one runAndWait call.
+Callers get a Future; when the queue is full, submit waits up to a timeout
+and then raises TTSQueueFull instead of piling up work. Anything else that
+needs the engine (listing voices, stopping it) also runs on the worker
+thread through call().
+
+pyttsx3.init() returns one cached engine per driver, so a process must
+not run two workers over it: get_tts_worker() gives the process-wide one.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import metrics
+
+
+class TTSQueueFull(Exception):
+    """The TTS queue stayed full for the whole submit timeout"""
+
+
+class VoiceSettings(NamedTuple):
+    """Engine properties of an utterance (None keeps the engine's current value)"""
+    rate: Optional[int] = None
+    volume: Optional[float] = None
+    voice: Optional[str] = None
+
+
+class Utterance(NamedTuple):
+    text: str
+    settings: VoiceSettings
+    output_path: Optional[str]  # None: speak aloud
+    future: Future
+    submitted_at: float
+
+
+class EngineCall(NamedTuple):
+    """A function run with the engine on the worker thread"""
+    function: Callable[[object], object]
+    future: Future
+
+
+_STOP = object()
+
+
+class TTSWorker:
+    """Bounded queue of utterances served by engine-owning threads"""
+
+    def __init__(self, engine_factory: Callable[[], object], workers: int = 1, max_queue: int = 64,
+                 batch_size: int = 16, submit_timeout: float = 5.0):
+        """
+        Initialize and start the worker threads.
+
+        Args:
+            engine_factory: Returns the engine a worker owns (called once per
+                worker, on its thread). Use more than one worker only with
+                engines that are independent of each other.
+            workers: Worker threads
+            max_queue: Utterances waiting at most; submit blocks beyond this
+            batch_size: Utterances rendered per runAndWait at most
+            submit_timeout: Seconds submit waits for room before raising
+                TTSQueueFull
+        """
+        self.batch_size = max(1, batch_size)
+        self.submit_timeout = submit_timeout
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.batches = 0
+        self.closed = False
+        self._queue: 'queue.Queue' = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        for i in range(max(1, workers)):
+            thread = threading.Thread(target=self._run, args=(engine_factory,), name=f'desi-tts-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, text: str, settings: Optional[VoiceSettings] = None, output_path: Optional[str] = None,
+               timeout: Optional[float] = None) -> Future:
+        """
+        Queue an utterance.
+
+        Args:
+            text: Text to synthesize
+            settings: Voice settings to render it with
+            output_path: Save the audio to this file instead of speaking it
+            timeout: Seconds to wait for room in the queue (default
+                submit_timeout; 0 fails at once)
+
+        Returns:
+            Future resolving to output_path (or None for speech) once rendered
+
+        Raises:
+            TTSQueueFull: The queue had no room within the timeout
+        """
+        future: Future = Future()
+        utterance = Utterance(text, settings or VoiceSettings(), output_path, future, time.perf_counter())
+        wait = self.submit_timeout if timeout is None else timeout
+        try:
+            self._queue.put(utterance, block=wait > 0, timeout=wait if wait > 0 else None)
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+            raise TTSQueueFull(f"TTS queue full ({self._queue.maxsize} utterances waiting)")
+        with self._lock:
+            self.submitted += 1
+        return future
+
+    def call(self, function: Callable[[object], object]) -> Future:
+        """
+        Run function(engine) on the worker thread, after the utterances
+        already queued (e.g. engine.getProperty('voices')).
+
+        Returns:
+            Future resolving to the function's result; it fails if the
+            engine could not be initialized
+        """
+        future: Future = Future()
+        self._queue.put(EngineCall(function, future))
+        return future
+
+    def _take_batch(self) -> List:
+        """Block for one utterance, then take whatever else is already waiting"""
+        batch = [self._queue.get()]
+        while len(batch) < self.batch_size and batch[-1] is not _STOP:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self, engine_factory: Callable[[], object]):
+        try:
+            engine = engine_factory()
+        except Exception as e:
+            print(f"Warning: Could not initialize text-to-speech worker: {e}")
+            engine = None
+
+        while True:
+            batch = self._take_batch()
+            stop = batch[-1] is _STOP
+            # Consecutive utterances with the same settings share one runAndWait; order is kept
+            groups: List = []
+            for item in batch:
+                if item is _STOP:
+                    continue
+                if isinstance(item, EngineCall):
+                    groups.append(item)
+                elif groups and isinstance(groups[-1], list) and groups[-1][0].settings == item.settings:
+                    groups[-1].append(item)
+                else:
+                    groups.append([item])
+            for group in groups:
+                if isinstance(group, EngineCall):
+                    self._call(engine, group)
+                else:
+                    self._render(engine, group)
+            if stop:
+                if engine is not None and hasattr(engine, 'stop'):
+                    try:
+                        engine.stop()
+                    except Exception as e:
+                        print(f"Warning: Could not stop text-to-speech engine: {e}")
+                return
+
+    @staticmethod
+    def _call(engine, call: EngineCall):
+        if not call.future.set_running_or_notify_cancel():
+            return
+        try:
+            if engine is None:
+                raise RuntimeError("Text-to-speech engine not available")
+            call.future.set_result(call.function(engine))
+        except Exception as e:
+            call.future.set_exception(e)
+
+    def _render(self, engine, group: List[Utterance]):
+        started = time.perf_counter()
+        live = [u for u in group if u.future.set_running_or_notify_cancel()]
+        if not live:
+            return
+        for utterance in live:
+            metrics.record_stage('tts_queue_wait', started - utterance.submitted_at)
+        try:
+            if engine is None:
+                raise RuntimeError("Text-to-speech engine not available")
+            for name, value in live[0].settings._asdict().items():
+                if value is not None:
+                    engine.setProperty(name, value)
+            for utterance in live:
+                if utterance.output_path:
+                    engine.save_to_file(utterance.text, utterance.output_path)
+                else:
+                    engine.say(utterance.text)
+            engine.runAndWait()
+        except Exception as e:
+            with self._lock:
+                self.failed += len(live)
+            for utterance in live:
+                utterance.future.set_exception(e)
+            return
+        metrics.record_stage('tts_synthesis', time.perf_counter() - started)
+        with self._lock:
+            self.completed += len(live)
+            self.batches += 1
+        for utterance in live:
+            utterance.future.set_result(utterance.output_path)
+
+    def depth(self) -> int:
+        """Utterances waiting to be rendered"""
+        return self._queue.qsize()
+
+    def stats(self) -> Dict:
+        return {
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'rejected': self.rejected,
+            'batches': self.batches,
+            'queued': self.depth()
+        }
+
+    def close(self, timeout: Optional[float] = None):
+        """Finish the queued utterances and stop the workers (each stops its engine on its own thread)"""
+        self.closed = True
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join(timeout)
+
+
+_worker: Optional[TTSWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_tts_worker(engine_factory: Callable[[], object], max_queue: int = 64, batch_size: int = 16,
+                   submit_timeout: float = 5.0) -> TTSWorker:
+    """
+    Process-wide single-thread TTSWorker. engine_factory (e.g. pyttsx3.init)
+    is called on the worker thread when the worker is first created.
+    """
+    global _worker
+    with _worker_lock:
+        if _worker is None or _worker.closed:
+            _worker = TTSWorker(engine_factory, max_queue=max_queue, batch_size=batch_size,
+                                submit_timeout=submit_timeout)
+        return _worker
+
+
+def close_tts_worker(timeout: Optional[float] = None):
+    """Finish the queued utterances and stop the process-wide worker and its engine"""
+    global _worker
+    with _worker_lock:
+        worker, _worker = _worker, None
+    if worker is not None:
+        worker.close(timeout)
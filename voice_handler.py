@@ -5,24 +5,53 @@ Handles speech-to-text and text-to-speech using SpeechRecognition and pyttsx3.
 
 import pyttsx3
 import speech_recognition as sr
-from typing import Optional, Tuple, List
+from concurrent.futures import Future
+from typing import Optional, Tuple, List, Dict
 import os
-import threading
+import shutil
+
+import wave
+
+import audio_levels
+import config
+import metrics
+from dubbing import render_dubbing_track
+from long_audio import GoogleBackend, recognize_long_audio
+from tts_cache import TTSCache, cache_key, get_tts_cache
+from tts_worker import VoiceSettings, get_tts_worker
 
 
 class VoiceHandler:
     """Handles voice input/output for translation"""
     
-    def __init__(self):
-        """Initialize voice handler with pyttsx3 engine"""
+    def __init__(self, tts_cache: Optional[TTSCache] = None):
+        """
+        Initialize voice handler with pyttsx3 engine.
+        
+        The engine is created and owned by the process-wide TTS worker
+        thread; every utterance and property read goes through its queue
+        (see tts_worker.py).
+        
+        Args:
+            tts_cache: Cache for synthesized audio files (default: the
+                process-wide cache in TTS_CACHE_DIR, if enabled)
+        """
+        if tts_cache is None and config.TTS_CACHE_ENABLED:
+            tts_cache = get_tts_cache(config.TTS_CACHE_DIR, config.TTS_CACHE_MAX_BYTES)
+        self.tts_cache = tts_cache
+        self.tts_worker = None
+        # Default properties: rate in words per minute, volume 0-1
+        self.voice_settings = VoiceSettings(rate=150, volume=0.9)
+        self.voices = []
+        
         try:
-            self.tts_engine = pyttsx3.init()
-            # Set default properties
-            self.tts_engine.setProperty('rate', 150)  # Words per minute
-            self.tts_engine.setProperty('volume', 0.9)  # Volume 0-1
+            worker = get_tts_worker(pyttsx3.init, max_queue=config.TTS_QUEUE_SIZE,
+                                    batch_size=config.TTS_BATCH_SIZE,
+                                    submit_timeout=config.TTS_SUBMIT_TIMEOUT)
+            self.voices = list(worker.call(lambda engine: engine.getProperty('voices')).result() or [])
+            self.tts_worker = worker
         except Exception as e:
             print(f"Warning: Could not initialize text-to-speech: {e}")
-            self.tts_engine = None
         
         try:
             self.recognizer = sr.Recognizer()
@@ -57,9 +86,8 @@ class VoiceHandler:
             rate: Speech rate in words per minute (50-300)
             volume: Volume level (0.0-1.0)
         """
-        if self.tts_engine:
-            self.tts_engine.setProperty('rate', max(50, min(300, rate)))
-            self.tts_engine.setProperty('volume', max(0.0, min(1.0, volume)))
+        self.voice_settings = self.voice_settings._replace(rate=max(50, min(300, rate)),
+                                                           volume=max(0.0, min(1.0, volume)))
     
     def set_voice_gender(self, gender: str = 'female'):
         """
@@ -68,14 +96,13 @@ class VoiceHandler:
         Args:
             gender: 'male', 'female', or 'neutral'
         """
-        if not self.tts_engine:
+        if not self.tts_worker:
             return
         
         try:
-            voices = self.tts_engine.getProperty('voices')
-            for i, voice in enumerate(voices):
+            for voice in self.voices:
                 if gender.lower() in voice.name.lower():
-                    self.tts_engine.setProperty('voice', voice.id)
+                    self.voice_settings = self.voice_settings._replace(voice=voice.id)
                     return
         except Exception as e:
             print(f"Warning: Could not set voice gender: {e}")
@@ -97,7 +124,7 @@ class VoiceHandler:
         Returns:
             True if successful, False otherwise
         """
-        if not self.tts_engine:
+        if not self.tts_worker:
             print("Text-to-speech engine not available")
             return False
         
@@ -106,12 +133,12 @@ class VoiceHandler:
             lang_code = self.LANGUAGE_CODES.get(language.lower(), 'en')
             
             if save_to_file:
-                self.tts_engine.save_to_file(text, save_to_file)
+                self.save_audio_file(text, save_to_file, language)
             
-            self.tts_engine.say(text)
+            future = self.tts_worker.submit(text, self.voice_settings)
             
             if block:
-                self.tts_engine.runAndWait()
+                future.result()
             
             return True
         
@@ -122,7 +149,7 @@ class VoiceHandler:
     def text_to_speech_async(self,
                            text: str,
                            language: str = 'english',
-                           callback: Optional[callable] = None):
+                           callback: Optional[callable] = None) -> Optional[Future]:
         """
         Convert text to speech asynchronously.
         
@@ -130,14 +157,19 @@ class VoiceHandler:
             text: Text to convert
             language: Target language code
             callback: Function to call when done
+        
+        Returns:
+            Future of the utterance (TTSQueueFull is raised when the queue
+            stays full), or None if text-to-speech is not available
         """
-        def speak_thread():
-            self.text_to_speech(text, language, block=True)
-            if callback:
-                callback()
+        if not self.tts_worker:
+            print("Text-to-speech engine not available")
+            return None
         
-        thread = threading.Thread(target=speak_thread, daemon=True)
-        thread.start()
+        future = self.tts_worker.submit(text, self.voice_settings)
+        if callback:
+            future.add_done_callback(lambda _: callback())
+        return future
     
     def speech_to_text(self,
                       duration: int = 5,
@@ -236,7 +268,7 @@ class VoiceHandler:
         Returns:
             True if successful, False otherwise
         """
-        if not self.tts_engine:
+        if not self.tts_worker:
             return False
         
         try:
@@ -245,16 +277,86 @@ class VoiceHandler:
             
             if ext not in ['wav', 'mp3', 'flac']:
                 output_path = output_path + '.wav'
+                ext = 'wav'
             
-            self.tts_engine.save_to_file(text, output_path)
-            self.tts_engine.runAndWait()
+            if not self.tts_cache:
+                self._render(text, output_path)
+                return True
             
+            cached_path = self.cached_audio(text, language, ext)
+            if not cached_path:
+                return False
+            shutil.copyfile(cached_path, output_path)
             return True
         
         except Exception as e:
             print(f"Error saving audio file: {e}")
             return False
     
+    def _voice_settings(self) -> Dict:
+        """Engine properties that change the synthesized audio"""
+        settings = self.voice_settings
+        return {
+            'rate': settings.rate,
+            'volume': round(float(settings.volume), 3) if settings.volume is not None else None,
+            'voice': settings.voice
+        }
+    
+    def _render(self, text: str, output_path: str):
+        """Synthesize text into a file through the TTS worker"""
+        self.tts_worker.submit(text, self.voice_settings, output_path).result()
+    
+    def cached_audio(self, text: str, language: str = 'english', ext: str = 'wav') -> Optional[str]:
+        """
+        Path of the cached rendering of text with the current voice
+        settings, synthesizing it on a miss.
+        
+        Returns:
+            Path inside the cache (do not modify), or None if synthesis failed
+        """
+        if not self.tts_worker or not self.tts_cache:
+            return None
+        
+        lang_code = self.LANGUAGE_CODES.get(language.lower(), 'en')
+        key = cache_key(text, lang_code, ext=ext, **self._voice_settings())
+        path = self.tts_cache.get(key)
+        if path:
+            metrics.record_cache('tts', hits=1)
+            return path
+        
+        metrics.record_cache('tts', misses=1)
+        return self.tts_cache.put(key, lambda temp_path: self._render(text, temp_path))
+    
+    def render_dubbing_track(self,
+                             entries: List,
+                             output_path: str,
+                             language: str = 'hindi',
+                             max_workers: int = 4,
+                             max_speedup: float = 1.35,
+                             progress=None) -> Dict:
+        """
+        Synthesize translated subtitle cues into one timed WAV track.
+        
+        Cues are synthesized concurrently through the TTS worker and cache
+        and streamed into the output in order; see dubbing.py.
+        
+        Args:
+            entries: SubtitleEntry objects (translated_text is spoken)
+            output_path: WAV file to write
+            language: Language of the translated text
+            max_workers: Cues synthesized at the same time
+            max_speedup: Fastest a cue is played to fit before the next one
+            progress: Called with (cues written, total cues)
+        
+        Returns:
+            Dict with cues, duration and counts per fit status
+        """
+        if not self.tts_worker or not self.tts_cache:
+            raise RuntimeError("Text-to-speech engine or TTS cache not available")
+        
+        return render_dubbing_track(entries, lambda text: self.cached_audio(text, language), output_path,
+                                    max_workers=max_workers, max_speedup=max_speedup, progress=progress)
+    
     def recognize_from_file(self,
                           audio_file_path: str,
                           language: str = 'english') -> Tuple[str, float]:
@@ -305,22 +407,81 @@ class VoiceHandler:
             print(f"Error recognizing audio file: {e}")
             return "", 0.0
     
+    def recognize_long_file(self,
+                            audio_file_path: str,
+                            language: str = 'english',
+                            backend=None,
+                            window_seconds: float = 30.0,
+                            overlap_seconds: float = 2.0,
+                            split_on_silence: bool = True,
+                            max_workers: int = 4) -> Dict:
+        """
+        Recognize a long recording in windows, several at a time.
+        
+        Unlike recognize_from_file, the file is never loaded whole and the
+        windows are recognized concurrently; see long_audio.py.
+        
+        Args:
+            audio_file_path: Path to audio file (silence splitting needs WAV)
+            language: Expected language
+            backend: Recognizer backend (default: Google Web Speech)
+            window_seconds: Longest window sent in one recognition call
+            overlap_seconds: Overlap between fixed windows
+            split_on_silence: Cut windows at silences where possible
+            max_workers: Windows recognized concurrently
+        
+        Returns:
+            Dict with text, confidence, duration and timestamped segments
+            (long_audio.segments_to_subtitles turns them into SubtitleEntry objects)
+        """
+        if not self.recognizer:
+            return {'text': '', 'confidence': 0.0, 'duration': 0.0, 'segments': []}
+        
+        lang_map = {
+            'english': 'en-US',
+            'en': 'en-US',
+            'hindi': 'hi-IN',
+            'hi': 'hi-IN',
+            'telugu': 'te-IN',
+            'te': 'te-IN',
+            'tamil': 'ta-IN',
+            'ta': 'ta-IN'
+        }
+        lang_code = lang_map.get(language.lower(), 'en-US')
+        
+        try:
+            return recognize_long_audio(
+                audio_file_path, self.recognizer, backend or GoogleBackend(self.recognizer), lang_code,
+                window_seconds=window_seconds, overlap_seconds=overlap_seconds,
+                split_on_silence=split_on_silence, max_workers=max_workers
+            )
+        except Exception as e:
+            print(f"Error recognizing long audio file: {e}")
+            return {'text': '', 'confidence': 0.0, 'duration': 0.0, 'segments': []}
+    
     def close(self):
-        """Cleanup resources"""
-        if self.tts_engine:
-            try:
-                self.tts_engine.stop()
-            except:
-                pass
+        """
+        Cleanup resources. The TTS worker is shared by every handler in the
+        process and keeps running; tts_worker.close_tts_worker() stops it.
+        """
+        self.tts_worker = None
 
 
 class AudioProcessor:
     """Additional utilities for audio processing"""
     
+    @staticmethod
+    def _is_pcm_wav(*paths: str) -> bool:
+        """True if every path is a .wav file (PCM WAV is processed without pydub)"""
+        return all(path.lower().endswith('.wav') for path in paths)
+    
     @staticmethod
     def normalize_audio_level(audio_path: str, target_path: str, target_db: float = -20.0) -> bool:
         """
-        Normalize audio level (requires external tools).
+        Normalize audio level.
+        
+        PCM WAV files are streamed in blocks (audio_levels.py); other
+        formats need pydub.
         
         Args:
             audio_path: Input audio file
@@ -330,6 +491,16 @@ class AudioProcessor:
         Returns:
             True if successful
         """
+        if AudioProcessor._is_pcm_wav(audio_path, target_path):
+            try:
+                audio_levels.normalize_wav(audio_path, target_path, target_db)
+                return True
+            except wave.Error:
+                pass  # Not PCM (e.g. float or compressed WAV): try pydub
+            except Exception as e:
+                print(f"Error normalizing audio: {e}")
+                return False
+        
         try:
             from pydub import AudioSegment
             
@@ -361,6 +532,9 @@ class AudioProcessor:
         """
         Trim silence from beginning and end of audio.
         
+        PCM WAV files are streamed in blocks (audio_levels.py); other
+        formats need pydub.
+        
         Args:
             audio_path: Input audio file
             target_path: Output audio file
@@ -369,6 +543,16 @@ class AudioProcessor:
         Returns:
             True if successful
         """
+        if AudioProcessor._is_pcm_wav(audio_path, target_path):
+            try:
+                audio_levels.trim_wav(audio_path, target_path, threshold_db)
+                return True
+            except wave.Error:
+                pass  # Not PCM (e.g. float or compressed WAV): try pydub
+            except Exception as e:
+                print(f"Error trimming silence: {e}")
+                return False
+        
         try:
             from pydub import AudioSegment
             from pydub.silence import detect_leading_silence, detect_trailing_silence
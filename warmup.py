@@ -0,0 +1,99 @@
+"""
+Warm-up Module for Desi Translate
+Pays a worker's cold-start costs before it is reported ready.
+
+A fresh worker otherwise compiles the rules snapshot, lexicons and per-pair
+indexes on its first requests, and its dictionary, lemma and lexicon caches
+start empty. Warm-up runs a list of named steps (built by the app) on a
+background thread at worker boot; /readyz answers 200 only once they have
+finished, so load balancers keep traffic on warm workers.
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+PENDING = 'pending'
+RUNNING = 'running'
+READY = 'ready'
+FAILED = 'failed'
+
+# A warm-up step: (name, function)
+Step = Tuple[str, Callable[[], object]]
+
+
+def load_sentences(path: str) -> List[str]:
+    """Warm-up sentences from a text file: one per line, '#' starts a comment"""
+    if not path or not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+
+class Warmup:
+    """Warm-up state of this worker process"""
+
+    def __init__(self):
+        self.status = PENDING
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.steps: Dict[str, float] = {}  # step name -> milliseconds
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def start(self, steps_factory: Callable[[], List[Step]], background: bool = True):
+        """
+        Run the warm-up once per process (later calls are no-ops).
+
+        Args:
+            steps_factory: Builds the steps to run (called on the warm-up thread)
+            background: Run on a daemon thread instead of blocking the caller
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked from a process that had started (or finished) warming up:
+                # the caches may be inherited, the thread is not
+                self.__init__()
+            if self.status != PENDING:
+                return
+            self.status = RUNNING
+            self.started_at = time.time()
+
+        if background:
+            threading.Thread(target=self._run, args=(steps_factory,), name='desi-warmup', daemon=True).start()
+        else:
+            self._run(steps_factory)
+
+    def _run(self, steps_factory: Callable[[], List[Step]]):
+        try:
+            for name, step in steps_factory():
+                started = time.perf_counter()
+                step()
+                self.steps[name] = round((time.perf_counter() - started) * 1000, 1)
+        except Exception as e:
+            print(f"Warning: warm-up failed: {e}")
+            self.error = str(e)
+            self.status = FAILED
+        else:
+            self.status = READY
+        self.finished_at = time.time()
+
+    @property
+    def ready(self) -> bool:
+        """True once warm-up has finished in this process (a failed warm-up still serves traffic)"""
+        return self._pid == os.getpid() and self.status in (READY, FAILED)
+
+    def report(self) -> Dict:
+        """Warm-up status for /readyz"""
+        report = {'status': self.status if self._pid == os.getpid() else PENDING, 'steps_ms': dict(self.steps)}
+        if self.started_at is not None:
+            end = self.finished_at or time.time()
+            report['duration_ms'] = round((end - self.started_at) * 1000, 1)
+        if self.error:
+            report['error'] = self.error
+        return report
+
+
+warmup = Warmup()